@@ -0,0 +1,234 @@
+import os
+import math
+import time
+import asyncio
+import threading
+import contextlib
+from collections import deque
+
+# Requests de /generate ejecutándose a la vez; el resto espera en cola
+ADMISSION_MAX_IN_FLIGHT = int(os.environ.get('NEURO_UX_ADMISSION_MAX_IN_FLIGHT', '8'))
+# Espera máxima en cola del tráfico interactivo antes de responder 503
+ADMISSION_QUEUE_BUDGET_MS = float(os.environ.get('NEURO_UX_ADMISSION_QUEUE_BUDGET_MS', '250'))
+# El tráfico batch tiene un presupuesto menor: se descarta antes que el interactivo
+ADMISSION_BATCH_BUDGET_FRACTION = float(os.environ.get('NEURO_UX_ADMISSION_BATCH_BUDGET_FRACTION', '0.5'))
+# Slots que el tráfico batch nunca ocupa (quedan libres para el interactivo)
+ADMISSION_INTERACTIVE_RESERVED = int(os.environ.get('NEURO_UX_ADMISSION_INTERACTIVE_RESERVED', '2'))
+
+# Clases en orden de prioridad
+PRIORITIES = ('interactive', 'batch')
+BATCH_ALIASES = {'batch', 'low', 'bulk'}
+# Suavizado del tiempo de servicio medido
+SERVICE_SMOOTHING = 0.2
+
+
+def classify(value):
+    """Clase de prioridad a partir del header X-Priority o del parámetro 'priority' (default interactiva)"""
+    return 'batch' if str(value or '').strip().lower() in BATCH_ALIASES else 'interactive'
+
+
+class Overloaded(Exception):
+    """La request no entra en el presupuesto de cola: se responde 503 con Retry-After"""
+
+    def __init__(self, priority, reason, retry_after):
+        super().__init__(f"Servidor saturado ({priority}, {reason})")
+        self.priority = priority
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class _Waiter:
+    __slots__ = ('priority', 'granted', 'notify')
+
+    def __init__(self, priority, notify):
+        self.priority = priority
+        self.granted = False
+        self.notify = notify
+
+
+class AdmissionController:
+    """
+    Control de admisión con límite de requests en curso y presupuesto de latencia de cola.
+    - Si hay un slot libre (y nadie de igual o mayor prioridad esperando) la request entra.
+    - Si la espera estimada (cola por delante x tiempo de servicio medido / slots) supera el
+      presupuesto de su clase, se rechaza al instante; si espera y el presupuesto vence, también.
+    - Al liberar un slot se entrega primero al tráfico interactivo; el batch no usa los slots reservados.
+    Sirve tanto a hilos (admit) como al event loop del modo ASGI (admit_async).
+    """
+
+    def __init__(self, max_in_flight=ADMISSION_MAX_IN_FLIGHT, queue_budget_ms=ADMISSION_QUEUE_BUDGET_MS,
+                 batch_budget_fraction=ADMISSION_BATCH_BUDGET_FRACTION,
+                 interactive_reserved=ADMISSION_INTERACTIVE_RESERVED):
+        self.max_in_flight = max(1, max_in_flight)
+        self.queue_budget_ms = queue_budget_ms
+        self.batch_budget_fraction = batch_budget_fraction
+        self.interactive_reserved = min(max(0, interactive_reserved), self.max_in_flight - 1)
+        self._lock = threading.Lock()
+        self._queues = {priority: deque() for priority in PRIORITIES}
+        self._service_ms = None
+        self.in_flight = 0
+        self.max_queued = 0
+        self.counters = {
+            priority: {'admitted': 0, 'queued': 0, 'shed': 0, 'wait_ms_total': 0.0}
+            for priority in PRIORITIES
+        }
+        self.shed_reasons = {'estimate': 0, 'timeout': 0}
+
+    def budget_ms(self, priority):
+        if priority == 'interactive':
+            return self.queue_budget_ms
+        return self.queue_budget_ms * self.batch_budget_fraction
+
+    def _capacity(self, priority):
+        if priority == 'interactive':
+            return self.max_in_flight
+        return self.max_in_flight - self.interactive_reserved
+
+    def _ahead(self, priority):
+        """Requests en cola que se atienden antes que una nueva de esta clase"""
+        ahead = 0
+        for p in PRIORITIES:
+            ahead += len(self._queues[p])
+            if p == priority:
+                return ahead
+        return ahead
+
+    def _estimated_wait_ms(self, priority):
+        if self._service_ms is None:
+            return 0.0
+        return (self._ahead(priority) + 1) * self._service_ms / self._capacity(priority)
+
+    def _retry_after(self, priority):
+        return max(1, math.ceil(self._estimated_wait_ms(priority) / 1000))
+
+    def _enter(self, priority, notify):
+        """Admite, encola (retorna el waiter) o lanza Overloaded. Retorna None si entró directo."""
+        with self._lock:
+            if self.in_flight < self._capacity(priority) and self._ahead(priority) == 0:
+                self.in_flight += 1
+                self.counters[priority]['admitted'] += 1
+                return None
+
+            if self._estimated_wait_ms(priority) > self.budget_ms(priority):
+                self.counters[priority]['shed'] += 1
+                self.shed_reasons['estimate'] += 1
+                raise Overloaded(priority, 'estimate', self._retry_after(priority))
+
+            waiter = _Waiter(priority, notify)
+            self._queues[priority].append(waiter)
+            self.counters[priority]['queued'] += 1
+            self.max_queued = max(self.max_queued, sum(len(q) for q in self._queues.values()))
+            return waiter
+
+    def _settle(self, waiter, waited_ms):
+        """Tras la espera: True si el slot fue entregado; si no, sale de la cola y lanza Overloaded"""
+        with self._lock:
+            self.counters[waiter.priority]['wait_ms_total'] += waited_ms
+            if waiter.granted:
+                return True
+            self._queues[waiter.priority].remove(waiter)
+            self.counters[waiter.priority]['shed'] += 1
+            self.shed_reasons['timeout'] += 1
+            raise Overloaded(waiter.priority, 'timeout', self._retry_after(waiter.priority))
+
+    def release(self, service_ms):
+        """Libera un slot (con el tiempo que se ocupó) y lo entrega al siguiente en cola"""
+        with self._lock:
+            self._service_ms = service_ms if self._service_ms is None else \
+                (1 - SERVICE_SMOOTHING) * self._service_ms + SERVICE_SMOOTHING * service_ms
+            self.in_flight -= 1
+            granted = self._dispatch()
+        for waiter in granted:
+            waiter.notify()
+
+    def _dispatch(self):
+        granted = []
+        for priority in PRIORITIES:
+            queue = self._queues[priority]
+            while queue and self.in_flight < self._capacity(priority):
+                waiter = queue.popleft()
+                waiter.granted = True
+                self.in_flight += 1
+                self.counters[priority]['admitted'] += 1
+                granted.append(waiter)
+            if queue:
+                # Las clases de menor prioridad no adelantan a una cola que todavía espera
+                break
+        return granted
+
+    @contextlib.contextmanager
+    def admit(self, priority='interactive'):
+        """Ocupa un slot durante el bloque (bloquea el hilo mientras espera en cola)"""
+        event = threading.Event()
+        waiter = self._enter(priority, event.set)
+        if waiter is not None:
+            start = time.perf_counter()
+            event.wait(self.budget_ms(priority) / 1000)
+            self._settle(waiter, (time.perf_counter() - start) * 1000)
+
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.release((time.perf_counter() - start) * 1000)
+
+    @contextlib.asynccontextmanager
+    async def admit_async(self, priority='interactive'):
+        """Igual que admit, pero la espera en cola no ocupa un hilo (modo ASGI)"""
+        loop = asyncio.get_running_loop()
+        event = asyncio.Event()
+        waiter = self._enter(priority, lambda: loop.call_soon_threadsafe(event.set))
+        if waiter is not None:
+            start = time.perf_counter()
+            try:
+                await asyncio.wait_for(event.wait(), self.budget_ms(priority) / 1000)
+            except asyncio.TimeoutError:
+                pass
+            except asyncio.CancelledError:
+                # El slot pudo haberse entregado justo antes de cancelar: se devuelve
+                if not self._abandon(waiter):
+                    self.release(0.0)
+                raise
+            self._settle(waiter, (time.perf_counter() - start) * 1000)
+
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.release((time.perf_counter() - start) * 1000)
+
+    def _abandon(self, waiter):
+        """Saca de la cola a un waiter cancelado. False si ya tenía el slot."""
+        with self._lock:
+            if waiter.granted:
+                return False
+            self._queues[waiter.priority].remove(waiter)
+            return True
+
+    def stats(self):
+        with self._lock:
+            classes = {}
+            for priority, c in self.counters.items():
+                waited = c['queued']
+                classes[priority] = {
+                    'admitted': c['admitted'],
+                    'queued': c['queued'],
+                    'shed': c['shed'],
+                    'waiting': len(self._queues[priority]),
+                    'budget_ms': self.budget_ms(priority),
+                    'avg_wait_ms': round(c['wait_ms_total'] / waited, 2) if waited else 0.0,
+                }
+            admitted = sum(c['admitted'] for c in self.counters.values())
+            shed = sum(c['shed'] for c in self.counters.values())
+            return {
+                'max_in_flight': self.max_in_flight,
+                'interactive_reserved': self.interactive_reserved,
+                'in_flight': self.in_flight,
+                'max_queued': self.max_queued,
+                'service_ms': round(self._service_ms, 2) if self._service_ms is not None else None,
+                'admitted': admitted,
+                'shed': shed,
+                'shed_rate': round(shed / (admitted + shed), 4) if admitted + shed else 0.0,
+                'shed_reasons': dict(self.shed_reasons),
+                'classes': classes,
+            }
@@ -1,9 +1,27 @@
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify, stream_with_context
 from flask_cors import CORS
-from model import NeuroUXModel
-from data_processor import DataProcessor
+from model import keras
 from training import Trainer
+from registry import default_registry
+from profiling import RequestProfiler
+from branding_table import BrandingScoreTable, KEYWORD_ORDER
+from optimizer import DesignOptimizer
+from explain import SensitivityAnalyzer
+from recommendations import RecommendationIndex
+from ui_kit_fragments import UIKitFragments
+from drift import DriftDetector
+from scheduler import RetrainScheduler, AUTO_RETRAIN
+from training_worker import TrainingWorker, USE_TRAINING_WORKER
+from single_flight import SingleFlight, fingerprint
+from admission import AdmissionController, Overloaded, classify
+from events import EventBroker
+from warmup import Readiness
+from functools import wraps
 import os
+import json
+import time
+import hashlib
+import threading
 import traceback
 
 app = Flask(__name__)
@@ -13,78 +31,424 @@ CORS(app, resources={
     r"/*": {
         "origins": "*",
         "methods": ["GET", "POST", "OPTIONS"],
-        "allow_headers": ["Content-Type"]
+        "allow_headers": ["Content-Type", "X-Profile", "X-Admin-Token", "X-Priority"]
     }
 })
 
 # Inicializar componentes
-model = NeuroUXModel()
-processor = DataProcessor()
-trainer = Trainer()
+# Un solo modelo de serving y un solo procesador, compartidos con el Trainer
+registry = default_registry()
+model = registry.serving_model()
+processor = registry.processor()
+trainer = Trainer(registry)
+profiler = RequestProfiler.from_env()
+branding_table = BrandingScoreTable(processor, model)
+optimizer = DesignOptimizer(processor, model)
+sensitivity = SensitivityAnalyzer(processor, model)
+recommendation_index = RecommendationIndex(processor, model)
+ui_kit_fragments = UIKitFragments(processor)
+drift_detector = DriftDetector(processor, model)
+retrain_lock = threading.Lock()
+training_worker = TrainingWorker()
+generate_flight = SingleFlight()
+admission = AdmissionController()
+event_broker = EventBroker()
+readiness = Readiness()
+
+def reload_model(load, reason):
+    """
+    Carga o recarga el modelo con la readiness en falso hasta terminar el warm-up,
+    así el balanceador no envía tráfico a un modelo frío.
+    """
+    readiness.begin(reason)
+    try:
+        return load()
+    finally:
+        readiness.warm(model, processor, reason)
 
 # Cargar modelo al iniciar
 print("🔄 Cargando modelo...")
 try:
-    model.load_model()
+    reload_model(model.load_model, 'startup')
     print("✅ Modelo cargado correctamente")
 except Exception as e:
     print(f"⚠️ Error al cargar modelo: {e}")
 
+def rebuild_precomputed():
+    """Reconstruye las estructuras precalculadas con el modelo actual (al cargar y tras reentrenar)"""
+    try:
+        branding_table.build()
+        branding_table.verify()
+    except Exception as e:
+        branding_table.ready = False
+        print(f"⚠️ No se pudo construir la tabla de branding: {e}")
+    
+    try:
+        recommendation_index.build()
+    except Exception as e:
+        recommendation_index.ready = False
+        print(f"⚠️ No se pudo construir el índice de recomendaciones: {e}")
+    
+    # La referencia de drift incluye la loss del modelo: se recalcula con el modelo nuevo
+    drift_detector.invalidate()
+
+rebuild_precomputed()
+
+def publish_pending(pending, total_feedback):
+    """Evento SSE con los contadores de feedback"""
+    event_broker.publish('pending', {
+        'pending_feedback': pending,
+        'total_feedback': total_feedback,
+        'ready_for_retrain': pending >= 5
+    })
+
+def publish_epoch(epoch, epochs, logs):
+    event_broker.publish('retrain', {
+        'status': 'epoch',
+        'epoch': epoch,
+        'epochs': epochs,
+        'logs': {k: float(v) for k, v in (logs or {}).items()}
+    })
+
+def run_retrain(force=False):
+    """
+    Reentrenamiento con pre-chequeo de drift (usado por /retrain y por el scheduler).
+    Retorna (payload, status). Solo un reentrenamiento a la vez.
+    """
+    if not retrain_lock.acquire(blocking=False):
+        return {'success': False, 'message': 'Ya hay un reentrenamiento en curso'}, 409
+    
+    try:
+        training_data, feedback_data, pending_feedback = trainer.load_training_data()
+        pending_count = len(pending_feedback)
+        
+        print(f"📊 Feedback pendiente: {pending_count}")
+        
+        if pending_count < 5:
+            message = f'Necesitas al menos 5 feedbacks nuevos. Tienes: {pending_count}'
+            print(f"⚠️ {message}")
+            return {
+                'success': False,
+                'message': message,
+                'pending_count': pending_count
+            }, 400
+        
+        total_before = len(feedback_data) + pending_count
+        
+        # Pre-chequeo de drift: omitir o acortar el reentrenamiento si nada cambió
+        drift = drift_detector.assess(training_data + feedback_data, pending_feedback)
+        decision = 'full' if force else drift['decision']
+        print(f"📐 Drift: {drift['decision']} (score {drift['score']}) -> {decision}"
+              f"{' [forzado]' if force else ''}")
+        
+        if decision == 'skip':
+            absorbed = trainer.commit_pending(pending_count)
+            print(f"✅ {absorbed} feedbacks incorporados sin reentrenar")
+            event_broker.publish('retrain', {'status': 'skipped', 'decision': decision, 'score': drift['score']})
+            publish_pending(0, total_before)
+            return {
+                'success': True,
+                'retrained': False,
+                'decision': decision,
+                'forced': force,
+                'message': f'Sin drift: {absorbed} feedbacks incorporados sin reentrenar',
+                'drift': drift,
+                'pending_feedback': 0,
+                'total_feedback': total_before
+            }, 200
+        
+        epochs = drift_detector.epochs_for(decision)
+        print(f"🚀 Iniciando reentrenamiento ({decision}, {epochs} épocas) con {pending_count} feedbacks...")
+        event_broker.publish('retrain', {'status': 'started', 'decision': decision, 'epochs': epochs,
+                                         'pending_feedback': pending_count})
+        worker = None
+        try:
+            if USE_TRAINING_WORKER:
+                # Entrenamiento en subproceso; la API solo instala el artefacto resultante
+                snapshot = {
+                    'training_data': training_data,
+                    'feedback_data': feedback_data,
+                    'pending_feedback': pending_feedback
+                }
+                def on_message(message):
+                    if message.get('type') == 'epoch':
+                        publish_epoch(message['epoch'], epochs, message['logs'])
+                
+                result = training_worker.run(snapshot, epochs=epochs, on_message=on_message)
+                try:
+                    print("📥 Instalando modelo del worker...")
+                    reload_model(lambda: model.install_artifact(result['model_path'], result.get('tflite_path')),
+                                 'retrain')
+                finally:
+                    training_worker.cleanup(result)
+                trainer.commit_pending(result['consumed_pending'])
+                metrics = result['metrics']
+                worker = {k: result[k] for k in ('pid', 'duration_s', 'epochs_run')}
+                io = result.get('io')
+            else:
+                progress = keras.callbacks.LambdaCallback(
+                    on_epoch_end=lambda epoch, logs: publish_epoch(epoch + 1, epochs, logs)
+                )
+                history, metrics = trainer.retrain_with_feedback(epochs=epochs, extra_callbacks=[progress])
+                io = trainer.model.io_report()
+                print("📥 Instalando modelo reentrenado...")
+                reload_model(lambda: registry.promote(trainer.release_model()), 'retrain')
+        except Exception as e:
+            event_broker.publish('retrain', {'status': 'failed', 'error': str(e)})
+            raise
+        rebuild_precomputed()
+        
+        _, _, new_pending = trainer.load_training_data()
+        event_broker.publish('retrain', {
+            'status': 'finished',
+            'decision': decision,
+            'metrics': {k: float(v) for k, v in metrics.items()},
+            'io': io
+        })
+        event_broker.publish('model', {'model_version': model.version})
+        publish_pending(len(new_pending), total_before + len(new_pending))
+        
+        print(f"✅ Reentrenamiento completado")
+        print(f"   - Accuracy: {metrics['accuracy']:.4f}")
+        print(f"   - Loss: {metrics['loss']:.4f}")
+        
+        return {
+            'success': True,
+            'retrained': True,
+            'decision': decision,
+            'forced': force,
+            'epochs': epochs,
+            'worker': worker,
+            'io': io,
+            'drift': drift,
+            'message': 'Modelo reentrenado exitosamente',
+            'metrics': {
+                'accuracy': float(metrics['accuracy']),
+                'loss': float(metrics['loss']),
+                'auc': float(metrics.get('auc', 0.0))
+            },
+            'pending_feedback': len(new_pending),
+            'total_feedback': total_before
+        }, 200
+    finally:
+        retrain_lock.release()
+
+retrain_scheduler = RetrainScheduler(
+    pending_count=lambda: len(trainer.load_training_data()[2]),
+    run_retrain=run_retrain,
+    in_process=not USE_TRAINING_WORKER,
+    log_path=os.path.join(os.path.dirname(__file__), 'data', 'retrain_scheduler.jsonl')
+)
+
+@app.before_request
+def start_retrain_scheduler():
+    """
+    El scheduler arranca con la primera request, así solo corre en el proceso que sirve
+    (no en el proceso padre del reloader de Flask).
+    """
+    if AUTO_RETRAIN and not retrain_scheduler.started:
+        retrain_scheduler.start()
+
+# Los clientes pueden guardar la respuesta pero deben revalidarla (If-None-Match) antes de usarla
+STATS_CACHE_CONTROL = 'no-cache'
+GENERATE_CACHE_CONTROL = 'public, no-cache'
+
+def dataset_revision():
+    """Revisión del dataset: mtime + tamaño del JSON (cambia con cada feedback o reentrenamiento)"""
+    try:
+        stat = os.stat(trainer.data_path)
+        return f"{stat.st_mtime_ns:x}-{stat.st_size:x}"
+    except OSError:
+        return 'none'
+
+def make_etag(*parts):
+    """ETag fuerte a partir de las revisiones de las que depende la respuesta"""
+    return hashlib.sha1('|'.join(str(p) for p in parts).encode('utf-8')).hexdigest()[:20]
+
+def not_modified(etag, cache_control):
+    """Respuesta 304 si el If-None-Match del cliente coincide con el ETag; None si no"""
+    if not request.if_none_match.contains_weak(etag):
+        return None
+    response = app.response_class(status=304)
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = cache_control
+    return response
+
+def profiled(view):
+    """
+    Perfila la request si se pidió explícitamente (admin) o si toca por muestreo.
+    Las requests explícitas devuelven el top-N en el campo 'profile' del JSON.
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        if request.method == 'OPTIONS':
+            return view(*args, **kwargs)
+
+        explicit = profiler.is_requested(request.headers, request.args)
+        if not explicit and not profiler.should_sample():
+            return view(*args, **kwargs)
+
+        rv, profile = profiler.run(view, *args, **kwargs)
+        response = app.make_response(rv)
+
+        try:
+            report = profiler.summarize(profile, request.path)
+            report_path = profiler.save(profile, report)
+            print(f"🔬 Perfil guardado en {report_path} ({report['wall_time']*1000:.1f} ms)")
+        except Exception as e:
+            print(f"⚠️ No se pudo guardar el perfil: {e}")
+            return response
+
+        response.headers['X-Profile-Id'] = report['id']
+        if explicit and response.is_json:
+            body = response.get_json(silent=True)
+            if isinstance(body, dict):
+                body['profile'] = report
+                response.set_data(json.dumps(body, ensure_ascii=False))
+                # El cuerpo con perfil ya no corresponde al ETag
+                response.headers.pop('ETag', None)
+        return response
+
+    return wrapper
+
 @app.route('/health', methods=['GET', 'OPTIONS'])
 @app.route('/api/health', methods=['GET', 'OPTIONS'])
 def health_check():
-    """Endpoint de salud"""
+    """Endpoint de salud (liveness, con el estado de readiness como información)"""
     return jsonify({
         'status': 'healthy',
-        'model_loaded': model.model is not None
+        'model_loaded': model.model is not None,
+        'ready': readiness.ready
     })
 
-@app.route('/generate', methods=['POST', 'OPTIONS'])
-@app.route('/api/generate', methods=['POST', 'OPTIONS'])
+@app.route('/health/live', methods=['GET'])
+@app.route('/api/health/live', methods=['GET'])
+def liveness_check():
+    """Liveness: el proceso responde (no depende del modelo)"""
+    return jsonify({'status': 'alive'})
+
+@app.route('/health/ready', methods=['GET'])
+@app.route('/api/health/ready', methods=['GET'])
+def readiness_check():
+    """Readiness: 200 solo con el modelo cargado y calentado; 503 durante la carga o el warm-up"""
+    state = readiness.stats()
+    ready = state['ready'] and model.model is not None
+    return jsonify({
+        'status': 'ready' if ready else 'not_ready',
+        'model_loaded': model.model is not None,
+        'model_version': model.version,
+        **state
+    }), 200 if ready else 503
+
+def generate_input(data):
+    """
+    Input normalizado de /generate (valores por defecto).
+    Los campos de diseño UX se conservan si vienen: encode_input los usa en lugar del branding.
+    """
+    input_data = {
+        'name': data.get('name', ''),
+        'mission': data.get('mission', ''),
+        'values': data.get('values', ''),
+        'sector': data.get('sector', 'general'),
+        'audience': data.get('audience', 'general')
+    }
+    for field in ('palette', 'fonts', 'layout', 'spacing', 'contrast'):
+        if field in data:
+            value = data[field]
+            # En GET las listas llegan como texto separado por comas
+            if field in ('palette', 'fonts') and isinstance(value, str):
+                value = [item.strip() for item in value.split(',') if item.strip()]
+            input_data[field] = value
+    return input_data
+
+def generate_etag(input_data, key):
+    """ETag de /generate: versión del modelo global, la del modelo del sector (si tiene) e input"""
+    return make_etag('generate', model.version, model.sector_version(input_data['sector']), key)
+
+def render_generate(input_data):
+    """Cuerpo JSON de /generate para un input normalizado. Retorna (bytes, confianza)"""
+    # Modelo especializado del sector (carga perezosa) o el global
+    scorer = model.for_sector(input_data['sector'])
+    # ⚡ Perfiles de branding precalculados (solo con el modelo global): búsqueda en diccionario
+    entry = branding_table.lookup(input_data) if scorer is model else None
+    if entry is not None:
+        confidence = entry['confidence']
+        ui_kit = entry['ui_kit']
+    else:
+        # ✅ CORREGIDO: encode_input retorna 3 valores
+        features, metadata, _ = processor.encode_input(input_data)
+        prediction = scorer.predict(features)
+        confidence = float(prediction[0][0])
+        
+        # ✅ CORREGIDO: generate_ui_kit recibe 3 parámetros
+        ui_kit = processor.generate_ui_kit(prediction, metadata, None)
+    
+    # Respuesta armada con los fragmentos JSON pre-serializados (mismo contrato que jsonify)
+    return ui_kit_fragments.render_generate(ui_kit, confidence), confidence
+
+def request_priority(headers, args):
+    """Clase de admisión de la request: X-Priority o ?priority= ('batch'; por defecto interactiva)"""
+    return classify(headers.get('X-Priority') or args.get('priority'))
+
+def admitted_render(input_data, priority):
+    """render_generate dentro de un slot de admisión (lo ocupa solo el líder del single-flight)"""
+    with admission.admit(priority):
+        return render_generate(input_data)
+
+def overloaded_body(e):
+    """Cuerpo del 503 por saturación; el header Retry-After lleva e.retry_after"""
+    return {
+        'success': False,
+        'error': 'Servidor saturado, reintenta más tarde',
+        'priority': e.priority,
+        'reason': e.reason,
+        'retry_after': e.retry_after
+    }
+
+@app.route('/generate', methods=['GET', 'POST', 'OPTIONS'])
+@app.route('/api/generate', methods=['GET', 'POST', 'OPTIONS'])
+@profiled
 def generate_ui_kit():
-    """Genera un UI Kit basado en los datos de entrada"""
+    """
+    Genera un UI Kit basado en los datos de entrada.
+    GET (datos en la query) es cacheable: ETag según versión del modelo + input, 304 si no cambió.
+    """
     if request.method == 'OPTIONS':
         return '', 204
         
     try:
-        data = request.json
+        data = request.args.to_dict() if request.method == 'GET' else request.json
         print(f"📥 Datos recibidos: {data}")
         
         if not data:
             return jsonify({'success': False, 'error': 'No se recibieron datos'}), 400
         
-        # Valores por defecto
-        input_data = {
-            'name': data.get('name', ''),
-            'mission': data.get('mission', ''),
-            'values': data.get('values', ''),
-            'sector': data.get('sector', 'general'),
-            'audience': data.get('audience', 'general')
-        }
-        
-        # ✅ CORREGIDO: encode_input retorna 3 valores
-        features, metadata, _ = processor.encode_input(input_data)
-        prediction = model.predict(features)
-        confidence = float(prediction[0][0])
+        input_data = generate_input(data)
+        key = fingerprint(input_data)
+        etag = None
+        if request.method == 'GET':
+            # La respuesta es determinista para un input y una versión del modelo
+            etag = generate_etag(input_data, key)
+            cached = not_modified(etag, GENERATE_CACHE_CONTROL)
+            if cached is not None:
+                return cached
         
-        # ✅ CORREGIDO: generate_ui_kit recibe 3 parámetros
-        ui_kit = processor.generate_ui_kit(prediction, metadata, None)
+        # Requests idénticas concurrentes comparten una sola ejecución (y un solo slot de admisión)
+        priority = request_priority(request.headers, request.args)
+        (body, confidence), shared = generate_flight.do(key, admitted_render, input_data, priority)
         
-        response = {
-            'success': True,
-            'ui_kit': {
-                'colors': ui_kit.get('colors', {}),
-                'typography': ui_kit.get('typography', {}),
-                'components': ui_kit.get('components', {}),
-                'tokens': ui_kit.get('tokens', {}),
-                'confidence': confidence,
-                'style': ui_kit.get('style', {})
-            }
-        }
-        
-        print(f"✅ UI Kit generado con confianza: {confidence:.2%}")
-        return jsonify(response)
+        print(f"✅ UI Kit generado con confianza: {confidence:.2%}{' (compartido)' if shared else ''}")
+        response = app.response_class(body, mimetype='application/json')
+        if shared:
+            response.headers['X-Coalesced'] = '1'
+        if etag is not None:
+            response.set_etag(etag)
+            response.headers['Cache-Control'] = GENERATE_CACHE_CONTROL
+        return response
         
+    except Overloaded as e:
+        print(f"⏳ /generate rechazada ({e.priority}, {e.reason}); Retry-After {e.retry_after}s")
+        return jsonify(overloaded_body(e)), 503, {'Retry-After': str(e.retry_after)}
     except Exception as e:
         error_msg = str(e)
         print(f"❌ Error en /generate: {error_msg}")
@@ -94,8 +458,153 @@ def generate_ui_kit():
             'error': error_msg
         }), 500
 
+@app.route('/optimize', methods=['POST', 'OPTIONS'])
+@app.route('/api/optimize', methods=['POST', 'OPTIONS'])
+def optimize_design():
+    """Busca las variantes de diseño con mayor score para un brief o diseño parcial"""
+    if request.method == 'OPTIONS':
+        return '', 204
+        
+    try:
+        data = request.json
+        
+        if not data or not isinstance(data, dict):
+            return jsonify({'success': False, 'error': 'No se recibieron datos'}), 400
+        
+        try:
+            top_k = int(data.get('top_k', 5))
+            budget_ms = float(data['budget_ms']) if 'budget_ms' in data else None
+            max_candidates = int(data['max_candidates']) if 'max_candidates' in data else None
+        except (TypeError, ValueError):
+            return jsonify({'success': False, 'error': 'top_k, budget_ms y max_candidates deben ser numéricos'}), 400
+        
+        if not 1 <= top_k <= 50 or (max_candidates is not None and max_candidates < 1):
+            return jsonify({'success': False, 'error': 'top_k debe estar entre 1 y 50 y max_candidates ser positivo'}), 400
+        
+        result = optimizer.optimize(data, top_k=top_k, budget_ms=budget_ms, max_candidates=max_candidates)
+        
+        print(f"✅ Optimización: {result['evaluated']} candidatos en {result['elapsed_ms']:.0f} ms"
+              f"{' (presupuesto agotado)' if result['budget_exhausted'] else ''}")
+        return jsonify({'success': True, **result})
+        
+    except Exception as e:
+        print(f"❌ Error en /optimize: {str(e)}")
+        traceback.print_exc()
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@app.route('/explain', methods=['POST', 'OPTIONS'])
+@app.route('/api/explain', methods=['POST', 'OPTIONS'])
+def explain_design():
+    """Delta de score por atributo: qué cambio de un solo atributo sube más el score"""
+    if request.method == 'OPTIONS':
+        return '', 204
+        
+    try:
+        data = request.json
+        
+        if not data or not isinstance(data, dict):
+            return jsonify({'success': False, 'error': 'No se recibieron datos'}), 400
+        
+        try:
+            top = int(data.get('top', 5))
+            budget_ms = float(data['budget_ms']) if 'budget_ms' in data else None
+        except (TypeError, ValueError):
+            return jsonify({'success': False, 'error': 'top y budget_ms deben ser numéricos'}), 400
+        
+        if not 1 <= top <= 50 or (budget_ms is not None and budget_ms <= 0):
+            return jsonify({'success': False, 'error': 'top debe estar entre 1 y 50 y budget_ms ser positivo'}), 400
+        
+        result = sensitivity.explain(data, top=top, budget_ms=budget_ms)
+        
+        print(f"✅ Explicación: {result['evaluated']} variantes en {result['elapsed_ms']:.0f} ms"
+              f"{' (recortado por presupuesto)' if result['truncated'] else ''}")
+        return jsonify({'success': True, **result})
+        
+    except Exception as e:
+        print(f"❌ Error en /explain: {str(e)}")
+        traceback.print_exc()
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@app.route('/recommendations', methods=['GET', 'POST', 'OPTIONS'])
+@app.route('/api/recommendations', methods=['GET', 'POST', 'OPTIONS'])
+def get_recommendations():
+    """
+    Top-k UI Kits alternativos desde el índice precalculado.
+    GET: ?sector=salud&keywords=modern,luxury&k=5
+    POST: brief de branding (mission, values, sector) + k opcional
+    """
+    if request.method == 'OPTIONS':
+        return '', 204
+        
+    try:
+        start = time.perf_counter()
+        if request.method == 'POST':
+            data = request.json or {}
+            sector = data.get('sector', 'general')
+            keywords = data.get('keywords')
+            mission, values = data.get('mission', ''), data.get('values', '')
+            k = data.get('k', 5)
+        else:
+            sector = request.args.get('sector', 'general')
+            raw = request.args.get('keywords')
+            keywords = [kw.strip() for kw in raw.split(',') if kw.strip()] if raw is not None else None
+            mission, values = request.args.get('mission', ''), request.args.get('values', '')
+            k = request.args.get('k', 5)
+        
+        try:
+            k = int(k)
+        except (TypeError, ValueError):
+            return jsonify({'success': False, 'error': 'k debe ser un entero'}), 400
+        
+        if keywords is not None and not isinstance(keywords, list):
+            return jsonify({'success': False, 'error': 'keywords debe ser una lista'}), 400
+        
+        key = recommendation_index.key_for(sector, keywords, str(mission), str(values))
+        recommendations = recommendation_index.get(key, k)
+        if recommendations is None:
+            return jsonify({'success': False, 'error': 'Índice de recomendaciones no disponible'}), 503
+        
+        profile, style = key
+        return jsonify({
+            'success': True,
+            'sector_style': style,
+            'keywords': [name for name, active in zip(KEYWORD_ORDER, profile) if active],
+            'recommendations': recommendations,
+            'index_built_at': recommendation_index.built_at,
+            'lookup_us': round((time.perf_counter() - start) * 1e6, 1)
+        })
+        
+    except Exception as e:
+        print(f"❌ Error en /recommendations: {str(e)}")
+        traceback.print_exc()
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+def record_feedback(input_data, rating, feedback):
+    """Persiste un feedback, avisa al scheduler y a los clientes SSE. Retorna el cuerpo de /feedback"""
+    pending_count = trainer.add_feedback(input_data, rating, feedback)
+    training_data, feedback_data, pending_feedback = trainer.load_training_data()
+    total_historical = len(feedback_data) + len(pending_feedback)
+    
+    print(f"✅ Feedback guardado. Pendientes: {pending_count}")
+    retrain_scheduler.notify(len(pending_feedback))
+    publish_pending(len(pending_feedback), total_historical)
+    
+    return {
+        'success': True,
+        'message': 'Feedback guardado correctamente',
+        'pending_feedback': len(pending_feedback),
+        'total_feedback': total_historical
+    }
+
 @app.route('/feedback', methods=['POST', 'OPTIONS'])
 @app.route('/api/feedback', methods=['POST', 'OPTIONS'])
+@profiled
 def submit_feedback():
     """Recibe feedback del usuario"""
     if request.method == 'OPTIONS':
@@ -115,18 +624,7 @@ def submit_feedback():
                 'error': 'Se requiere input_data y rating'
             }), 400
         
-        pending_count = trainer.add_feedback(input_data, rating, feedback)
-        training_data, feedback_data, pending_feedback = trainer.load_training_data()
-        total_historical = len(feedback_data) + len(pending_feedback)
-        
-        print(f"✅ Feedback guardado. Pendientes: {pending_count}")
-        
-        return jsonify({
-            'success': True,
-            'message': 'Feedback guardado correctamente',
-            'pending_feedback': len(pending_feedback),
-            'total_feedback': total_historical
-        })
+        return jsonify(record_feedback(input_data, rating, feedback))
         
     except Exception as e:
         print(f"❌ Error en /feedback: {str(e)}")
@@ -138,6 +636,7 @@ def submit_feedback():
 
 @app.route('/retrain', methods=['POST', 'OPTIONS'])
 @app.route('/api/retrain', methods=['POST', 'OPTIONS'])
+@profiled
 def retrain_model():
     """Reentrena el modelo"""
     if request.method == 'OPTIONS':
@@ -145,46 +644,9 @@ def retrain_model():
         
     try:
         print("\n🔄 Solicitud de reentrenamiento recibida...")
-        
-        training_data, feedback_data, pending_feedback = trainer.load_training_data()
-        pending_count = len(pending_feedback)
-        
-        print(f"📊 Feedback pendiente: {pending_count}")
-        
-        if pending_count < 5:
-            message = f'Necesitas al menos 5 feedbacks nuevos. Tienes: {pending_count}'
-            print(f"⚠️ {message}")
-            return jsonify({
-                'success': False,
-                'message': message,
-                'pending_count': pending_count
-            }), 400
-        
-        total_before = len(feedback_data) + pending_count
-        
-        print(f"🚀 Iniciando reentrenamiento con {pending_count} feedbacks...")
-        history, metrics = trainer.retrain_with_feedback()
-        
-        print("📥 Recargando modelo actualizado...")
-        model.load_model()
-        
-        _, _, new_pending = trainer.load_training_data()
-        
-        print(f"✅ Reentrenamiento completado")
-        print(f"   - Accuracy: {metrics['accuracy']:.4f}")
-        print(f"   - Loss: {metrics['loss']:.4f}")
-        
-        return jsonify({
-            'success': True,
-            'message': 'Modelo reentrenado exitosamente',
-            'metrics': {
-                'accuracy': float(metrics['accuracy']),
-                'loss': float(metrics['loss']),
-                'auc': float(metrics.get('auc', 0.0))
-            },
-            'pending_feedback': len(new_pending),
-            'total_feedback': total_before
-        })
+        force = bool((request.get_json(silent=True) or {}).get('force', False))
+        payload, status = run_retrain(force=force)
+        return jsonify(payload), status
         
     except Exception as e:
         error_trace = traceback.format_exc()
@@ -195,6 +657,73 @@ def retrain_model():
             'error': str(e)
         }), 500
 
+def runtime_metrics():
+    return {
+        'generate_single_flight': generate_flight.stats(),
+        'admission': admission.stats(),
+        'auto_retrain': retrain_scheduler.stats(),
+        'training_worker': training_worker.stats(),
+        'events': event_broker.stats(),
+        'readiness': readiness.stats(),
+        'registry': registry.stats(),
+        'sector_models': model.sectors.stats()
+    }
+
+@app.route('/metrics', methods=['GET', 'OPTIONS'])
+@app.route('/api/metrics', methods=['GET', 'OPTIONS'])
+def get_metrics():
+    """Contadores de runtime del servidor"""
+    if request.method == 'OPTIONS':
+        return '', 204
+    
+    return jsonify({'success': True, 'metrics': runtime_metrics()})
+
+def events_snapshot():
+    """Estado inicial del stream SSE"""
+    _, feedback_data, pending_feedback = trainer.load_training_data()
+    return {
+        'pending_feedback': len(pending_feedback),
+        'total_feedback': len(feedback_data) + len(pending_feedback),
+        'ready_for_retrain': len(pending_feedback) >= 5,
+        'model_version': model.version,
+        'retraining': retrain_lock.locked()
+    }
+
+@app.route('/events', methods=['GET'])
+@app.route('/api/events', methods=['GET'])
+def stream_events():
+    """
+    Stream SSE: evento 'snapshot' con el estado actual y después 'pending' (contadores de feedback),
+    'model' (nueva versión del modelo) y 'retrain' (inicio, progreso por época, fin o error).
+    """
+    subscriber = event_broker.subscribe()
+    if subscriber is None:
+        return jsonify({'success': False, 'error': 'Demasiados clientes conectados'}), 503
+    
+    try:
+        initial = events_snapshot()
+    except Exception:
+        event_broker.unsubscribe(subscriber)
+        raise
+    return Response(
+        stream_with_context(event_broker.stream(subscriber, initial)),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+def stats_payload():
+    """Contadores del dataset y estado del modelo (cuerpo de /stats)"""
+    training_data, feedback_data, pending_feedback = trainer.load_training_data()
+    return {
+        'training_samples': len(training_data),
+        'feedback_samples': len(feedback_data),
+        'pending_feedback': len(pending_feedback),
+        'total_samples': len(training_data) + len(feedback_data) + len(pending_feedback),
+        'model_loaded': model.model is not None,
+        'model_version': model.version,
+        'ready_for_retrain': len(pending_feedback) >= 5
+    }
+
 @app.route('/stats', methods=['GET', 'OPTIONS'])
 @app.route('/api/stats', methods=['GET', 'OPTIONS'])
 def get_stats():
@@ -203,19 +732,16 @@ def get_stats():
         return '', 204
         
     try:
-        training_data, feedback_data, pending_feedback = trainer.load_training_data()
+        # Sin cambios en dataset ni modelo: 304 sin releer el JSON
+        etag = make_etag('stats', dataset_revision(), model.version)
+        cached = not_modified(etag, STATS_CACHE_CONTROL)
+        if cached is not None:
+            return cached
         
-        return jsonify({
-            'success': True,
-            'stats': {
-                'training_samples': len(training_data),
-                'feedback_samples': len(feedback_data),
-                'pending_feedback': len(pending_feedback),
-                'total_samples': len(training_data) + len(feedback_data) + len(pending_feedback),
-                'model_loaded': model.model is not None,
-                'ready_for_retrain': len(pending_feedback) >= 5
-            }
-        })
+        response = jsonify({'success': True, 'stats': stats_payload()})
+        response.set_etag(etag)
+        response.headers['Cache-Control'] = STATS_CACHE_CONTROL
+        return response
     except Exception as e:
         print(f"❌ Error en /stats: {str(e)}")
         traceback.print_exc()
@@ -226,7 +752,7 @@ if __name__ == '__main__':
     print("🚀 NEURO UX STYLER API")
     print("=" * 60)
     print("📍 Servidor: http://localhost:5001")
-    print("🏥 Health check: http://localhost:5001/health")
+    print("🏥 Health check: http://localhost:5001/health (live: /health/live, ready: /health/ready)")
     print("📊 Stats: http://localhost:5001/stats")
     print("=" * 60)
     app.run(debug=True, port=5001, host='0.0.0.0')
\ No newline at end of file
@@ -0,0 +1,362 @@
+"""
+Modo de servicio ASGI (Starlette) con las mismas rutas y contratos JSON que app.py.
+
+El servidor Flask ocupa un hilo durante toda la request. Aquí el event loop solo atiende
+conexiones y cada trabajo bloqueante va a un executor acotado:
+- inferencia (/generate y las vistas CPU-bound) -> executor 'inference' (N hilos)
+- lectura/escritura del dataset (/feedback, /stats, /events) -> executor 'io' (1 hilo). Las
+  escrituras del JSON no dependen de él: /retrain y el scheduler también reescriben el archivo, así
+  que Trainer las serializa con su dataset_lock y las escribe con temporal + rename
+- /retrain -> executor 'retrain'
+Cuando un executor está lleno las requests esperan en el event loop sin ocupar hilos, así un
+proceso sostiene miles de clientes lentos. /optimize, /explain, /recommendations y las requests
+perfiladas se atienden con las vistas Flask dentro del executor de inferencia.
+
+Uso:
+    python asgi.py
+    uvicorn asgi:app --host 0.0.0.0 --port 5001
+"""
+import os
+import json
+import asyncio
+import functools
+import traceback
+import contextlib
+from concurrent.futures import ThreadPoolExecutor
+
+from starlette.applications import Starlette
+from starlette.middleware import Middleware
+from starlette.middleware.cors import CORSMiddleware
+from starlette.responses import Response, StreamingResponse
+from starlette.routing import Route
+from werkzeug.http import parse_etags, quote_etag
+
+import app as core
+from single_flight import AsyncSingleFlight, fingerprint
+from admission import Overloaded
+from scheduler import AUTO_RETRAIN
+
+INFERENCE_WORKERS = int(os.environ.get('NEURO_UX_ASGI_INFERENCE_WORKERS', '4'))
+# Tareas admitidas por executor (en curso + en cola); el resto espera en el event loop
+EXECUTOR_QUEUE = int(os.environ.get('NEURO_UX_ASGI_EXECUTOR_QUEUE', '64'))
+ASGI_PORT = int(os.environ.get('NEURO_UX_ASGI_PORT', '5001'))
+
+
+class BoundedExecutor:
+    """
+    ThreadPoolExecutor con un límite de tareas admitidas. Por encima del límite las corrutinas
+    esperan en un semáforo del event loop en vez de encolar trabajo sin límite en el pool.
+    """
+
+    def __init__(self, name, workers, limit):
+        self.name = name
+        self.workers = workers
+        self.limit = limit
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f'asgi-{name}')
+        self._semaphore = None
+        self.submitted = 0
+        self.failed = 0
+        self.in_flight = 0
+        self.waiting = 0
+        self.max_waiting = 0
+
+    async def run(self, fn, *args, **kwargs):
+        if self._semaphore is None:
+            # Se crea dentro del loop que sirve las requests
+            self._semaphore = asyncio.Semaphore(self.limit)
+
+        self.waiting += 1
+        self.max_waiting = max(self.max_waiting, self.waiting)
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self.waiting -= 1
+
+        self.submitted += 1
+        self.in_flight += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, functools.partial(fn, *args, **kwargs))
+        except Exception:
+            self.failed += 1
+            raise
+        finally:
+            self.in_flight -= 1
+            self._semaphore.release()
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self):
+        return {
+            'workers': self.workers,
+            'limit': self.limit,
+            'in_flight': self.in_flight,
+            'waiting': self.waiting,
+            'max_waiting': self.max_waiting,
+            'submitted': self.submitted,
+            'failed': self.failed,
+        }
+
+
+inference = BoundedExecutor('inference', INFERENCE_WORKERS, EXECUTOR_QUEUE)
+dataset_io = BoundedExecutor('io', 1, EXECUTOR_QUEUE)
+# Dos hilos: un segundo /retrain llega a run_retrain y recibe 409 en vez de esperar
+training = BoundedExecutor('retrain', 2, 2)
+generate_flight = AsyncSingleFlight()
+
+
+def json_response(payload, status=200, headers=None):
+    """JSON con el provider de Flask y el formato de jsonify (compacto, con salto de línea final)"""
+    body = core.app.json.dumps(payload, separators=(',', ':')) + '\n'
+    return Response(body, status_code=status, headers=headers, media_type='application/json')
+
+
+def error_response(route, e):
+    print(f"❌ Error en {route}: {str(e)}")
+    traceback.print_exc()
+    return json_response({'success': False, 'error': str(e)}, 500)
+
+
+async def read_json(request):
+    body = await request.body()
+    return json.loads(body) if body else None
+
+
+def not_modified(request, etag, cache_control):
+    """Respuesta 304 si el If-None-Match coincide con el ETag; None si no"""
+    if not parse_etags(request.headers.get('if-none-match')).contains_weak(etag):
+        return None
+    return Response(status_code=304, headers={'ETag': quote_etag(etag), 'Cache-Control': cache_control})
+
+
+def wants_profile(request):
+    """Las requests perfiladas (explícitas o por muestreo) pasan por la vista Flask con @profiled"""
+    return core.profiler.is_requested(request.headers, request.query_params) or core.profiler.should_sample()
+
+
+def _dispatch_flask(method, path, query_string, headers, body):
+    """Ejecuta la vista Flask de la ruta (en un hilo del executor)"""
+    with core.app.test_request_context(path, method=method, query_string=query_string,
+                                       headers=headers, data=body):
+        response = core.app.full_dispatch_request()
+        return response.status_code, dict(response.headers), response.get_data()
+
+
+async def flask_view(request):
+    """Rutas sin versión asíncrona propia: misma vista y mismo contrato que el servidor Flask"""
+    body = await request.body()
+    status, headers, content = await inference.run(
+        _dispatch_flask, request.method, request.url.path, request.url.query, dict(request.headers), body
+    )
+    return Response(content, status_code=status, headers=headers)
+
+
+async def health_check(request):
+    return json_response({
+        'status': 'healthy',
+        'model_loaded': core.model.model is not None,
+        'ready': core.readiness.ready
+    })
+
+
+async def liveness_check(request):
+    return json_response({'status': 'alive'})
+
+
+async def readiness_check(request):
+    state = core.readiness.stats()
+    ready = state['ready'] and core.model.model is not None
+    return json_response({
+        'status': 'ready' if ready else 'not_ready',
+        'model_loaded': core.model.model is not None,
+        'model_version': core.model.version,
+        **state
+    }, 200 if ready else 503)
+
+
+async def admitted_inference(input_data, priority):
+    """Inferencia dentro de un slot de admisión; la espera en cola no ocupa hilos del executor"""
+    async with core.admission.admit_async(priority):
+        return await inference.run(core.render_generate, input_data)
+
+
+async def generate_ui_kit(request):
+    """/generate: la inferencia corre en el executor acotado; GET con ETag como en Flask"""
+    if request.method == 'OPTIONS':
+        return Response(status_code=204)
+    if wants_profile(request):
+        return await flask_view(request)
+
+    try:
+        data = dict(request.query_params) if request.method == 'GET' else await read_json(request)
+        if not data:
+            return json_response({'success': False, 'error': 'No se recibieron datos'}, 400)
+
+        input_data = core.generate_input(data)
+        key = fingerprint(input_data)
+        etag = None
+        if request.method == 'GET':
+            etag = core.generate_etag(input_data, key)
+            cached = not_modified(request, etag, core.GENERATE_CACHE_CONTROL)
+            if cached is not None:
+                return cached
+
+        priority = core.request_priority(request.headers, request.query_params)
+        (body, confidence), shared = await generate_flight.do(key, admitted_inference, input_data, priority)
+
+        headers = {}
+        if shared:
+            headers['X-Coalesced'] = '1'
+        if etag is not None:
+            headers['ETag'] = quote_etag(etag)
+            headers['Cache-Control'] = core.GENERATE_CACHE_CONTROL
+        return Response(body, headers=headers, media_type='application/json')
+    except Overloaded as e:
+        return json_response(core.overloaded_body(e), 503, headers={'Retry-After': str(e.retry_after)})
+    except Exception as e:
+        return error_response('/generate', e)
+
+
+async def submit_feedback(request):
+    """/feedback: la persistencia corre en el executor de I/O (Trainer serializa las escrituras)"""
+    if request.method == 'OPTIONS':
+        return Response(status_code=204)
+    if wants_profile(request):
+        return await flask_view(request)
+
+    try:
+        data = await read_json(request) or {}
+        input_data = data.get('input_data')
+        rating = data.get('rating')
+        if not input_data or rating is None:
+            return json_response({'success': False, 'error': 'Se requiere input_data y rating'}, 400)
+
+        payload = await dataset_io.run(core.record_feedback, input_data, rating, data.get('feedback', ''))
+        return json_response(payload)
+    except Exception as e:
+        return error_response('/feedback', e)
+
+
+async def retrain_model(request):
+    if request.method == 'OPTIONS':
+        return Response(status_code=204)
+    if wants_profile(request):
+        return await flask_view(request)
+
+    try:
+        try:
+            data = await read_json(request)
+        except ValueError:
+            data = None
+        force = bool((data if isinstance(data, dict) else {}).get('force', False))
+        payload, status = await training.run(core.run_retrain, force=force)
+        return json_response(payload, status)
+    except Exception as e:
+        return error_response('/retrain', e)
+
+
+async def get_stats(request):
+    """/stats: 304 sin tocar el dataset; la lectura del JSON va al executor de I/O"""
+    if request.method == 'OPTIONS':
+        return Response(status_code=204)
+
+    try:
+        etag = core.make_etag('stats', core.dataset_revision(), core.model.version)
+        cached = not_modified(request, etag, core.STATS_CACHE_CONTROL)
+        if cached is not None:
+            return cached
+
+        stats = await dataset_io.run(core.stats_payload)
+        return json_response({'success': True, 'stats': stats}, headers={
+            'ETag': quote_etag(etag),
+            'Cache-Control': core.STATS_CACHE_CONTROL
+        })
+    except Exception as e:
+        return error_response('/stats', e)
+
+
+async def get_metrics(request):
+    if request.method == 'OPTIONS':
+        return Response(status_code=204)
+
+    metrics = core.runtime_metrics()
+    metrics['generate_single_flight'] = generate_flight.stats()
+    metrics['asgi'] = {
+        'inference': inference.stats(),
+        'io': dataset_io.stats(),
+        'retrain': training.stats(),
+    }
+    return json_response({'success': True, 'metrics': metrics})
+
+
+async def stream_events(request):
+    """SSE sin un hilo por cliente: cada stream espera en el event loop"""
+    subscriber = core.event_broker.subscribe()
+    if subscriber is None:
+        return json_response({'success': False, 'error': 'Demasiados clientes conectados'}, 503)
+
+    try:
+        initial = await dataset_io.run(core.events_snapshot)
+    except Exception as e:
+        core.event_broker.unsubscribe(subscriber)
+        return error_response('/events', e)
+    return StreamingResponse(
+        core.event_broker.astream(subscriber, initial),
+        media_type='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+
+def routes():
+    native = [
+        ('/health', health_check, ['GET', 'OPTIONS']),
+        ('/health/live', liveness_check, ['GET']),
+        ('/health/ready', readiness_check, ['GET']),
+        ('/generate', generate_ui_kit, ['GET', 'POST', 'OPTIONS']),
+        ('/feedback', submit_feedback, ['POST', 'OPTIONS']),
+        ('/retrain', retrain_model, ['POST', 'OPTIONS']),
+        ('/stats', get_stats, ['GET', 'OPTIONS']),
+        ('/metrics', get_metrics, ['GET', 'OPTIONS']),
+        ('/events', stream_events, ['GET']),
+    ]
+    table = []
+    for path, endpoint, methods in native:
+        table.append(Route(path, endpoint, methods=methods))
+        table.append(Route(f'/api{path}', endpoint, methods=methods))
+    # Resto de rutas (optimize, explain, recommendations, 404): vistas Flask en el executor
+    table.append(Route('/{path:path}', flask_view, methods=['GET', 'POST', 'OPTIONS']))
+    return table
+
+
+@contextlib.asynccontextmanager
+async def lifespan(_app):
+    if AUTO_RETRAIN:
+        core.retrain_scheduler.start()
+    print(f"⚡ Modo ASGI: {INFERENCE_WORKERS} hilos de inferencia, cola de {EXECUTOR_QUEUE} por executor")
+    yield
+    for executor in (inference, dataset_io, training):
+        executor.shutdown()
+
+
+app = Starlette(
+    routes=routes(),
+    middleware=[Middleware(
+        CORSMiddleware,
+        allow_origins=['*'],
+        allow_methods=['GET', 'POST', 'OPTIONS'],
+        allow_headers=['Content-Type', 'X-Profile', 'X-Admin-Token', 'X-Priority'],
+    )],
+    lifespan=lifespan,
+)
+
+
+if __name__ == '__main__':
+    import uvicorn
+
+    print("=" * 60)
+    print("🚀 NEURO UX STYLER API (ASGI)")
+    print("=" * 60)
+    print(f"📍 Servidor: http://localhost:{ASGI_PORT}")
+    print("=" * 60)
+    uvicorn.run(app, host='0.0.0.0', port=ASGI_PORT, backlog=4096, timeout_keep_alive=30)
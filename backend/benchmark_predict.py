@@ -0,0 +1,82 @@
+"""
+Microbenchmark de predicción: model.predict (Keras) vs función compilada (tf.function)
+y opcionalmente XLA, para batch sizes de 1 a 1024.
+
+Uso:
+    python benchmark_predict.py
+    python benchmark_predict.py --xla --repeats 50
+"""
+import os
+import sys
+import time
+import argparse
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from model import NeuroUXModel
+
+BATCH_SIZES = [1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024]
+
+
+def time_call(fn, X, repeats):
+    """Mediana de latencia en ms tras un calentamiento"""
+    fn(X)
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn(X)
+        samples.append((time.perf_counter() - start) * 1000)
+    return float(np.median(samples))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark model.predict vs ruta compilada")
+    parser.add_argument('--repeats', type=int, default=30)
+    parser.add_argument('--xla', action='store_true', help="Incluir la variante con jit_compile (XLA)")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("⏱️  BENCHMARK DE PREDICCIÓN")
+    print("=" * 60)
+
+    model = NeuroUXModel(compiled=True)
+    if not model.load_model():
+        print("⚠️ Usando modelo sin entrenar (los tiempos siguen siendo válidos)")
+        model.warmup_compiled()
+
+    variants = {
+        'keras_predict': lambda X: model.model.predict(X, verbose=0),
+        'compiled': model._predict_compiled,
+    }
+
+    if args.xla:
+        xla_model = NeuroUXModel(compiled=True, use_xla=True)
+        xla_model.model = model.model
+        xla_model.warmup_compiled()
+        variants['compiled_xla'] = xla_model._predict_compiled
+
+    rng = np.random.default_rng(42)
+    header = f"{'batch':>6s} " + " ".join(f"{name:>15s}" for name in variants) + f" {'speedup':>8s}"
+    print("\nLatencia mediana (ms):")
+    print(header)
+    print("-" * len(header))
+
+    for batch in BATCH_SIZES:
+        X = rng.random((batch, 14), dtype=np.float32)
+        times = {name: time_call(fn, X, args.repeats) for name, fn in variants.items()}
+
+        # Sanity check: ambas rutas deben dar el mismo resultado
+        diff = np.max(np.abs(variants['keras_predict'](X) - variants['compiled'](X)))
+        if diff > 1e-4:
+            print(f"⚠️ Diferencia entre rutas en batch {batch}: {diff:.6f}")
+
+        speedup = times['keras_predict'] / times['compiled'] if times['compiled'] > 0 else float('inf')
+        print(f"{batch:6d} " + " ".join(f"{times[name]:15.3f}" for name in variants) + f" {speedup:7.1f}x")
+
+    print("\n💡 Ajusta el umbral con NEURO_UX_COMPILED_MAX_BATCH (actual: batches <= umbral usan la ruta compilada)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,230 @@
+"""
+Micro-benchmarks de los caminos calientes de DataProcessor con gate de regresión.
+
+Cubre encode_input, _analyze_palette_quality, _analyze_fonts_quality, _convert_branding_to_ux
+y generate_ui_kit sobre corpus de inputs con semilla fija (branding, diseño UX, misiones largas
+y paletas grandes). Reporta ops/seg (mejor de varias repeticiones) y bytes asignados por llamada
+(pico, tracemalloc) y los compara contra un baseline JSON versionado en el repo.
+
+Uso:
+    python benchmark_processor.py                    # compara contra el baseline (exit 1 si hay regresión)
+    python benchmark_processor.py --filter palette   # solo los casos que contienen 'palette'
+    python benchmark_processor.py --update-baseline  # graba el baseline actual
+"""
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import platform
+import tracemalloc
+import contextlib
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from data_processor import DataProcessor
+from load_test import make_branding_input, make_ux_input, BRANDING_KEYWORDS, SECTORS
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), 'data', 'benchmarks', 'processor_baseline.json')
+CORPUS_SIZE = 64
+# Holgura absoluta en bytes: en llamadas que asignan poco, unos bytes de ruido no son regresión
+ALLOC_SLACK_BYTES = 512
+
+FILLER_WORDS = [
+    'marca', 'clientes', 'personas', 'equipo', 'experiencia', 'producto', 'mercado', 'valor',
+    'soluciones', 'proyectos', 'crecimiento', 'impacto', 'región', 'servicios', 'historia',
+]
+
+
+def make_long_mission_input(rng, words=300):
+    """Brief de branding con una misión larga (keywords diluidas en texto de relleno)"""
+    text = [rng.choice(BRANDING_KEYWORDS if rng.random() < 0.1 else FILLER_WORDS) for _ in range(words)]
+    return {
+        'name': f"Marca {rng.randint(1, 9999)}",
+        'mission': ' '.join(text),
+        'values': ', '.join(rng.sample(BRANDING_KEYWORDS, 4)),
+        'sector': rng.choice(SECTORS),
+        'audience': 'general',
+    }
+
+
+def make_large_palette_input(rng, colors=(24, 64)):
+    """Diseño UX con una paleta grande de colores aleatorios"""
+    design = make_ux_input(rng)
+    design['palette'] = [f"#{rng.randrange(0x1000000):06X}" for _ in range(rng.randint(*colors))]
+    return design
+
+
+def build_corpora(seed):
+    """Corpus fijos por tipo de input (misma semilla = mismos inputs)"""
+    rng = random.Random(seed)
+    return {
+        'branding': [make_branding_input(rng) for _ in range(CORPUS_SIZE)],
+        'ux': [make_ux_input(rng) for _ in range(CORPUS_SIZE)],
+        'long_mission': [make_long_mission_input(rng) for _ in range(CORPUS_SIZE)],
+        'large_palette': [make_large_palette_input(rng) for _ in range(CORPUS_SIZE)],
+    }
+
+
+def build_cases(processor, corpora):
+    """Casos del benchmark: nombre -> (función, lista de argumentos por llamada)"""
+    def ui_kit_inputs(briefs):
+        inputs = []
+        for i, brief in enumerate(briefs):
+            ux_data, keywords = processor._convert_branding_to_ux(brief)
+            prediction = np.array([[0.3 + 0.6 * (i % 7) / 6]])
+            inputs.append((prediction, {'keywords': keywords, 'converted_ux_data': ux_data}, brief.get('sector')))
+        return inputs
+
+    cases = {}
+    for corpus in ('branding', 'ux', 'long_mission', 'large_palette'):
+        cases[f'encode_input[{corpus}]'] = (processor.encode_input, [(d,) for d in corpora[corpus]])
+    for corpus in ('ux', 'large_palette'):
+        cases[f'_analyze_palette_quality[{corpus}]'] = (
+            processor._analyze_palette_quality, [(d['palette'],) for d in corpora[corpus]]
+        )
+    cases['_analyze_fonts_quality[ux]'] = (processor._analyze_fonts_quality, [(d['fonts'],) for d in corpora['ux']])
+    for corpus in ('branding', 'long_mission'):
+        cases[f'_convert_branding_to_ux[{corpus}]'] = (
+            processor._convert_branding_to_ux, [(d,) for d in corpora[corpus]]
+        )
+    for corpus in ('branding', 'long_mission'):
+        cases[f'generate_ui_kit[{corpus}]'] = (processor.generate_ui_kit, ui_kit_inputs(corpora[corpus]))
+    return cases
+
+
+def measure(fn, inputs, repeats=5, min_time=0.1, alloc_sample=500):
+    """
+    Retorna (ops/seg, bytes asignados por llamada).
+    ops/seg es la mejor de 'repeats' repeticiones de al menos 'min_time' segundos (menos ruido);
+    los bytes son el pico medio de tracemalloc por llamada.
+    """
+    for args in inputs:
+        fn(*args)
+
+    # Calibración: iteraciones para que una repetición dure ~min_time
+    iterations = len(inputs)
+    while True:
+        start = time.perf_counter()
+        for i in range(iterations):
+            fn(*inputs[i % len(inputs)])
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            break
+        iterations *= 2
+
+    best = iterations / elapsed
+    for _ in range(repeats - 1):
+        start = time.perf_counter()
+        for i in range(iterations):
+            fn(*inputs[i % len(inputs)])
+        best = max(best, iterations / (time.perf_counter() - start))
+
+    peaks = []
+    tracemalloc.start()
+    for i in range(min(alloc_sample, iterations)):
+        tracemalloc.reset_peak()
+        current = tracemalloc.get_traced_memory()[0]
+        fn(*inputs[i % len(inputs)])
+        peaks.append(tracemalloc.get_traced_memory()[1] - current)
+    tracemalloc.stop()
+
+    return best, sum(peaks) / len(peaks)
+
+
+def compare_with_baseline(results, baseline, tolerance):
+    """Compara contra el baseline. Retorna lista de regresiones detectadas."""
+    regressions = []
+    base_results = baseline.get('results', {})
+    for name, result in results.items():
+        ref = base_results.get(name)
+        if not ref:
+            continue
+        if result['ops_per_sec'] < ref['ops_per_sec'] * (1 - tolerance):
+            regressions.append(f"{name}: {result['ops_per_sec']:,.0f} ops/s < {ref['ops_per_sec']:,.0f} (-{tolerance:.0%})")
+        if result['bytes_per_call'] > ref['bytes_per_call'] * (1 + tolerance) + ALLOC_SLACK_BYTES:
+            regressions.append(f"{name}: {result['bytes_per_call']:,.0f} bytes/llamada > "
+                               f"{ref['bytes_per_call']:,.0f} (+{tolerance:.0%})")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Micro-benchmarks de DataProcessor")
+    parser.add_argument('--filter', default='', help="Solo casos cuyo nombre contiene este texto")
+    parser.add_argument('--repeats', type=int, default=5)
+    parser.add_argument('--min-time', type=float, default=0.1, help="Segundos mínimos por repetición")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--baseline', default=BASELINE_PATH)
+    parser.add_argument('--tolerance', type=float, default=0.30)
+    parser.add_argument('--update-baseline', action='store_true')
+    args = parser.parse_args()
+
+    processor = DataProcessor()
+    corpora = build_corpora(args.seed)
+    cases = {name: case for name, case in build_cases(processor, corpora).items() if args.filter in name}
+    if not cases:
+        print(f"❌ Ningún caso coincide con '{args.filter}'")
+        return 1
+
+    print("=" * 72)
+    print("⏱️  MICRO-BENCHMARKS DE DATAPROCESSOR")
+    print("=" * 72)
+    print(f"Corpus: {CORPUS_SIZE} inputs por tipo (semilla {args.seed}) | mejor de {args.repeats} repeticiones\n")
+
+    results = {}
+    devnull = open(os.devnull, 'w')
+    try:
+        for name, (fn, inputs) in cases.items():
+            # encode_input imprime en cada llamada: se mide el costo, sin llenar la terminal
+            with contextlib.redirect_stdout(devnull):
+                ops, allocated = measure(fn, inputs, repeats=args.repeats, min_time=args.min_time)
+            results[name] = {'ops_per_sec': round(ops, 1), 'bytes_per_call': round(allocated, 1)}
+            print(f"{name:40s} {ops:12,.0f} ops/s   {allocated:10,.0f} bytes/llamada")
+    finally:
+        devnull.close()
+
+    if args.update_baseline:
+        baseline = {'results': {}}
+        if args.filter and os.path.exists(args.baseline):
+            with open(args.baseline, 'r', encoding='utf-8') as f:
+                baseline = json.load(f)
+        baseline.update({
+            'recorded_at': time.strftime('%Y-%m-%d'),
+            'tolerance': args.tolerance,
+            'seed': args.seed,
+            'python': platform.python_version(),
+            'machine': platform.machine(),
+        })
+        baseline['results'].update(results)
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(baseline, f, indent=2, ensure_ascii=False)
+        print(f"\n💾 Baseline actualizado: {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"\n⚠️ No existe baseline en {args.baseline}. Usa --update-baseline para crearlo.")
+        return 0
+
+    with open(args.baseline, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+
+    if baseline.get('seed') != args.seed:
+        print("\n⚠️ El baseline se grabó con otra semilla; la comparación es orientativa.")
+
+    regressions = compare_with_baseline(results, baseline, args.tolerance)
+    if regressions:
+        print("\n❌ Regresiones respecto al baseline:")
+        for r in regressions:
+            print(f"   - {r}")
+        return 1
+
+    print("\n✅ Sin regresiones respecto al baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
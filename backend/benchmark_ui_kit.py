@@ -0,0 +1,126 @@
+"""
+Benchmark de armado + serialización de la respuesta de /generate:
+- legacy: diccionarios reconstruidos por request + jsonify de toda la estructura
+- fragments: partes estáticas compartidas con JSON pre-serializado + empalme de campos dinámicos
+
+Uso:
+    python benchmark_ui_kit.py
+    python benchmark_ui_kit.py --iterations 20000
+"""
+import os
+import sys
+import time
+import argparse
+import tracemalloc
+
+import numpy as np
+from flask import Flask, jsonify
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from data_processor import DataProcessor
+from ui_kit_fragments import UIKitFragments
+
+BRIEFS = [
+    {'mission': 'innovación digital', 'values': 'futuro', 'sector': 'tecnología'},
+    {'mission': 'lujo exclusivo', 'values': 'calidad', 'sector': 'finanzas'},
+    {'mission': 'arte original', 'values': 'diseño', 'sector': 'entretenimiento'},
+    {'mission': 'salud sostenible', 'values': 'verde', 'sector': 'salud'},
+]
+
+
+def legacy_response(processor, prediction, metadata):
+    """Camino anterior: tokens recreados en cada llamada y jsonify del UI Kit completo"""
+    ui_kit = processor.generate_ui_kit(prediction, metadata, None)
+    ui_kit['tokens'] = processor._load_design_tokens()
+    response = {
+        'success': True,
+        'ui_kit': {
+            'colors': ui_kit.get('colors', {}),
+            'typography': ui_kit.get('typography', {}),
+            'components': ui_kit.get('components', {}),
+            'tokens': ui_kit.get('tokens', {}),
+            'confidence': float(prediction[0][0]),
+            'style': ui_kit.get('style', {})
+        }
+    }
+    return jsonify(response).get_data()
+
+
+def fragments_response(processor, fragments, prediction, metadata):
+    """Camino nuevo: fragmentos pre-serializados + campos dinámicos"""
+    ui_kit = processor.generate_ui_kit(prediction, metadata, None)
+    return fragments.render_generate(ui_kit, float(prediction[0][0]))
+
+
+def measure(fn, inputs, iterations):
+    """Retorna (ops/seg, pico de memoria asignada por llamada en bytes)"""
+    for args in inputs:
+        fn(*args)
+
+    start = time.perf_counter()
+    for i in range(iterations):
+        fn(*inputs[i % len(inputs)])
+    elapsed = time.perf_counter() - start
+
+    sample = min(iterations, 1000)
+    peaks = []
+    tracemalloc.start()
+    for i in range(sample):
+        tracemalloc.reset_peak()
+        current = tracemalloc.get_traced_memory()[0]
+        fn(*inputs[i % len(inputs)])
+        peaks.append(tracemalloc.get_traced_memory()[1] - current)
+    tracemalloc.stop()
+
+    return iterations / elapsed, sum(peaks) / len(peaks)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de serialización del UI Kit")
+    parser.add_argument('--iterations', type=int, default=10000)
+    args = parser.parse_args()
+
+    app = Flask(__name__)
+    processor = DataProcessor()
+    fragments = UIKitFragments(processor)
+
+    inputs = []
+    for brief in BRIEFS:
+        ux_data, keywords = processor._convert_branding_to_ux(brief)
+        metadata = {'keywords': keywords, 'converted_ux_data': ux_data}
+        inputs.append((np.array([[0.87]]), metadata))
+
+    print("=" * 60)
+    print("📦 BENCHMARK DE SERIALIZACIÓN DEL UI KIT")
+    print("=" * 60)
+
+    with app.app_context():
+        # Ambos caminos deben producir el mismo JSON
+        for prediction, metadata in inputs:
+            legacy = legacy_response(processor, prediction, metadata)
+            spliced = fragments_response(processor, fragments, prediction, metadata)
+            if legacy != spliced:
+                print("❌ Las respuestas difieren:")
+                print(legacy)
+                print(spliced)
+                return 1
+
+        variants = {
+            'legacy (jsonify)': lambda p, m: legacy_response(processor, p, m),
+            'fragments': lambda p, m: fragments_response(processor, fragments, p, m),
+        }
+        results = {}
+        for name, fn in variants.items():
+            ops, allocated = measure(fn, inputs, args.iterations)
+            results[name] = (ops, allocated)
+            print(f"{name:18s} {ops:12,.0f} ops/s   {allocated:10,.0f} bytes asignados/llamada (pico)")
+
+    legacy_ops = results['legacy (jsonify)'][0]
+    fragment_ops = results['fragments'][0]
+    print(f"\n⚡ Speedup: {fragment_ops / legacy_ops:.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
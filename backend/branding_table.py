@@ -0,0 +1,146 @@
+import io
+import time
+import itertools
+import contextlib
+
+import numpy as np
+
+# Orden fijo de las keywords que definen un perfil de branding
+KEYWORD_ORDER = ('modern', 'professional', 'creative', 'luxury', 'eco')
+
+# Una palabra disparadora por keyword (sin solaparse con otras, p.ej. 'ia' dentro de 'confianza')
+KEYWORD_TRIGGERS = {
+    'modern': 'digital',
+    'professional': 'calidad',
+    'creative': 'arte',
+    'luxury': 'lujo',
+    'eco': 'verde',
+}
+
+
+class BrandingScoreTable:
+    """
+    Tabla precalculada de todos los perfiles de branding alcanzables:
+    (5 keywords booleanas) x (estilo de sector) -> features, confianza y UI Kit.
+    Los inputs de branding se resuelven con una búsqueda en diccionario;
+    si la tabla no está lista o el input no encaja, se usa la inferencia en vivo.
+    """
+
+    def __init__(self, processor, model, tolerance=1e-4):
+        self.processor = processor
+        self.model = model
+        self.tolerance = tolerance
+        self.entries = {}
+        self.ready = False
+        self.hits = 0
+        self.misses = 0
+        self.build_time = 0.0
+
+    def _sector_styles(self):
+        """Estilos de sector distintos (los sectores no mapeados usan 'tech_modern')"""
+        return sorted(set(self.processor.sector_styles.values()) | {'tech_modern'})
+
+    def _sector_for_style(self, style):
+        """Sector representativo de un estilo, para reconstruir inputs de branding"""
+        for sector, mapped in self.processor.sector_styles.items():
+            if mapped == style:
+                return sector
+        return 'general'
+
+    def profile_key(self, data):
+        """Clave canónica (perfil de keywords, estilo de sector) de un input de branding"""
+        full_text = (data.get('mission', '') + ' ' + data.get('values', '')).lower()
+        keywords = self.processor._analyze_keywords(full_text)
+        style = self.processor.sector_styles.get(data.get('sector', 'general'), 'tech_modern')
+        return tuple(bool(keywords[k]) for k in KEYWORD_ORDER), style
+
+    def build(self):
+        """Construye la tabla con un único predict en batch. Retorna el número de entradas."""
+        start = time.perf_counter()
+        keys, features, metadatas = [], [], []
+
+        for profile in itertools.product((False, True), repeat=len(KEYWORD_ORDER)):
+            keywords = dict(zip(KEYWORD_ORDER, profile))
+            for style in self._sector_styles():
+                ux_data = self.processor._ux_from_keywords(keywords, self._sector_for_style(style))
+                row, scores = self.processor.encode_ux_features(ux_data)
+                keys.append((profile, style))
+                features.append(row)
+                metadatas.append({**scores, 'keywords': keywords, 'converted_ux_data': ux_data})
+
+        X = np.array(features, dtype=np.float32)
+        confidences = self.model.predict(X).reshape(-1)
+
+        entries = {}
+        for key, row, metadata, confidence in zip(keys, X, metadatas, confidences):
+            prediction = np.array([[confidence]])
+            entries[key] = {
+                'features': row,
+                'confidence': float(confidence),
+                'ui_kit': self.processor.generate_ui_kit(prediction, metadata, None),
+            }
+
+        # Swap atómico: las requests en curso siguen usando la tabla anterior
+        self.entries = entries
+        self.build_time = time.perf_counter() - start
+        self.ready = True
+        print(f"📋 Tabla de branding construida: {len(entries)} perfiles en {self.build_time*1000:.0f} ms")
+        return len(entries)
+
+    def lookup(self, data):
+        """Retorna la entrada precalculada o None (fallback a inferencia en vivo)"""
+        if not self.ready or self.processor._detect_input_type(data) != 'branding':
+            return None
+        try:
+            entry = self.entries.get(self.profile_key(data))
+        except (AttributeError, TypeError):
+            entry = None
+
+        if entry is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return entry
+
+    def verify(self):
+        """
+        Compara cada entrada con el camino en vivo (encode_input + predict).
+        Si alguna difiere, desactiva la tabla. Retorna la lista de discrepancias.
+        """
+        mismatches = []
+        for (profile, style), entry in self.entries.items():
+            words = [KEYWORD_TRIGGERS[k] for k, active in zip(KEYWORD_ORDER, profile) if active]
+            data = {
+                'name': 'verify',
+                'mission': ' '.join(words),
+                'values': '',
+                'sector': self._sector_for_style(style),
+                'audience': 'general',
+            }
+            with contextlib.redirect_stdout(io.StringIO()):
+                features, _, _ = self.processor.encode_input(data)
+                live = float(self.model.predict(features)[0][0])
+
+            if (self.profile_key(data) != (profile, style) or
+                    not np.allclose(features[0], entry['features'], atol=self.tolerance) or
+                    abs(live - entry['confidence']) > self.tolerance):
+                mismatches.append({'profile': dict(zip(KEYWORD_ORDER, profile)), 'sector_style': style,
+                                   'table': entry['confidence'], 'live': live})
+
+        if mismatches:
+            self.ready = False
+            print(f"⚠️ Tabla de branding inconsistente ({len(mismatches)} perfiles). Usando inferencia en vivo.")
+        else:
+            print(f"✅ Tabla de branding verificada contra inferencia en vivo ({len(self.entries)} perfiles)")
+        return mismatches
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            'ready': self.ready,
+            'entries': len(self.entries),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_ratio': self.hits / total if total else 0.0,
+            'build_ms': round(self.build_time * 1000, 1),
+        }
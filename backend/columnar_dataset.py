@@ -0,0 +1,425 @@
+"""
+Formato columnar binario para combined_training_data.json.
+
+Cada dataset se guarda en un directorio '<nombre>.columnar/' con:
+- schema.json: versión, diccionarios de categorías y revisión del JSON de origen
+- un .npy por columna (memory-mappable): códigos enteros pequeños para categorías,
+  paletas y fuentes como arrays de códigos indexados por offsets, ratings en float32
+
+Los items que no encajan en el esquema se guardan como JSON crudo, así la conversión
+JSON -> columnar -> JSON es sin pérdidas.
+
+Uso:
+    python columnar_dataset.py convert            # JSON -> columnar
+    python columnar_dataset.py export salida.json # columnar -> JSON
+    python columnar_dataset.py verify             # round-trip + tamaños + tiempos de carga
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+
+import numpy as np
+
+FORMAT_VERSION = 1
+
+SECTIONS = ('training_data', 'feedback_data', 'pending_feedback')
+LIST_FIELDS = {'palette': 'color', 'fonts': 'font'}
+UX_SCALAR_FIELDS = ('layout', 'spacing', 'contrast')
+BRANDING_FIELDS = ('name', 'mission', 'values', 'sector', 'audience')
+ITEM_TEXT_FIELDS = ('category', 'feedback')
+ITEM_KEYS = {'input', 'rating'} | set(ITEM_TEXT_FIELDS)
+INPUT_KEYS = set(LIST_FIELDS) | set(UX_SCALAR_FIELDS) | set(BRANDING_FIELDS)
+
+RATING_ABSENT, RATING_FLOAT, RATING_INT = 0, 1, 2
+LABEL_THRESHOLD = np.float32(0.7)
+
+
+def default_path(json_path):
+    """Directorio columnar asociado a un JSON"""
+    return os.path.splitext(json_path)[0] + '.columnar'
+
+
+def _code_dtype(size):
+    """Tipo entero más pequeño para un diccionario de 'size' valores (-1 = ausente)"""
+    if size < 2 ** 7:
+        return np.int8
+    if size < 2 ** 15:
+        return np.int16
+    return np.int32
+
+
+class _Dictionary:
+    """Diccionario valor -> código entero"""
+
+    def __init__(self, values=None):
+        self.values = list(values or [])
+        self.index = {v: i for i, v in enumerate(self.values)}
+
+    def code(self, value):
+        if value not in self.index:
+            self.index[value] = len(self.values)
+            self.values.append(value)
+        return self.index[value]
+
+
+def _is_conforming(item):
+    """Indica si el item encaja en el esquema columnar (si no, se guarda como JSON crudo)"""
+    if not isinstance(item, dict) or not isinstance(item.get('input'), dict):
+        return False
+    if not set(item) <= ITEM_KEYS or not set(item['input']) <= INPUT_KEYS:
+        return False
+
+    rating = item.get('rating', 0.0)
+    if isinstance(rating, bool) or not isinstance(rating, (int, float)):
+        return False
+    if any(not isinstance(item[k], str) for k in ITEM_TEXT_FIELDS if k in item):
+        return False
+
+    data = item['input']
+    for field in LIST_FIELDS:
+        if field in data and (not isinstance(data[field], list) or
+                              not all(isinstance(v, str) for v in data[field])):
+            return False
+    return all(isinstance(data[k], str) for k in UX_SCALAR_FIELDS + BRANDING_FIELDS if k in data)
+
+
+def to_columnar(data, source=None):
+    """
+    Convierte el dataset (objeto con secciones o lista simple) a columnas.
+    Retorna: (columns: dict nombre -> np.ndarray, schema: dict)
+    """
+    if isinstance(data, list):
+        layout, sections = 'list', {'training_data': data}
+        extra_top_level = {}
+    else:
+        layout, sections = 'object', data
+        extra_top_level = {k: v for k, v in data.items() if k not in SECTIONS}
+
+    dicts = {name: _Dictionary() for name in
+             ['raw', *LIST_FIELDS.values(), *UX_SCALAR_FIELDS, *BRANDING_FIELDS, *ITEM_TEXT_FIELDS]}
+
+    section_col, raw_col = [], []
+    rating_col, rating_kind = [], []
+    scalar_cols = {name: [] for name in UX_SCALAR_FIELDS + BRANDING_FIELDS + ITEM_TEXT_FIELDS}
+    list_cols = {field: {'present': [], 'offsets': [0], 'codes': []} for field in LIST_FIELDS}
+
+    for section_id, section in enumerate(SECTIONS):
+        for item in sections.get(section, []) or []:
+            section_col.append(section_id)
+            conforming = _is_conforming(item)
+            raw_col.append(-1 if conforming else dicts['raw'].code(json.dumps(item, ensure_ascii=False)))
+            data_in = item['input'] if conforming else {}
+
+            rating = item.get('rating') if conforming else None
+            rating_kind.append(
+                RATING_ABSENT if rating is None else RATING_INT if isinstance(rating, int) else RATING_FLOAT
+            )
+            rating_col.append(float(rating) if rating is not None else np.nan)
+
+            for name in UX_SCALAR_FIELDS + BRANDING_FIELDS:
+                scalar_cols[name].append(dicts[name].code(data_in[name]) if name in data_in else -1)
+            for name in ITEM_TEXT_FIELDS:
+                scalar_cols[name].append(dicts[name].code(item[name]) if conforming and name in item else -1)
+
+            for field, dict_name in LIST_FIELDS.items():
+                col = list_cols[field]
+                values = data_in.get(field)
+                col['present'].append(values is not None)
+                col['codes'].extend(dicts[dict_name].code(v) for v in values or [])
+                col['offsets'].append(len(col['codes']))
+
+    rating_exact = np.array(rating_col, dtype=np.float64)
+    columns = {
+        'section': np.array(section_col, dtype=np.int8),
+        'raw': np.array(raw_col, dtype=_code_dtype(len(dicts['raw'].values))),
+        'rating': rating_exact.astype(np.float32),
+        # Copia exacta solo para el round-trip sin pérdidas hacia JSON
+        'rating_exact': rating_exact,
+        'rating_kind': np.array(rating_kind, dtype=np.int8),
+    }
+    for name, values in scalar_cols.items():
+        columns[name] = np.array(values, dtype=_code_dtype(len(dicts[name].values)))
+    for field, dict_name in LIST_FIELDS.items():
+        col = list_cols[field]
+        columns[f'{field}_present'] = np.array(col['present'], dtype=bool)
+        columns[f'{field}_offsets'] = np.array(col['offsets'], dtype=np.int32)
+        columns[f'{field}_codes'] = np.array(col['codes'], dtype=_code_dtype(len(dicts[dict_name].values)))
+
+    schema = {
+        'version': FORMAT_VERSION,
+        'rows': len(section_col),
+        'layout': layout,
+        'sections_present': [s for s in SECTIONS if s in sections],
+        'extra_top_level': extra_top_level,
+        'dictionaries': {name: d.values for name, d in dicts.items()},
+        'source': source,
+    }
+    return columns, schema
+
+
+def from_columnar(columns, schema):
+    """Reconstruye el dataset JSON a partir de las columnas"""
+    dicts = schema['dictionaries']
+    sections = {s: [] for s in schema['sections_present']}
+
+    for row in range(schema['rows']):
+        section = SECTIONS[int(columns['section'][row])]
+        raw_code = int(columns['raw'][row])
+        if raw_code >= 0:
+            sections.setdefault(section, []).append(json.loads(dicts['raw'][raw_code]))
+            continue
+
+        data_in = {}
+        for field, dict_name in LIST_FIELDS.items():
+            if columns[f'{field}_present'][row]:
+                start, end = columns[f'{field}_offsets'][row], columns[f'{field}_offsets'][row + 1]
+                data_in[field] = [dicts[dict_name][int(c)] for c in columns[f'{field}_codes'][start:end]]
+        for name in UX_SCALAR_FIELDS + BRANDING_FIELDS:
+            code = int(columns[name][row])
+            if code >= 0:
+                data_in[name] = dicts[name][code]
+
+        item = {'input': data_in}
+        kind = int(columns['rating_kind'][row])
+        if kind == RATING_INT:
+            item['rating'] = int(columns['rating_exact'][row])
+        elif kind == RATING_FLOAT:
+            item['rating'] = float(columns['rating_exact'][row])
+        for name in ITEM_TEXT_FIELDS:
+            code = int(columns[name][row])
+            if code >= 0:
+                item[name] = dicts[name][code]
+        sections.setdefault(section, []).append(item)
+
+    if schema['layout'] == 'list':
+        return sections.get('training_data', [])
+    return {**sections, **schema.get('extra_top_level', {})}
+
+
+def _source_revision(json_path):
+    stat = os.stat(json_path)
+    return {'file': os.path.basename(json_path), 'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size}
+
+
+def json_to_columnar(json_path, out_dir=None):
+    """Convierte un JSON a directorio columnar. Retorna la ruta del directorio."""
+    out_dir = out_dir or default_path(json_path)
+    with open(json_path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+
+    columns, schema = to_columnar(data, source=_source_revision(json_path))
+
+    # Se escribe en un directorio temporal junto al destino y se intercambia al final:
+    # un corte a mitad de la conversión nunca deja un dataset mezclado
+    parent, base = os.path.split(os.path.abspath(out_dir))
+    suffix = os.urandom(4).hex()
+    tmp_dir = os.path.join(parent, f'.{base}.tmp_{suffix}')
+    os.makedirs(tmp_dir)
+    try:
+        for name, array in columns.items():
+            np.save(os.path.join(tmp_dir, f'{name}.npy'), array)
+        # El schema se escribe al final: marca el directorio como completo
+        with open(os.path.join(tmp_dir, 'schema.json'), 'w', encoding='utf-8') as f:
+            json.dump(schema, f, ensure_ascii=False)
+
+        # rename no reemplaza un directorio con contenido: el anterior se aparta y se borra después.
+        # Entre ambos rename el directorio no existe y el Trainer usa el JSON.
+        old_dir = None
+        if os.path.exists(out_dir):
+            old_dir = os.path.join(parent, f'.{base}.old_{suffix}')
+            os.replace(out_dir, old_dir)
+        os.replace(tmp_dir, out_dir)
+    except BaseException:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise
+    if old_dir:
+        shutil.rmtree(old_dir, ignore_errors=True)
+    return out_dir
+
+
+def columnar_to_json(in_dir, json_path):
+    """Exporta un directorio columnar a JSON (mismo formato que combined_training_data.json)"""
+    dataset = ColumnarDataset(in_dir, mmap=True)
+    with open(json_path, 'w', encoding='utf-8') as f:
+        json.dump(dataset.to_json(), f, indent=2, ensure_ascii=False)
+    return json_path
+
+
+class ColumnarDataset:
+    """Dataset columnar cargado con memory-map (sin copiar los arrays a memoria)"""
+
+    def __init__(self, path, mmap=True):
+        self.path = path
+        with open(os.path.join(path, 'schema.json'), 'r', encoding='utf-8') as f:
+            self.schema = json.load(f)
+        if self.schema.get('version') != FORMAT_VERSION:
+            raise ValueError(f"Versión de formato columnar no soportada: {self.schema.get('version')}")
+
+        mode = 'r' if mmap else None
+        self.columns = {
+            os.path.splitext(name)[0]: np.load(os.path.join(path, name), mmap_mode=mode)
+            for name in os.listdir(path) if name.endswith('.npy')
+        }
+
+    @staticmethod
+    def is_fresh(path, json_path):
+        """True si el directorio columnar corresponde a la revisión actual del JSON"""
+        schema_path = os.path.join(path, 'schema.json')
+        if not os.path.exists(schema_path) or not os.path.exists(json_path):
+            return False
+        with open(schema_path, 'r', encoding='utf-8') as f:
+            source = json.load(f).get('source') or {}
+        current = _source_revision(json_path)
+        return source.get('mtime_ns') == current['mtime_ns'] and source.get('size') == current['size']
+
+    def __len__(self):
+        return self.schema['rows']
+
+    def section_counts(self):
+        counts = np.bincount(self.columns['section'], minlength=len(SECTIONS))
+        return {s: int(counts[i]) for i, s in enumerate(SECTIONS)}
+
+    def to_json(self):
+        return from_columnar(self.columns, self.schema)
+
+    def _list_ids(self, field):
+        """Id por fila de la lista de códigos (paleta/fuentes); retorna (ids, listas por id)"""
+        present = self.columns[f'{field}_present'].tolist()
+        offsets = self.columns[f'{field}_offsets'].tolist()
+        codes = self.columns[f'{field}_codes'].tolist()
+
+        lookup, ids = {}, np.empty(len(self), dtype=np.int32)
+        for row in range(len(self)):
+            key = tuple(codes[offsets[row]:offsets[row + 1]]) if present[row] else None
+            ids[row] = lookup.setdefault(key, len(lookup))
+        return ids, list(lookup)
+
+    def prepare(self, processor):
+        """
+        Features (N, 14) y etiquetas equivalentes a Trainer.prepare_dataset.
+        Las filas se agrupan por códigos y cada input distinto se codifica una sola vez.
+        """
+        dicts = self.schema['dictionaries']
+        scalar_names = UX_SCALAR_FIELDS + BRANDING_FIELDS
+
+        list_ids, list_values = {}, {}
+        for field in LIST_FIELDS:
+            list_ids[field], list_values[field] = self._list_ids(field)
+
+        keys = np.column_stack(
+            [list_ids[f] for f in LIST_FIELDS] +
+            [np.asarray(self.columns[name], dtype=np.int32) for name in scalar_names]
+        ) if len(self) else np.empty((0, len(LIST_FIELDS) + len(scalar_names)), dtype=np.int32)
+        raw = np.asarray(self.columns['raw'])
+        structured = raw < 0
+
+        X = np.empty((len(self), 14))
+        valid = structured.copy()
+
+        # Filas estructuradas: una codificación por input distinto
+        if structured.any():
+            unique_keys, inverse = np.unique(keys[structured], axis=0, return_inverse=True)
+            designs = []
+            for key in unique_keys.tolist():
+                data_in = {}
+                for field, list_id in zip(LIST_FIELDS, key):
+                    codes = list_values[field][list_id]
+                    if codes is not None:
+                        data_in[field] = [dicts[LIST_FIELDS[field]][c] for c in codes]
+                for name, code in zip(scalar_names, key[len(LIST_FIELDS):]):
+                    if code >= 0:
+                        data_in[name] = dicts[name][code]
+
+                if processor._detect_input_type(data_in) == 'branding':
+                    data_in, _ = processor._convert_branding_to_ux(data_in)
+                designs.append(data_in)
+            X[structured] = processor.encode_batch(designs)[inverse.reshape(-1)]
+
+        ratings = np.where(
+            np.asarray(self.columns['rating_kind']) == RATING_ABSENT,
+            np.float32(0.5), np.asarray(self.columns['rating'])
+        )
+        y = (ratings >= LABEL_THRESHOLD).astype(int)
+
+        # Filas crudas: mismo camino que el JSON
+        for row in np.flatnonzero(~structured):
+            item = json.loads(dicts['raw'][int(raw[row])])
+            if not isinstance(item, dict) or 'input' not in item:
+                continue
+            try:
+                features, _, _ = processor.encode_input(item['input'])
+                y[row] = 1 if item.get('rating', 0.5) >= 0.7 else 0
+            except Exception as e:
+                print(f"⚠️ Error procesando item: {e}")
+                continue
+            X[row] = features[0]
+            valid[row] = True
+
+        if not valid.any():
+            return np.array([]), np.array([])
+        return X[valid], y[valid]
+
+
+def _dir_size(path):
+    return sum(os.path.getsize(os.path.join(path, f)) for f in os.listdir(path))
+
+
+def main():
+    default_json = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'combined_training_data.json')
+
+    parser = argparse.ArgumentParser(description="Conversión JSON <-> columnar del dataset")
+    parser.add_argument('command', choices=['convert', 'export', 'verify'])
+    parser.add_argument('output', nargs='?', help="Ruta de salida (export: JSON)")
+    parser.add_argument('--json', default=default_json, help="Dataset JSON de origen")
+    parser.add_argument('--columnar', help="Directorio columnar (por defecto junto al JSON)")
+    args = parser.parse_args()
+
+    columnar_path = args.columnar or default_path(args.json)
+
+    if args.command == 'convert':
+        out = json_to_columnar(args.json, columnar_path)
+        print(f"✅ Dataset columnar escrito en {out}")
+        print(f"📦 JSON: {os.path.getsize(args.json) / 1024:.1f} KB -> columnar: {_dir_size(out) / 1024:.1f} KB")
+        return 0
+
+    if args.command == 'export':
+        if not args.output:
+            parser.error("export requiere la ruta del JSON de salida")
+        columnar_to_json(columnar_path, args.output)
+        print(f"✅ JSON exportado en {args.output}")
+        return 0
+
+    # verify
+    with open(args.json, 'r', encoding='utf-8') as f:
+        original = json.load(f)
+    columns, schema = to_columnar(original)
+    if from_columnar(columns, schema) != original:
+        print("❌ El round-trip JSON -> columnar -> JSON no es idéntico")
+        return 1
+    print("✅ Round-trip sin pérdidas")
+
+    if not os.path.exists(os.path.join(columnar_path, 'schema.json')):
+        print(f"⚠️ No existe {columnar_path}. Ejecuta: python columnar_dataset.py convert")
+        return 0
+
+    start = time.perf_counter()
+    with open(args.json, 'r', encoding='utf-8') as f:
+        json.load(f)
+    json_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    dataset = ColumnarDataset(columnar_path, mmap=True)
+    columnar_time = time.perf_counter() - start
+
+    print(f"📦 Tamaño: JSON {os.path.getsize(args.json) / 1024:.1f} KB | columnar {_dir_size(columnar_path) / 1024:.1f} KB")
+    print(f"⏱️  Carga: JSON {json_time * 1000:.2f} ms | columnar (mmap) {columnar_time * 1000:.2f} ms")
+    print(f"📊 Filas: {len(dataset)} {dataset.section_counts()}")
+    print(f"🔄 Fresco respecto al JSON: {ColumnarDataset.is_fresh(columnar_path, args.json)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,38 @@
+import os
+
+import numpy as np
+
+# Agrupar inputs repetidos antes de entrenar (una fila por input, con peso = repeticiones)
+COMPACT_DATASET = os.environ.get('NEURO_UX_COMPACT_DATASET', '0') == '1'
+
+
+def compact_rows(X, y, sample_weight=None, soft_labels=True):
+    """
+    Colapsa las filas con las mismas features en una sola, con peso igual al número de filas del
+    grupo (o la suma de sus pesos si se pasan).
+    - soft_labels=True (entrenamiento): un input canónico por fila; su etiqueta es la fracción
+      ponderada de etiquetas positivas (rating >= 0.7). La binary crossentropy es lineal en la
+      etiqueta: la loss ponderada es la misma que la de las filas originales.
+    - soft_labels=False (validación): se agrupa por features y etiqueta, así un input con ratings a
+      ambos lados del umbral queda como una fila positiva y una negativa. Loss, accuracy y AUC
+      ponderadas son idénticas a las de las filas originales.
+    Retorna (X, y, sample_weight).
+    """
+    X = np.asarray(X)
+    y = np.asarray(y)
+    if len(X) == 0:
+        return X, y.astype(np.float32), np.ones(0)
+
+    weights_in = np.ones(len(X)) if sample_weight is None else np.asarray(sample_weight, dtype=np.float64)
+    keys = X.reshape(len(X), -1)
+    if not soft_labels:
+        keys = np.concatenate([keys, y.reshape(-1, 1).astype(X.dtype)], axis=1)
+
+    unique, inverse = np.unique(keys, axis=0, return_inverse=True)
+    inverse = inverse.reshape(-1)
+    weights = np.bincount(inverse, weights=weights_in, minlength=len(unique))
+    positives = np.bincount(inverse, weights=weights_in * y.reshape(-1), minlength=len(unique))
+
+    n_features = X.reshape(len(X), -1).shape[1]
+    X_compact = unique[:, :n_features].astype(X.dtype).reshape((len(unique),) + X.shape[1:])
+    return X_compact, (positives / weights).astype(np.float32), weights
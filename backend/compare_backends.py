@@ -0,0 +1,148 @@
+"""
+Compara el backend Keras contra TFLite (sin cuantizar, float16 e int8)
+sobre el split de validación: drift de precisión, latencia y memoria.
+
+Uso:
+    python compare_backends.py
+    python compare_backends.py --repeats 500
+"""
+import os
+import sys
+import time
+import argparse
+import tempfile
+
+import numpy as np
+from sklearn.metrics import roc_auc_score
+from sklearn.model_selection import train_test_split
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from model import NeuroUXModel, TFLITE_QUANTIZATIONS
+from training import Trainer
+
+
+def rss_mb():
+    """Memoria residente del proceso (MB), vía /proc en Linux"""
+    try:
+        with open('/proc/self/statm') as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024)
+    except (OSError, ValueError):
+        return float('nan')
+
+
+def latency_ms(predict_fn, X, repeats):
+    """Latencia p50/p95 de una fila y throughput de batch completo"""
+    row = X[:1]
+    predict_fn(row)  # calentamiento
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        predict_fn(row)
+        samples.append((time.perf_counter() - start) * 1000)
+
+    start = time.perf_counter()
+    predict_fn(X)
+    batch_time = time.perf_counter() - start
+
+    return {
+        'p50': float(np.percentile(samples, 50)),
+        'p95': float(np.percentile(samples, 95)),
+        'batch_rows_per_s': len(X) / batch_time if batch_time > 0 else float('inf'),
+    }
+
+
+def quality(probs, y):
+    probs = probs.reshape(-1)
+    accuracy = float(np.mean((probs >= 0.5).astype(int) == y))
+    auc = float(roc_auc_score(y, probs)) if len(np.unique(y)) > 1 else float('nan')
+    return accuracy, auc
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compara backends Keras vs TFLite")
+    parser.add_argument('--repeats', type=int, default=200, help="Repeticiones para latencia de 1 fila")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("⚖️  COMPARACIÓN DE BACKENDS: KERAS vs TFLITE")
+    print("=" * 60)
+
+    trainer = Trainer()
+    X, y = trainer.prepare_dataset()
+    if len(X) < 10:
+        print("❌ Dataset insuficiente para comparar")
+        return
+
+    # Mismo split que Trainer.train_model
+    stratify = y if np.sum(y) > 1 and len(y) - np.sum(y) > 1 else None
+    _, X_val, _, y_val = train_test_split(X, y, test_size=0.2, random_state=42, stratify=stratify)
+    X_val = X_val.astype(np.float32)
+    print(f"📊 Validación: {len(X_val)} muestras")
+
+    rss_before = rss_mb()
+    keras_model = NeuroUXModel(backend='keras')
+    if not keras_model.load_model():
+        print("❌ No hay modelo entrenado. Ejecuta primero: python training.py")
+        return
+    keras_rss = rss_mb() - rss_before
+
+    keras_probs = keras_model.predict(X_val)
+    keras_acc, keras_auc = quality(keras_probs, y_val)
+    keras_lat = latency_ms(keras_model.predict, X_val, args.repeats)
+
+    rows = [{
+        'backend': 'keras',
+        'size_kb': os.path.getsize(keras_model.model_path) / 1024,
+        'rss_mb': keras_rss,
+        'accuracy': keras_acc,
+        'auc': keras_auc,
+        'max_drift': 0.0,
+        'flips': 0,
+        **keras_lat,
+    }]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for quantization in TFLITE_QUANTIZATIONS:
+            path = os.path.join(tmp, f'model_{quantization}.tflite')
+            if keras_model.export_tflite(quantization=quantization, path=path) is None:
+                continue
+
+            rss_before = rss_mb()
+            lite = NeuroUXModel(backend='tflite')
+            lite.load_tflite(path)
+            lite_rss = rss_mb() - rss_before
+
+            probs = lite.predict(X_val)
+            acc, auc = quality(probs, y_val)
+            drift = np.abs(probs.reshape(-1) - keras_probs.reshape(-1))
+            flips = int(np.sum((probs.reshape(-1) >= 0.5) != (keras_probs.reshape(-1) >= 0.5)))
+
+            rows.append({
+                'backend': f'tflite-{quantization}',
+                'size_kb': os.path.getsize(path) / 1024,
+                'rss_mb': lite_rss,
+                'accuracy': acc,
+                'auc': auc,
+                'max_drift': float(drift.max()),
+                'flips': flips,
+                **latency_ms(lite.predict, X_val, args.repeats),
+            })
+
+    print("\n" + "=" * 60)
+    print("📈 RESULTADOS")
+    print("=" * 60)
+    header = f"{'backend':16s} {'KB':>7s} {'RSS MB':>7s} {'acc':>6s} {'auc':>6s} {'drift':>8s} {'flips':>5s} {'p50 ms':>7s} {'p95 ms':>7s} {'rows/s':>10s}"
+    print(header)
+    print("-" * len(header))
+    for r in rows:
+        print(
+            f"{r['backend']:16s} {r['size_kb']:7.1f} {r['rss_mb']:7.1f} {r['accuracy']:6.3f} {r['auc']:6.3f} "
+            f"{r['max_drift']:8.5f} {r['flips']:5d} {r['p50']:7.3f} {r['p95']:7.3f} {r['batch_rows_per_s']:10.0f}"
+        )
+    print("\n💡 Selecciona el backend con NEURO_UX_BACKEND=tflite y NEURO_UX_TFLITE_QUANTIZATION=none|float16|int8")
+
+
+if __name__ == "__main__":
+    main()
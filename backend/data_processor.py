@@ -44,9 +44,18 @@ class DataProcessor:
         self.bad_contrast = ["low", "none", "inverted"]
         
         # ===== PARA DATOS DE BRANDING =====
+        self.sector_styles = {
+            'tecnología': 'tech_modern',
+            'salud': 'health',
+            'finanzas': 'finance',
+            'educación': 'education',
+            'entretenimiento': 'entertainment',
+        }
         self.color_palettes = self._load_color_palettes()
+        # Partes estáticas del UI Kit: compartidas entre requests (no se modifican)
         self.fonts_catalog = self._load_fonts()
         self.components = self._load_components()
+        self.design_tokens = self._load_design_tokens()
         
     def _load_color_palettes(self):
         """Paletas de colores por sector"""
@@ -128,6 +137,10 @@ class DataProcessor:
         keywords = self._analyze_keywords(full_text)
         sector = data.get('sector', 'general')
         
+        return self._ux_from_keywords(keywords, sector), keywords
+
+    def _ux_from_keywords(self, keywords, sector):
+        """Genera el diseño UX a partir del perfil de keywords y el sector"""
         # Generar paleta basada en keywords y sector
         if keywords.get('luxury'):
             palette = self.color_palettes['luxury'][:3]
@@ -138,14 +151,7 @@ class DataProcessor:
         elif keywords.get('professional'):
             palette = self.color_palettes['professional'][:3]
         else:
-            sector_map = {
-                'tecnología': 'tech_modern',
-                'salud': 'health',
-                'finanzas': 'finance',
-                'educación': 'education',
-                'entretenimiento': 'entertainment',
-            }
-            style = sector_map.get(sector, 'tech_modern')
+            style = self.sector_styles.get(sector, 'tech_modern')
             palette = self.color_palettes[style][:3]
         
         # Generar fuentes basada en keywords
@@ -172,7 +178,7 @@ class DataProcessor:
             'contrast': contrast
         }
         
-        return ux_data, keywords
+        return ux_data
 
     def _analyze_keywords(self, text):
         """Analiza palabras clave en el texto"""
@@ -308,7 +314,23 @@ class DataProcessor:
         else:
             keywords = {}
         
-        # Ahora procesar como UX design
+        features, scores = self.encode_ux_features(data)
+        
+        metadata = {
+            **scores,
+            'keywords': keywords,
+            'converted_ux_data': data
+        }
+        
+        print(f"🔑 Keywords extraídos: {[k for k, v in keywords.items() if v] if keywords else 'ninguno'}")
+        
+        return np.array(features).reshape(1, -1), metadata, None
+
+    def encode_ux_features(self, data):
+        """
+        Codifica un diseño UX en el vector de 14 features.
+        Retorna: (features, scores por aspecto)
+        """
         palette = data.get('palette', [])
         fonts = data.get('fonts', [])
         layout = data.get('layout', 'grid')
@@ -354,19 +376,77 @@ class DataProcessor:
             (layout_score + spacing_score + contrast_score) / 3
         ]
         
-        metadata = {
+        scores = {
             'palette_quality': palette_score,
             'fonts_quality': fonts_score,
             'layout_quality': layout_score,
             'spacing_quality': spacing_score,
             'contrast_quality': contrast_score,
-            'keywords': keywords,
-            'converted_ux_data': data
         }
         
-        print(f"🔑 Keywords extraídos: {[k for k, v in keywords.items() if v] if keywords else 'ninguno'}")
-        
-        return np.array(features).reshape(1, -1), metadata, None
+        return features, scores
+
+    def _palette_features(self, palette):
+        """Features que dependen solo de la paleta (se memorizan en encode_batch)"""
+        palette = list(palette)
+        has_white = any('#FFF' in str(c).upper() for c in palette)
+        has_black = any('#000' in str(c).upper() for c in palette)
+        has_contrast = bool(palette) and any(self._is_light_color(c) for c in palette) and \
+            any(not self._is_light_color(c) for c in palette)
+        return (
+            self._analyze_palette_quality(palette),
+            min(len(palette) / 5.0, 1.0) if palette else 0.0,
+            1.0 if (has_white or has_black) else 0.5,
+            1.0 if has_contrast else 0.0,
+        )
+
+    def encode_batch(self, designs):
+        """
+        Codifica muchos diseños UX en una matriz (N, 14) en una sola pasada vectorizada.
+        Los scores por atributo se calculan una vez por valor distinto.
+        Equivalente fila a fila a encode_ux_features.
+        """
+        palette_cache, fonts_cache = {}, {}
+        layout_cache, spacing_cache, contrast_cache = {}, {}, {}
+        columns = np.empty((len(designs), 9), dtype=np.float64)
+
+        for i, data in enumerate(designs):
+            palette = tuple(data.get('palette', []) or [])
+            fonts = tuple(data.get('fonts', []) or [])
+            layout = data.get('layout', 'grid')
+            spacing = data.get('spacing', 'medium')
+            contrast = data.get('contrast', 'high')
+
+            if palette not in palette_cache:
+                palette_cache[palette] = self._palette_features(palette)
+            if fonts not in fonts_cache:
+                fonts_cache[fonts] = (
+                    self._analyze_fonts_quality(list(fonts)),
+                    min(len(fonts) / 3.0, 1.0) if fonts else 0.0,
+                )
+            if layout not in layout_cache:
+                layout_cache[layout] = self._encode_layout(layout)
+            if spacing not in spacing_cache:
+                spacing_cache[spacing] = self._encode_spacing(spacing)
+            if contrast not in contrast_cache:
+                contrast_cache[contrast] = self._encode_contrast(contrast)
+
+            palette_score, palette_size, classic, palette_contrast = palette_cache[palette]
+            fonts_score, fonts_count = fonts_cache[fonts]
+            columns[i] = (
+                palette_score, fonts_score, layout_cache[layout], spacing_cache[spacing],
+                contrast_cache[contrast], palette_size, fonts_count, classic, palette_contrast
+            )
+
+        p, f, l, s, c = (columns[:, j] for j in range(5))
+        interactions = np.stack([
+            p * c,
+            f * l,
+            s * l,
+            (p + f) / 2,
+            (l + s + c) / 3,
+        ], axis=1)
+        return np.hstack([columns, interactions])
 
     def generate_ui_kit(self, prediction, metadata, sector=None, audience=None):
         """Genera UI Kit basado en predicción"""
@@ -397,7 +477,10 @@ class DataProcessor:
         else:
             components = self.components['soft']
         
-        # Generar UI Kit completo
+        return self._assemble_ui_kit(palette, fonts, components, confidence, keywords)
+
+    def _assemble_ui_kit(self, palette, fonts, components, confidence, keywords):
+        """Arma el UI Kit completo a partir de paleta, fuentes y componentes elegidos"""
         ui_kit = {
             'colors': {
                 'primary': palette[0] if len(palette) > 0 else '#2DD4BF',
@@ -418,7 +501,11 @@ class DataProcessor:
         return ui_kit
 
     def _generate_design_tokens(self, components):
-        """Genera tokens de diseño"""
+        """Genera tokens de diseño (escalas fijas, se reutiliza la instancia compartida)"""
+        return self.design_tokens
+
+    def _load_design_tokens(self):
+        """Escalas de tokens de diseño"""
         return {
             'spacing': {
                 'xs': '4px',
@@ -0,0 +1,206 @@
+import os
+import time
+
+import numpy as np
+
+from single_flight import fingerprint
+
+# Umbrales: un score >= 1 en cualquier señal indica drift.
+# Los shifts se miden como z-score de la media pendiente (error estándar sigma/sqrt(n)),
+# así unos pocos feedbacks ruidosos no disparan el reentrenamiento.
+Z_THRESHOLD = float(os.environ.get('NEURO_UX_DRIFT_Z_THRESHOLD', '3.0'))
+LOSS_RATIO_THRESHOLD = float(os.environ.get('NEURO_UX_DRIFT_LOSS_RATIO', '1.25'))
+# Por encima de este score el reentrenamiento es completo; entre 1 y este valor, corto
+FULL_RETRAIN_SCORE = float(os.environ.get('NEURO_UX_DRIFT_FULL_SCORE', '2.0'))
+SHORT_RETRAIN_EPOCHS = int(os.environ.get('NEURO_UX_DRIFT_SHORT_EPOCHS', '15'))
+FULL_RETRAIN_EPOCHS = 50
+
+CHUNK_SIZE = 256
+EPSILON = 1e-7
+
+
+class RunningStats:
+    """Media y varianza en streaming (Welford, con fusión de bloques de Chan)"""
+
+    def __init__(self, dims=1):
+        self.count = 0
+        self.mean = np.zeros(dims)
+        self.m2 = np.zeros(dims)
+
+    def update(self, batch):
+        batch = np.asarray(batch, dtype=np.float64).reshape(len(batch), -1)
+        n = len(batch)
+        if n == 0:
+            return self
+        batch_mean = batch.mean(axis=0)
+        batch_m2 = ((batch - batch_mean) ** 2).sum(axis=0)
+
+        total = self.count + n
+        delta = batch_mean - self.mean
+        self.mean = self.mean + delta * n / total
+        self.m2 = self.m2 + batch_m2 + delta ** 2 * self.count * n / total
+        self.count = total
+        return self
+
+    @property
+    def var(self):
+        return self.m2 / self.count if self.count else np.zeros_like(self.m2)
+
+
+class DriftDetector:
+    """
+    Compara el feedback pendiente con la distribución de entrenamiento antes de reentrenar:
+    - shift de las 14 features codificadas (z-score de la media pendiente)
+    - shift de la distribución de ratings (media y tasa de positivos, también como z-score)
+    - loss del modelo actual sobre las filas pendientes vs sobre los datos de entrenamiento
+    Decide 'skip', 'short' o 'full'.
+    """
+
+    def __init__(self, processor, model):
+        self.processor = processor
+        self.model = model
+        self._reference = None
+        self._reference_key = None
+
+    def invalidate(self):
+        """Descarta la referencia (tras reentrenar cambia la loss del modelo)"""
+        self._reference = None
+        self._reference_key = None
+
+    def _chunks(self, items):
+        """Genera (features, ratings) por bloques; descarta items inválidos como prepare_dataset"""
+        designs, ratings = [], []
+        for item in items:
+            if not isinstance(item, dict) or not isinstance(item.get('input'), dict):
+                continue
+            rating = item.get('rating', 0.5)
+            if isinstance(rating, bool) or not isinstance(rating, (int, float)):
+                continue
+            data = item['input']
+            try:
+                if self.processor._detect_input_type(data) == 'branding':
+                    data, _ = self.processor._convert_branding_to_ux(data)
+            except Exception:
+                continue
+            designs.append(data)
+            ratings.append(float(rating))
+            if len(designs) == CHUNK_SIZE:
+                yield self.processor.encode_batch(designs), np.array(ratings)
+                designs, ratings = [], []
+        if designs:
+            yield self.processor.encode_batch(designs), np.array(ratings)
+
+    def _summarize(self, items):
+        """Estadísticas en streaming de features, ratings, etiquetas y loss del modelo"""
+        features, rating_stats, label_stats = RunningStats(14), RunningStats(), RunningStats()
+        loss_sum = 0.0
+        for X, ratings in self._chunks(items):
+            labels = (ratings >= 0.7).astype(np.float64)
+            features.update(X)
+            rating_stats.update(ratings)
+            label_stats.update(labels)
+
+            p = np.clip(self.model.predict(X.astype(np.float32)).reshape(-1), EPSILON, 1 - EPSILON)
+            loss_sum += float(-(labels * np.log(p) + (1 - labels) * np.log(1 - p)).sum())
+
+        return {
+            'features': features,
+            'ratings': rating_stats,
+            'labels': label_stats,
+            'loss': loss_sum / features.count if features.count else 0.0,
+        }
+
+    def _reference_for(self, reference_items):
+        """
+        Resumen de la referencia, reutilizado mientras no cambien sus items ni el modelo.
+        La clave es la huella del contenido (no el tamaño): un reemplazo o un commit que consume y
+        agrega la misma cantidad de items también recalcula.
+        """
+        key = (fingerprint(reference_items), getattr(self.model, 'version', None))
+        if self._reference is None or self._reference_key != key:
+            self._reference = self._summarize(reference_items)
+            self._reference_key = key
+        return self._reference
+
+    def assess(self, reference_items, pending_items):
+        """
+        Evalúa el drift del feedback pendiente respecto a training + feedback ya consumido.
+        Retorna un dict con la decisión, el score y las métricas que la justifican.
+        """
+        start = time.perf_counter()
+        reference = self._reference_for(reference_items)
+        pending = self._summarize(pending_items)
+
+        if reference['features'].count == 0 or pending['features'].count == 0:
+            return {
+                'decision': 'full',
+                'reason': 'sin datos de referencia o pendientes válidos',
+                'score': None,
+                'reference_rows': reference['features'].count,
+                'pending_rows': pending['features'].count,
+                'elapsed_ms': round((time.perf_counter() - start) * 1000, 2),
+            }
+
+        n = pending['features'].count
+        ref_std = np.sqrt(reference['features'].var)
+        mean_diff = np.abs(pending['features'].mean - reference['features'].mean)
+        effect = mean_diff / (ref_std + EPSILON)
+        z = mean_diff / (ref_std / np.sqrt(n) + EPSILON)
+        # Features constantes en la referencia: cualquier diferencia cuenta justo como drift
+        constant = reference['features'].var < EPSILON
+        z[constant] = np.where(mean_diff[constant] > EPSILON, Z_THRESHOLD, 0.0)
+
+        def mean_z(name):
+            stats = (pending[name], reference[name])
+            diff = abs(float(stats[0].mean[0] - stats[1].mean[0]))
+            return diff, diff / (float(np.sqrt(stats[1].var[0])) / np.sqrt(n) + EPSILON)
+
+        rating_shift, rating_z = mean_z('ratings')
+        positive_shift, positive_z = mean_z('labels')
+        loss_ratio = pending['loss'] / max(reference['loss'], EPSILON)
+
+        signals = {
+            'feature_shift': float(z.max()) / Z_THRESHOLD,
+            'rating_shift': max(rating_z, positive_z) / Z_THRESHOLD,
+            'loss_ratio': max(loss_ratio - 1.0, 0.0) / (LOSS_RATIO_THRESHOLD - 1.0),
+        }
+        score = max(signals.values())
+
+        if score < 1.0:
+            decision, reason = 'skip', 'el feedback pendiente coincide con la distribución de entrenamiento'
+        elif score < FULL_RETRAIN_SCORE:
+            decision, reason = 'short', f'drift moderado ({max(signals, key=signals.get)})'
+        else:
+            decision, reason = 'full', f'drift alto ({max(signals, key=signals.get)})'
+
+        return {
+            'decision': decision,
+            'reason': reason,
+            'score': round(score, 4),
+            'signals': {k: round(v, 4) for k, v in signals.items()},
+            'metrics': {
+                'max_feature_z': round(float(z.max()), 4),
+                'max_feature_effect': round(float(effect.max()), 4),
+                'top_shifted_features': [int(i) for i in np.argsort(-z)[:3]],
+                'rating_mean_shift': round(rating_shift, 4),
+                'rating_z': round(rating_z, 4),
+                'positive_rate_shift': round(positive_shift, 4),
+                'positive_rate_z': round(positive_z, 4),
+                'reference_loss': round(reference['loss'], 4),
+                'pending_loss': round(pending['loss'], 4),
+                'loss_ratio': round(loss_ratio, 4),
+            },
+            'thresholds': {
+                'z': Z_THRESHOLD,
+                'loss_ratio': LOSS_RATIO_THRESHOLD,
+                'full_score': FULL_RETRAIN_SCORE,
+            },
+            'reference_rows': reference['features'].count,
+            'pending_rows': pending['features'].count,
+            'elapsed_ms': round((time.perf_counter() - start) * 1000, 2),
+        }
+
+    @staticmethod
+    def epochs_for(decision):
+        """Épocas de reentrenamiento según la decisión"""
+        return SHORT_RETRAIN_EPOCHS if decision == 'short' else FULL_RETRAIN_EPOCHS
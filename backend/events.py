@@ -0,0 +1,150 @@
+import os
+import json
+import queue
+import asyncio
+import threading
+import itertools
+
+EVENTS_QUEUE_SIZE = int(os.environ.get('NEURO_UX_EVENTS_QUEUE_SIZE', '100'))
+EVENTS_MAX_CLIENTS = int(os.environ.get('NEURO_UX_EVENTS_MAX_CLIENTS', '50'))
+EVENTS_HEARTBEAT_S = float(os.environ.get('NEURO_UX_EVENTS_HEARTBEAT_S', '15'))
+
+
+def format_sse(event_id, event, data):
+    """Mensaje en formato text/event-stream"""
+    payload = json.dumps(data, ensure_ascii=False, separators=(',', ':'))
+    return f"id: {event_id}\nevent: {event}\ndata: {payload}\n\n"
+
+
+class Subscriber:
+    """Cliente SSE con buffer acotado: si se llena se descarta el evento más antiguo"""
+
+    def __init__(self, maxsize):
+        self.queue = queue.Queue(maxsize=maxsize)
+        self.dropped = 0
+        # Callback opcional al encolar (despierta al stream asíncrono)
+        self.waker = None
+
+    def push(self, message):
+        while True:
+            try:
+                self.queue.put_nowait(message)
+                if self.waker is not None:
+                    self.waker()
+                return
+            except queue.Full:
+                try:
+                    self.queue.get_nowait()
+                    self.dropped += 1
+                except queue.Empty:
+                    pass
+
+
+class EventBroker:
+    """
+    Publica eventos (feedback pendiente, versión del modelo, progreso de reentrenamiento)
+    a los clientes SSE conectados. Cada cliente tiene su propia cola acotada, así un cliente
+    lento no frena a los demás ni al publicador. Los clientes inactivos solo reciben un
+    heartbeat cada EVENTS_HEARTBEAT_S segundos.
+    """
+
+    def __init__(self, queue_size=EVENTS_QUEUE_SIZE, max_clients=EVENTS_MAX_CLIENTS,
+                 heartbeat_s=EVENTS_HEARTBEAT_S):
+        self.queue_size = queue_size
+        self.max_clients = max_clients
+        self.heartbeat_s = heartbeat_s
+        self._subscribers = set()
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self.published = 0
+
+    def subscribe(self):
+        """Registra un cliente; None si se alcanzó el máximo de clientes"""
+        with self._lock:
+            if len(self._subscribers) >= self.max_clients:
+                return None
+            subscriber = Subscriber(self.queue_size)
+            self._subscribers.add(subscriber)
+            return subscriber
+
+    def unsubscribe(self, subscriber):
+        with self._lock:
+            self._subscribers.discard(subscriber)
+
+    def publish(self, event, data):
+        """Encola el evento para todos los clientes (no bloquea)"""
+        with self._lock:
+            subscribers = list(self._subscribers)
+            event_id = next(self._ids)
+            self.published += 1
+        if not subscribers:
+            return event_id
+        message = format_sse(event_id, event, data)
+        for subscriber in subscribers:
+            subscriber.push(message)
+        return event_id
+
+    def stream(self, subscriber, initial=None):
+        """
+        Generador de la respuesta SSE: primero el estado actual (evento 'snapshot'),
+        después los eventos publicados. Al desconectarse el cliente se da de baja.
+        """
+        try:
+            yield "retry: 3000\n\n"
+            if initial is not None:
+                yield format_sse(0, 'snapshot', initial)
+            while True:
+                try:
+                    yield subscriber.queue.get(timeout=self.heartbeat_s)
+                except queue.Empty:
+                    yield ": keep-alive\n\n"
+        finally:
+            self.unsubscribe(subscriber)
+
+    async def astream(self, subscriber, initial=None):
+        """
+        Igual que stream() pero para el event loop (modo ASGI): la espera no ocupa un hilo,
+        el publicador despierta al cliente con call_soon_threadsafe.
+        """
+        loop = asyncio.get_running_loop()
+        wake = asyncio.Event()
+
+        def waker():
+            try:
+                loop.call_soon_threadsafe(wake.set)
+            except RuntimeError:
+                pass  # loop cerrado
+
+        subscriber.waker = waker
+        try:
+            yield "retry: 3000\n\n"
+            if initial is not None:
+                yield format_sse(0, 'snapshot', initial)
+            while True:
+                try:
+                    yield subscriber.queue.get_nowait()
+                    continue
+                except queue.Empty:
+                    pass
+                wake.clear()
+                # Un evento encolado entre get_nowait y clear no se pierde
+                if not subscriber.queue.empty():
+                    continue
+                try:
+                    await asyncio.wait_for(wake.wait(), self.heartbeat_s)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+        finally:
+            subscriber.waker = None
+            self.unsubscribe(subscriber)
+
+    def stats(self):
+        with self._lock:
+            subscribers = list(self._subscribers)
+        return {
+            'clients': len(subscribers),
+            'max_clients': self.max_clients,
+            'published': self.published,
+            'dropped': sum(s.dropped for s in subscribers),
+            'queued': sum(s.queue.qsize() for s in subscribers),
+        }
@@ -0,0 +1,177 @@
+import os
+import time
+from itertools import zip_longest
+
+import numpy as np
+
+DEFAULT_BUDGET_MS = float(os.environ.get('NEURO_UX_EXPLAIN_BUDGET_MS', '150'))
+DEFAULT_MAX_VARIANTS = int(os.environ.get('NEURO_UX_EXPLAIN_MAX_VARIANTS', '1024'))
+# Mínimo de variantes aunque el costo estimado supere el presupuesto
+MIN_VARIANTS = 64
+# Fracción del presupuesto reservada para codificar y predecir (el resto es armado de respuesta)
+BUDGET_FRACTION = 0.8
+# Suavizado del costo por fila entre requests
+COST_SMOOTHING = 0.3
+
+UX_DEFAULTS = {'palette': [], 'fonts': [], 'layout': 'grid', 'spacing': 'medium', 'contrast': 'high'}
+ATTRIBUTES = ('layout', 'spacing', 'contrast', 'fonts', 'palette')
+
+
+class SensitivityAnalyzer:
+    """
+    Análisis de sensibilidad de un diseño: genera todas las variantes que cambian un solo atributo
+    (cada layout, spacing y contraste alternativo, cada clase tipográfica y fuente suelta,
+    paletas curadas completas y cambios de un color), las codifica en una sola matriz con
+    DataProcessor.encode_batch y las puntúa en un único predict por batch.
+    El número de variantes se ajusta al presupuesto de latencia con el costo por fila medido.
+    """
+
+    def __init__(self, processor, model, budget_ms=DEFAULT_BUDGET_MS, max_variants=DEFAULT_MAX_VARIANTS):
+        self.processor = processor
+        self.model = model
+        self.budget_ms = budget_ms
+        self.max_variants = max_variants
+        self._row_cost_ms = None
+
+    def base_design(self, data):
+        """Diseño UX de partida (los briefs de branding se convierten) con los defaults de encode_ux_features"""
+        keywords = {}
+        if self.processor._detect_input_type(data) == 'branding':
+            data, keywords = self.processor._convert_branding_to_ux(data)
+        design = {field: data.get(field) or default for field, default in UX_DEFAULTS.items()}
+        design['palette'] = list(design['palette'])
+        design['fonts'] = list(design['fonts'])
+        return design, keywords
+
+    def _palette_variants(self, palette):
+        p = self.processor
+        curated = [(f'curada buena {i + 1}', list(pal)) for i, pal in enumerate(p.good_palettes)]
+        curated += [(f'curada mala {i + 1}', list(pal)) for i, pal in enumerate(p.bad_palettes)]
+        curated += [(name, list(pal)) for name, pal in p.color_palettes.items()]
+
+        variants, seen = [], {tuple(palette)}
+        for label, candidate in curated:
+            if tuple(candidate) not in seen:
+                seen.add(tuple(candidate))
+                variants.append((label, candidate))
+
+        # Cambio de un solo color por cada color curado
+        colors = list(dict.fromkeys(c.upper() for _, pal in curated for c in pal))
+        for slot, current in enumerate(palette):
+            for color in colors:
+                if color == str(current).upper():
+                    continue
+                candidate = palette[:slot] + [color] + palette[slot + 1:]
+                if tuple(candidate) not in seen:
+                    seen.add(tuple(candidate))
+                    variants.append((f'color {slot + 1} -> {color}', candidate))
+        return variants
+
+    def _font_variants(self, fonts):
+        p = self.processor
+        variants, seen = [], {tuple(fonts)}
+        for name, pair in p.fonts_catalog.items():
+            candidate = [pair['primary'], pair['secondary']]
+            if tuple(candidate) not in seen:
+                seen.add(tuple(candidate))
+                variants.append((f'clase {name}', candidate))
+
+        slots = fonts if fonts else ['']
+        for slot in range(len(slots)):
+            for font in p.good_fonts + p.bad_fonts:
+                candidate = list(fonts)
+                if slot < len(candidate):
+                    candidate[slot] = font
+                else:
+                    candidate.append(font)
+                if tuple(candidate) not in seen:
+                    seen.add(tuple(candidate))
+                    variants.append((f'fuente {slot + 1} -> {font}', candidate))
+        return variants
+
+    def variants(self, design):
+        """Variantes de un solo atributo: {atributo: [(etiqueta, valor), ...]}"""
+        p = self.processor
+        options = {
+            'layout': p.good_layouts + p.bad_layouts,
+            'spacing': p.good_spacing + p.neutral_spacing + p.bad_spacing,
+            'contrast': p.good_contrast + p.bad_contrast,
+        }
+        result = {
+            field: [(value, value) for value in values if value != design[field]]
+            for field, values in options.items()
+        }
+        result['fonts'] = self._font_variants(design['fonts'])
+        result['palette'] = self._palette_variants(design['palette'])
+        return result
+
+    def _variant_limit(self, budget_ms):
+        if self._row_cost_ms is None:
+            return self.max_variants
+        affordable = int(budget_ms * BUDGET_FRACTION / self._row_cost_ms)
+        return max(MIN_VARIANTS, min(self.max_variants, affordable))
+
+    def explain(self, data, top=5, budget_ms=None):
+        budget_ms = self.budget_ms if budget_ms is None else float(budget_ms)
+        start = time.perf_counter()
+
+        design, keywords = self.base_design(data)
+        by_attribute = self.variants(design)
+        available = sum(len(v) for v in by_attribute.values())
+
+        # Intercalado entre atributos: si hay que recortar, cada atributo pierde su cola por igual
+        interleaved = [
+            entry for group in zip_longest(*[[(field, label, value) for label, value in by_attribute[field]]
+                                             for field in ATTRIBUTES])
+            for entry in group if entry is not None
+        ]
+        limit = self._variant_limit(budget_ms)
+        selected = interleaved[:limit]
+
+        designs = [design] + [{**design, field: value} for field, _, value in selected]
+        encode_start = time.perf_counter()
+        X = self.processor.encode_batch(designs).astype(np.float32)
+        predict_start = time.perf_counter()
+        scores = self.model.predict(X).reshape(-1)
+        predict_ms = (time.perf_counter() - predict_start) * 1000
+        row_cost = (time.perf_counter() - encode_start) * 1000 / len(designs)
+        self._row_cost_ms = row_cost if self._row_cost_ms is None else \
+            (1 - COST_SMOOTHING) * self._row_cost_ms + COST_SMOOTHING * row_cost
+
+        base_score = float(scores[0])
+        deltas = scores[1:] - base_score
+
+        attributes = {}
+        for field in ATTRIBUTES:
+            attributes[field] = {'current': design[field], 'evaluated': 0, 'variants': []}
+        for (field, label, value), score, delta in zip(selected, scores[1:], deltas):
+            attributes[field]['variants'].append({
+                'label': label, 'value': value, 'score': float(score), 'delta': float(delta)
+            })
+
+        ranking = []
+        for field, summary in attributes.items():
+            variants = sorted(summary['variants'], key=lambda v: v['delta'], reverse=True)
+            summary['evaluated'] = len(variants)
+            summary['available'] = len(by_attribute[field])
+            summary['best'] = variants[0] if variants else None
+            summary['worst'] = variants[-1] if variants else None
+            summary['max_gain'] = max(variants[0]['delta'], 0.0) if variants else 0.0
+            summary['variants'] = variants[:top]
+            if variants and variants[0]['delta'] > 0:
+                ranking.append({'attribute': field, **variants[0]})
+        ranking.sort(key=lambda v: v['delta'], reverse=True)
+
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        return {
+            'base': {'design': design, 'score': base_score, 'keywords': [k for k, v in keywords.items() if v]},
+            'attributes': attributes,
+            'ranking': ranking,
+            'evaluated': len(selected),
+            'available': available,
+            'truncated': len(selected) < available,
+            'budget_ms': budget_ms,
+            'predict_ms': round(predict_ms, 2),
+            'elapsed_ms': round(elapsed_ms, 2),
+            'within_budget': elapsed_ms <= budget_ms,
+        }
@@ -0,0 +1,485 @@
+"""
+Generador de carga HTTP para la API de Neuro UX Styler.
+
+Ejecuta una mezcla configurable de /generate (branding y diseño UX), /feedback y /stats
+con una concurrencia objetivo y reporta throughput, latencias p50/p95/p99 y tasa de error.
+Los resultados se comparan contra un baseline JSON versionado en el repo.
+
+Uso:
+    python load_test.py                          # test client de Flask (sin servidor)
+    python load_test.py --url http://localhost:5001
+    python load_test.py --requests 500 --concurrency 16 --unique-inputs 20
+    python load_test.py --update-baseline        # graba el baseline actual
+    python load_test.py --url http://localhost:5001 --slow-clients 2000   # + 2000 clientes lentos
+"""
+import os
+import sys
+import json
+import time
+import random
+import asyncio
+import shutil
+import argparse
+import tempfile
+import threading
+import contextlib
+import urllib.parse
+import urllib.request
+import urllib.error
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from generate_balanced_ux_data import PALETTES, FONTS, LAYOUTS, SPACING, CONTRAST
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), 'data', 'benchmarks', 'load_test_baseline.json')
+# Un percentil se compara solo si el endpoint tiene al menos tantas requests por encima de él
+MIN_TAIL_SAMPLES = 5
+PERCENTILES = {'p50': 0.50, 'p95': 0.95, 'p99': 0.99}
+
+# Vocabulario de branding (mismas keywords que DataProcessor._analyze_keywords)
+SECTORS = ['tecnología', 'salud', 'finanzas', 'educación', 'entretenimiento', 'general']
+BRANDING_KEYWORDS = [
+    'innovación', 'digital', 'futuro', 'profesional', 'confianza', 'calidad',
+    'creativo', 'arte', 'diseño', 'premium', 'exclusivo', 'lujo',
+    'sostenible', 'verde', 'natural', 'cercanía', 'comunidad', 'servicio',
+]
+
+DEFAULT_MIX = {
+    'generate_branding': 0.45,
+    'generate_ux': 0.25,
+    'feedback': 0.10,
+    'stats': 0.20,
+}
+
+
+def make_branding_input(rng):
+    """Genera un input de branding aleatorio"""
+    return {
+        'name': f"Marca {rng.randint(1, 9999)}",
+        'mission': ' '.join(rng.sample(BRANDING_KEYWORDS, 3)),
+        'values': ', '.join(rng.sample(BRANDING_KEYWORDS, 2)),
+        'sector': rng.choice(SECTORS),
+        'audience': 'general',
+    }
+
+
+def make_ux_input(rng):
+    """Genera un input de diseño UX con el vocabulario de generate_balanced_ux_data"""
+    quality = rng.choice(['good', 'bad'])
+    return {
+        'palette': rng.choice(PALETTES[quality]),
+        'fonts': rng.choice(FONTS[quality]),
+        'layout': rng.choice(LAYOUTS[quality]),
+        'spacing': rng.choice(SPACING[quality]),
+        'contrast': rng.choice(CONTRAST[quality]),
+    }
+
+
+class InputPool:
+    """
+    Pool de inputs para controlar la tasa de repetición (cache hit ratio).
+    Con unique_inputs=N se reutilizan N cuerpos distintos por tipo; 0 = siempre nuevos.
+    """
+
+    def __init__(self, unique_inputs, seed):
+        self.rng = random.Random(seed)
+        self.unique_inputs = unique_inputs
+        self.lock = threading.Lock()
+        self.pools = {}
+        if unique_inputs > 0:
+            self.pools = {
+                'branding': [make_branding_input(self.rng) for _ in range(unique_inputs)],
+                'ux': [make_ux_input(self.rng) for _ in range(unique_inputs)],
+            }
+
+    def draw(self, kind):
+        with self.lock:
+            if self.pools:
+                return self.rng.choice(self.pools[kind])
+            if kind == 'branding':
+                return make_branding_input(self.rng)
+            return make_ux_input(self.rng)
+
+    def draw_rating(self):
+        with self.lock:
+            return round(self.rng.random(), 2)
+
+    def choose(self, mix):
+        with self.lock:
+            kinds = list(mix.keys())
+            return self.rng.choices(kinds, weights=[mix[k] for k in kinds])[0]
+
+
+def build_request(kind, pool):
+    """Retorna (method, path, body) para el tipo de request"""
+    if kind == 'generate_branding':
+        return 'POST', '/api/generate', pool.draw('branding')
+    if kind == 'generate_ux':
+        return 'POST', '/api/generate', pool.draw('ux')
+    if kind == 'feedback':
+        return 'POST', '/api/feedback', {
+            'input_data': pool.draw('branding'),
+            'rating': pool.draw_rating(),
+            'feedback': 'load-test',
+        }
+    return 'GET', '/api/stats', None
+
+
+class FlaskClientTransport:
+    """Ejecuta requests contra la app Flask en proceso (un test client por hilo)"""
+
+    def __init__(self, flask_app, headers=None):
+        self.app = flask_app
+        self.headers = headers or {}
+        self.local = threading.local()
+
+    def send(self, method, path, body):
+        client = getattr(self.local, 'client', None)
+        if client is None:
+            client = self.local.client = self.app.test_client()
+        if method == 'GET':
+            response = client.get(path, headers=self.headers)
+        else:
+            response = client.post(path, json=body, headers=self.headers)
+        return response.status_code
+
+
+class HTTPTransport:
+    """Ejecuta requests contra un servidor HTTP real"""
+
+    def __init__(self, base_url, timeout=30, headers=None):
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+        self.headers = headers or {}
+
+    def send(self, method, path, body):
+        data = json.dumps(body).encode('utf-8') if body is not None else None
+        req = urllib.request.Request(
+            self.base_url + path, data=data, method=method,
+            headers={'Content-Type': 'application/json', **self.headers}
+        )
+        try:
+            with urllib.request.urlopen(req, timeout=self.timeout) as response:
+                response.read()
+                return response.status
+        except urllib.error.HTTPError as e:
+            return e.code
+        except (urllib.error.URLError, OSError):
+            return 0
+
+
+class SlowClients:
+    """
+    Clientes lentos (solo con --url): conexiones que envían su request a /stats de a poco, una
+    cabecera cada 'interval' segundos, mientras corre la carga normal; al terminar la completan y
+    leen la respuesta. Un servidor con un hilo por request dedica un hilo a cada una todo el test.
+    """
+
+    def __init__(self, base_url, count, interval, connect_concurrency=100):
+        parsed = urllib.parse.urlsplit(base_url)
+        self.host = parsed.hostname
+        self.port = parsed.port or 80
+        self.count = count
+        self.interval = interval
+        self.connect_concurrency = connect_concurrency
+        self.attempted = 0
+        self.connected = 0
+        self.completed = 0
+        self.failed = 0
+        self._ready = threading.Event()
+        self._loop = None
+        self._stop = None
+        self._thread = None
+
+    def start(self):
+        """Abre las conexiones (en un hilo con su propio event loop) y espera a que estén abiertas"""
+        self._thread = threading.Thread(target=lambda: asyncio.run(self._main()), daemon=True)
+        self._thread.start()
+        self._ready.wait()
+
+    def stop(self, timeout=120):
+        """Completa las requests pendientes y retorna el reporte"""
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._stop.set)
+        self._thread.join(timeout)
+        return {
+            'clients': self.count,
+            'connected': self.connected,
+            'completed': self.completed,
+            'failed': self.failed,
+        }
+
+    async def _main(self):
+        self._loop = asyncio.get_running_loop()
+        self._stop = asyncio.Event()
+        slots = asyncio.Semaphore(self.connect_concurrency)
+        await asyncio.gather(*[self._client(i, slots) for i in range(self.count)])
+
+    def _attempt_done(self):
+        self.attempted += 1
+        if self.attempted == self.count:
+            self._ready.set()
+
+    async def _client(self, index, slots):
+        writer = None
+        try:
+            async with slots:
+                try:
+                    reader, writer = await asyncio.wait_for(
+                        asyncio.open_connection(self.host, self.port), timeout=10
+                    )
+                    writer.write(f"GET /api/stats HTTP/1.1\r\nHost: {self.host}\r\n".encode())
+                    await writer.drain()
+                    self.connected += 1
+                finally:
+                    self._attempt_done()
+
+            header = 0
+            while not self._stop.is_set():
+                try:
+                    await asyncio.wait_for(self._stop.wait(), self.interval)
+                except asyncio.TimeoutError:
+                    writer.write(f"X-Slow-{header}: {index}\r\n".encode())
+                    await writer.drain()
+                    header += 1
+
+            writer.write(b"Connection: close\r\n\r\n")
+            await writer.drain()
+            status_line = await asyncio.wait_for(reader.readline(), timeout=60)
+            parts = status_line.split()
+            if len(parts) >= 2 and parts[1][:1] in (b'2', b'3'):
+                self.completed += 1
+            else:
+                self.failed += 1
+        except (OSError, asyncio.TimeoutError):
+            self.failed += 1
+        finally:
+            if writer is not None:
+                writer.close()
+
+
+def percentiles(latencies):
+    if not latencies:
+        return {'p50': 0.0, 'p95': 0.0, 'p99': 0.0, 'mean': 0.0}
+    arr = np.array(latencies) * 1000
+    return {
+        'p50': round(float(np.percentile(arr, 50)), 3),
+        'p95': round(float(np.percentile(arr, 95)), 3),
+        'p99': round(float(np.percentile(arr, 99)), 3),
+        'mean': round(float(arr.mean()), 3),
+    }
+
+
+def run_load(transport, total_requests, concurrency, mix, pool, warmup=10):
+    """Lanza la carga y retorna el reporte de resultados"""
+    # Calentamiento (no se mide)
+    for _ in range(warmup):
+        method, path, body = build_request('generate_branding', pool)
+        transport.send(method, path, body)
+
+    results = []
+    results_lock = threading.Lock()
+
+    def one_request(_):
+        kind = pool.choose(mix)
+        method, path, body = build_request(kind, pool)
+        start = time.perf_counter()
+        status = transport.send(method, path, body)
+        elapsed = time.perf_counter() - start
+        with results_lock:
+            results.append((kind, status, elapsed))
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(one_request, range(total_requests)))
+    wall = time.perf_counter() - start
+
+    report = {
+        'requests': len(results),
+        'concurrency': concurrency,
+        'wall_time': round(wall, 3),
+        'throughput': round(len(results) / wall, 2) if wall > 0 else 0.0,
+        'error_rate': round(sum(1 for _, s, _ in results if s == 0 or s >= 500) / max(1, len(results)), 4),
+        # 503 = rechazadas por el control de admisión (también cuentan como error)
+        'shed_rate': round(sum(1 for _, s, _ in results if s == 503) / max(1, len(results)), 4),
+        'latency_ms': percentiles([e for _, _, e in results]),
+        'endpoints': {},
+    }
+    for kind in mix:
+        subset = [r for r in results if r[0] == kind]
+        if not subset:
+            continue
+        report['endpoints'][kind] = {
+            'requests': len(subset),
+            'error_rate': round(sum(1 for _, s, _ in subset if s == 0 or s >= 500) / len(subset), 4),
+            'latency_ms': percentiles([e for _, _, e in subset]),
+        }
+    return report
+
+
+def compare_with_baseline(report, baseline, tolerance):
+    """Compara contra el baseline. Retorna lista de regresiones detectadas."""
+    regressions = []
+    base = baseline.get('report', baseline)
+
+    if base.get('throughput') and report['throughput'] < base['throughput'] * (1 - tolerance):
+        regressions.append(f"throughput {report['throughput']} < {base['throughput']} (-{tolerance:.0%})")
+
+    # Latencia por endpoint contra su propio baseline: el p50 global mezcla caminos de ~1 ms y más lentos
+    for kind, data in report['endpoints'].items():
+        ref_latency = base.get('endpoints', {}).get(kind, {}).get('latency_ms', {})
+        for key, q in PERCENTILES.items():
+            ref = ref_latency.get(key)
+            if data['requests'] * (1 - q) < MIN_TAIL_SAMPLES:
+                continue
+            if ref and data['latency_ms'][key] > ref * (1 + tolerance):
+                regressions.append(f"latencia {kind} {key} {data['latency_ms'][key]}ms > {ref}ms (+{tolerance:.0%})")
+
+    if report['error_rate'] > base.get('error_rate', 0.0) + 0.01:
+        regressions.append(f"error_rate {report['error_rate']} > {base.get('error_rate', 0.0)}")
+
+    return regressions
+
+
+def print_report(report):
+    print("\n" + "=" * 60)
+    print("📊 RESULTADOS DE CARGA")
+    print("=" * 60)
+    print(f"   - Requests: {report['requests']} (concurrencia {report['concurrency']})")
+    print(f"   - Throughput: {report['throughput']:.1f} req/s")
+    print(f"   - Error rate: {report['error_rate']:.2%} (rechazadas 503: {report.get('shed_rate', 0.0):.2%})")
+    lat = report['latency_ms']
+    print(f"   - Latencia: p50 {lat['p50']:.1f}ms | p95 {lat['p95']:.1f}ms | p99 {lat['p99']:.1f}ms")
+    for kind, data in report['endpoints'].items():
+        lat = data['latency_ms']
+        print(f"     · {kind:18s} n={data['requests']:4d}  p50 {lat['p50']:7.1f}ms  p95 {lat['p95']:7.1f}ms  errores {data['error_rate']:.1%}")
+    slow = report.get('slow_clients')
+    if slow:
+        print(f"   - Clientes lentos: {slow['connected']}/{slow['clients']} conectados, "
+              f"{slow['completed']} completados, {slow['failed']} fallidos")
+
+
+def parse_mix(value):
+    """Parsea '--mix generate_branding=0.5,stats=0.5'"""
+    mix = {}
+    for part in value.split(','):
+        key, _, weight = part.partition('=')
+        if key.strip() not in DEFAULT_MIX:
+            raise argparse.ArgumentTypeError(f"Tipo de request desconocido: {key}")
+        mix[key.strip()] = float(weight)
+    return mix
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test de la API Neuro UX Styler")
+    parser.add_argument('--url', help="URL base del servidor (por defecto usa el test client de Flask)")
+    parser.add_argument('--requests', type=int, default=3000)
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--mix', type=parse_mix, default=DEFAULT_MIX)
+    parser.add_argument('--unique-inputs', type=int, default=50,
+                        help="Cuerpos distintos por tipo de input (0 = siempre nuevos)")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--baseline', default=BASELINE_PATH)
+    parser.add_argument('--tolerance', type=float, default=0.25)
+    parser.add_argument('--update-baseline', action='store_true')
+    parser.add_argument('--verbose', action='store_true', help="No silenciar los logs de la app")
+    parser.add_argument('--priority', choices=['interactive', 'batch'],
+                        help="Clase de admisión enviada en X-Priority (default: la del servidor)")
+    parser.add_argument('--slow-clients', type=int, default=0,
+                        help="Conexiones lentas abiertas durante la carga (solo con --url)")
+    parser.add_argument('--slow-interval', type=float, default=1.0,
+                        help="Segundos entre cabeceras de cada cliente lento")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("🏋️ LOAD TEST - NEURO UX STYLER")
+    print("=" * 60)
+
+    pool = InputPool(args.unique_inputs, args.seed)
+    headers = {'X-Priority': args.priority} if args.priority else {}
+    temp_dir = None
+    quiet = open(os.devnull, 'w') if not args.verbose else None
+
+    if args.url:
+        transport = HTTPTransport(args.url, headers=headers)
+        mode = f"http ({args.url})"
+    else:
+        with contextlib.redirect_stdout(quiet or sys.stdout):
+            import app as app_module
+        # El feedback del load test no debe tocar el dataset real
+        temp_dir = tempfile.mkdtemp(prefix='neuro_ux_load_')
+        dataset_copy = os.path.join(temp_dir, 'combined_training_data.json')
+        if os.path.exists(app_module.trainer.data_path):
+            shutil.copy(app_module.trainer.data_path, dataset_copy)
+        app_module.trainer.data_path = app_module.trainer.dataset_path = dataset_copy
+        transport = FlaskClientTransport(app_module.app, headers=headers)
+        mode = 'flask test client'
+
+    print(f"🎯 Modo: {mode} | requests: {args.requests} | concurrencia: {args.concurrency}")
+    print(f"🔁 Inputs únicos por tipo: {args.unique_inputs or 'sin repetición'}")
+
+    slow_clients = None
+    if args.slow_clients:
+        if args.url:
+            slow_clients = SlowClients(args.url, args.slow_clients, args.slow_interval)
+            print(f"🐢 Abriendo {args.slow_clients} clientes lentos...")
+            slow_clients.start()
+        else:
+            print("⚠️ --slow-clients requiere --url; se ignora")
+
+    try:
+        with contextlib.redirect_stdout(quiet or sys.stdout):
+            report = run_load(transport, args.requests, args.concurrency, args.mix, pool)
+    finally:
+        if slow_clients is not None:
+            slow_report = slow_clients.stop()
+        if temp_dir:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+        if quiet:
+            quiet.close()
+
+    report['mode'] = 'http' if args.url else 'test_client'
+    report['unique_inputs'] = args.unique_inputs
+    report['mix'] = args.mix
+    if slow_clients is not None:
+        report['slow_clients'] = slow_report
+    print_report(report)
+
+    if args.update_baseline:
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump({
+                'recorded_at': time.strftime('%Y-%m-%d'),
+                'tolerance': args.tolerance,
+                'report': report,
+            }, f, indent=2, ensure_ascii=False)
+        print(f"\n💾 Baseline actualizado: {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"\n⚠️ No existe baseline en {args.baseline}. Usa --update-baseline para crearlo.")
+        return 0
+
+    with open(args.baseline, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+
+    base_report = baseline.get('report', baseline)
+    if base_report.get('mode') != report['mode'] or base_report.get('mix') != report['mix']:
+        print("\n⚠️ El baseline se grabó con otro modo o mezcla de requests; la comparación es orientativa.")
+
+    regressions = compare_with_baseline(report, baseline, args.tolerance)
+    if regressions:
+        print("\n❌ Regresiones respecto al baseline:")
+        for r in regressions:
+            print(f"   - {r}")
+        return 1
+
+    print("\n✅ Sin regresiones respecto al baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
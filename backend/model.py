@@ -1,6 +1,11 @@
 import numpy as np
 import os
 import json
+import re
+import time
+import threading
+import unicodedata
+from collections import OrderedDict
 
 import importlib
 import importlib.util
@@ -29,14 +34,231 @@ else:
     keras = None
     layers = models = callbacks = optimizers = None
 
+# Backend de inferencia: 'keras' (por defecto) o 'tflite'
+INFERENCE_BACKEND = os.environ.get('NEURO_UX_BACKEND', 'keras').lower()
+# Cuantización del export TFLite: 'none', 'float16' o 'int8' (pesos)
+TFLITE_QUANTIZATION = os.environ.get('NEURO_UX_TFLITE_QUANTIZATION', 'none').lower()
+TFLITE_QUANTIZATIONS = ('none', 'float16', 'int8')
+# Ruta compilada (tf.function) para batches pequeños; model.predict para batches grandes
+COMPILED_PREDICT = os.environ.get('NEURO_UX_COMPILED_PREDICT', '1') == '1'
+COMPILED_MAX_BATCH = int(os.environ.get('NEURO_UX_COMPILED_MAX_BATCH', '1024'))
+USE_XLA = os.environ.get('NEURO_UX_XLA', '0') == '1'
+# Límite de hilos de TF para todo el proceso (0 = valor por defecto de TF)
+TF_INTRA_OP_THREADS = int(os.environ.get('NEURO_UX_TF_INTRA_THREADS', '0'))
+TF_INTER_OP_THREADS = int(os.environ.get('NEURO_UX_TF_INTER_THREADS', '0'))
+# Modelos por sector: memoria máxima de los cargados a la vez (los sectores fríos se desalojan)
+SECTOR_CACHE_MB = float(os.environ.get('NEURO_UX_SECTOR_CACHE_MB', '8'))
+# Memoria estimada de un modelo cargado además de sus pesos (grafo, función compilada): ~1 MB medido
+SECTOR_MODEL_OVERHEAD_MB = float(os.environ.get('NEURO_UX_SECTOR_MODEL_OVERHEAD_MB', '1'))
+
+# Checkpoints al entrenar: 'memory' (mejores pesos solo en memoria y una escritura final atómica)
+# o 'disk' (ModelCheckpoint reescribe el .h5 en cada mejora de val_accuracy)
+CHECKPOINT_MODE = os.environ.get('NEURO_UX_CHECKPOINT_MODE', 'memory').lower()
+CHECKPOINT_MODES = ('memory', 'disk')
+
+MODEL_DIR = os.path.join(os.path.dirname(__file__), 'data', 'models')
+SECTOR_MODEL_DIR = os.path.join(MODEL_DIR, 'sectors')
+
+
+def limit_tf_threads(intra=None, inter=None):
+    """
+    Limita los pools de hilos de TF del proceso.
+    Solo surte efecto antes de que el runtime se inicialice; retorna False si ya era tarde.
+    """
+    if tf is None:
+        return False
+    try:
+        if intra:
+            tf.config.threading.set_intra_op_parallelism_threads(intra)
+        if inter:
+            tf.config.threading.set_inter_op_parallelism_threads(inter)
+        return True
+    except RuntimeError:
+        return False
+
+
+if TF_INTRA_OP_THREADS or TF_INTER_OP_THREADS:
+    limit_tf_threads(TF_INTRA_OP_THREADS, TF_INTER_OP_THREADS)
+
+
+def sector_slug(sector):
+    """Nombre de archivo de un sector: 'Producción audiovisual' -> 'produccion_audiovisual'"""
+    text = unicodedata.normalize('NFKD', str(sector or '')).encode('ascii', 'ignore').decode('ascii')
+    return re.sub(r'[^a-z0-9]+', '_', text.lower()).strip('_')
+
+
+def sector_model_path(sector):
+    return os.path.join(SECTOR_MODEL_DIR, f'{sector_slug(sector)}.h5')
+
+
+def artifact_version(path):
+    """Versión de un .h5 en disco (mtime + tamaño); None si no existe"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return f"{stat.st_mtime_ns:x}-{stat.st_size:x}"
+
+
+def new_io_stats(checkpoint_mode=None):
+    """Contadores de escrituras a disco de un entrenamiento"""
+    return {
+        'checkpoint_mode': checkpoint_mode,
+        'checkpoint_writes': 0,
+        'checkpoint_ms': 0.0,
+        'artifact_writes': 0,
+        'artifact_ms': 0.0,
+        'bytes_written': 0,
+    }
+
+
+def _timed_checkpoint(filepath, io, **kwargs):
+    """ModelCheckpoint que cuenta sus escrituras y el tiempo que pasan en disco"""
+    from tensorflow.keras.callbacks import ModelCheckpoint
+
+    class TimedModelCheckpoint(ModelCheckpoint):
+        def on_epoch_end(self, epoch, logs=None):
+            before = artifact_version(filepath)
+            start = time.perf_counter()
+            super().on_epoch_end(epoch, logs)
+            if artifact_version(filepath) != before:
+                io['checkpoint_writes'] += 1
+                io['checkpoint_ms'] += (time.perf_counter() - start) * 1000
+                io['bytes_written'] += os.path.getsize(filepath)
+
+    return TimedModelCheckpoint(filepath, **kwargs)
+
+
+class SectorModelCache:
+    """
+    Modelos especializados por sector de un modelo global.
+    Se cargan al primer uso desde data/models/sectors/<sector>.h5 y viven en un LRU acotado por
+    memoria estimada (pesos + overhead por modelo); al superar el límite se desalojan los sectores
+    menos usados. Sin archivo para el sector, get() retorna None y se usa el modelo global.
+    Si el archivo cambia en disco (nuevo entrenamiento), el modelo se recarga en el siguiente uso.
+    """
+
+    def __init__(self, fallback, budget_mb=SECTOR_CACHE_MB, overhead_mb=SECTOR_MODEL_OVERHEAD_MB):
+        self.fallback = fallback
+        self.budget_mb = budget_mb
+        self.overhead_mb = overhead_mb
+        self._lock = threading.Lock()
+        self._loading = {}
+        self._models = OrderedDict()
+        self.hits = 0
+        self.loads = 0
+        self.reloads = 0
+        self.evictions = 0
+        self.fallbacks = 0
+
+    def footprint_mb(self, model):
+        weights = sum(w.nbytes for w in model.model.get_weights()) if model.model is not None else 0
+        return weights / (1024 * 1024) + self.overhead_mb
+
+    def memory_mb(self):
+        return sum(size for _, size in self._models.values())
+
+    def get(self, sector):
+        """Modelo del sector (cargándolo si hace falta) o None si no tiene modelo propio"""
+        slug = sector_slug(sector)
+        path = os.path.join(SECTOR_MODEL_DIR, f'{slug}.h5')
+        version = artifact_version(path)
+        with self._lock:
+            entry = self._models.get(slug)
+            if version is None:
+                if entry is not None:
+                    # El archivo se borró: el sector vuelve al modelo global
+                    del self._models[slug]
+                self.fallbacks += 1
+                return None
+            if entry is not None and entry[0].version == version:
+                self._models.move_to_end(slug)
+                self.hits += 1
+                return entry[0]
+            slug_lock = self._loading.setdefault(slug, threading.Lock())
+
+        # Una sola carga por sector; los demás sectores no esperan a esta
+        with slug_lock:
+            with self._lock:
+                entry = self._models.get(slug)
+                if entry is not None and entry[0].version == version:
+                    self._models.move_to_end(slug)
+                    self.hits += 1
+                    return entry[0]
+
+            model = NeuroUXModel(backend=self.fallback.backend, compiled=self.fallback.compiled,
+                                 use_xla=self.fallback.use_xla, build=False, sector=sector)
+            if not model.load_model():
+                with self._lock:
+                    self.fallbacks += 1
+                return None
+
+            with self._lock:
+                if entry is not None:
+                    self.reloads += 1
+                else:
+                    self.loads += 1
+                self._models[slug] = (model, self.footprint_mb(model))
+                self._models.move_to_end(slug)
+                # Siempre queda al menos el recién cargado
+                while len(self._models) > 1 and self.memory_mb() > self.budget_mb:
+                    evicted, _ = self._models.popitem(last=False)
+                    self.evictions += 1
+                    print(f"♻️ Modelo del sector '{evicted}' desalojado (LRU)")
+            return model
+
+    def clear(self):
+        with self._lock:
+            self._models.clear()
+
+    def stats(self):
+        try:
+            available = sorted(f[:-3] for f in os.listdir(SECTOR_MODEL_DIR)
+                               if f.endswith('.h5') and not f.startswith('.'))
+        except OSError:
+            available = []
+        with self._lock:
+            return {
+                'available': available,
+                'loaded': list(self._models.keys()),
+                'memory_mb': round(self.memory_mb(), 2),
+                'budget_mb': self.budget_mb,
+                'hits': self.hits,
+                'loads': self.loads,
+                'reloads': self.reloads,
+                'evictions': self.evictions,
+                'fallbacks': self.fallbacks,
+            }
+
+
 class NeuroUXModel:
-    def __init__(self):
-        model_dir = os.path.join(os.path.dirname(__file__), 'data', 'models')
-        os.makedirs(model_dir, exist_ok=True)
-        self.model_path = os.path.join(model_dir, 'neuro_ux_model.h5')
+    def __init__(self, backend=None, compiled=None, use_xla=None, build=True, sector=None):
+        os.makedirs(MODEL_DIR, exist_ok=True)
+        # sector: modelo especializado (data/models/sectors/<sector>.h5) en vez del global
+        self.sector = sector
+        if sector:
+            os.makedirs(SECTOR_MODEL_DIR, exist_ok=True)
+            self.model_path = sector_model_path(sector)
+        else:
+            self.model_path = os.path.join(MODEL_DIR, 'neuro_ux_model.h5')
+        self.tflite_path = os.path.splitext(self.model_path)[0] + '.tflite'
+        self.backend = (backend or INFERENCE_BACKEND).lower()
         self.model = None
         self.history = None
-        self.build_model()
+        self.interpreter = None
+        self._interpreter_lock = threading.Lock()
+        self.compiled = COMPILED_PREDICT if compiled is None else compiled
+        self.use_xla = USE_XLA if use_xla is None else use_xla
+        self._infer_fn = None
+        self._weighted_metrics = False
+        self.version = None
+        # Escrituras a disco del último entrenamiento (checkpoints y artefactos finales)
+        self.io_stats = new_io_stats()
+        # Solo el modelo global tiene modelos por sector
+        self.sectors = SectorModelCache(self) if not sector else None
+        # build=False: sin grafo hasta load_model/train (evita construir uno que luego se reemplaza)
+        if build:
+            self.build_model()
         
     def build_model(self):
         # Asegurarse de que TensorFlow esté cargado
@@ -64,63 +286,257 @@ class NeuroUXModel:
         )
         
         self.model = model
+        self._weighted_metrics = False
+        self._infer_fn = None
+        # Modelo sin entrenar: versión única en memoria
+        self.version = f"built-{time.time_ns():x}"
         return model
     
-    def train(self, X_train, y_train, X_val, y_val, epochs=100):
-        """Entrena el modelo"""
+    def _compile_metrics(self, weighted):
+        """
+        Recompila (mismo optimizador y estado) solo si cambia el tipo de métricas: con sample_weight,
+        accuracy/AUC ponderadas (las métricas normales ignoran los pesos); sin pesos, las de siempre.
+        """
+        if self._weighted_metrics == weighted:
+            return
+        from tensorflow.keras.metrics import AUC
+        metrics = ['accuracy', AUC(name='auc')]
+        self.model.compile(
+            optimizer=self.model.optimizer or 'adam',
+            loss='binary_crossentropy',
+            **({'weighted_metrics': metrics} if weighted else {'metrics': metrics})
+        )
+        self._weighted_metrics = weighted
+
+    def train(self, X_train, y_train, X_val, y_val, epochs=100, verbose=1, extra_callbacks=None,
+              checkpoint_mode=None, sample_weight=None, val_sample_weight=None, batch_size=32):
+        """
+        Entrena el modelo (extra_callbacks: callbacks de Keras adicionales, p. ej. progreso).
+        sample_weight / val_sample_weight: pesos por fila (p. ej. repeticiones de un dataset compactado);
+        sin pesos el modelo se compila como siempre.
+        checkpoint_mode: 'memory' (default) no escribe nada durante el entrenamiento: los mejores pesos
+        por val_loss quedan en memoria (EarlyStopping) y se restauran al terminar; el artefacto se
+        escribe una vez con save_model. 'disk' mantiene el ModelCheckpoint en cada mejora.
+        """
+        checkpoint_mode = (checkpoint_mode or CHECKPOINT_MODE).lower()
+        if checkpoint_mode not in CHECKPOINT_MODES:
+            raise ValueError(f"Modo de checkpoint no soportado: {checkpoint_mode}. Usa uno de {CHECKPOINT_MODES}")
         if self.model is None:
             self.build_model()
+        self.io_stats = new_io_stats(checkpoint_mode)
         
         # Callbacks para mejorar el entrenamiento
-        from tensorflow.keras.callbacks import EarlyStopping, ReduceLROnPlateau, ModelCheckpoint
+        from tensorflow.keras.callbacks import EarlyStopping, ReduceLROnPlateau
         
+        early_stopping = EarlyStopping(
+            monitor='val_loss',
+            patience=15,
+            restore_best_weights=True
+        )
         callbacks_list = [
-            EarlyStopping(
-                monitor='val_loss',
-                patience=15,
-                restore_best_weights=True
-            ),
+            early_stopping,
             ReduceLROnPlateau(
                 monitor='val_loss',
                 factor=0.5,
                 patience=5,
                 min_lr=0.00001
-            ),
-            ModelCheckpoint(
+            )
+        ]
+        if checkpoint_mode == 'disk':
+            callbacks_list.append(_timed_checkpoint(
                 self.model_path,
+                self.io_stats,
                 monitor='val_accuracy',
                 save_best_only=True,
                 verbose=0 # Reducir el ruido en la consola
-            )
-        ]
+            ))
+        callbacks_list.extend(extra_callbacks or [])
+        
+        self._compile_metrics(sample_weight is not None or val_sample_weight is not None)
+        validation_data = (X_val, y_val) if val_sample_weight is None else (X_val, y_val, val_sample_weight)
         
         # Entrenar
         self.history = self.model.fit(
             X_train, y_train,
-            validation_data=(X_val, y_val),
+            sample_weight=sample_weight,
+            validation_data=validation_data,
             epochs=epochs,
-            batch_size=32,
+            batch_size=batch_size,
             callbacks=callbacks_list,
-            verbose=1
+            verbose=verbose
         )
         
+        # EarlyStopping solo restaura si corta antes; en memoria se restauran siempre los mejores pesos
+        if checkpoint_mode == 'memory' and not early_stopping.stopped_epoch and early_stopping.best_weights is not None:
+            self.model.set_weights(early_stopping.best_weights)
+        
         return self.history
     
-    def predict(self, X):
-        """Realiza predicciones"""
+    def for_sector(self, sector):
+        """Modelo especializado del sector si existe (carga perezosa); si no, este mismo modelo"""
+        if not sector or self.sectors is None:
+            return self
+        return self.sectors.get(sector) or self
+
+    def sector_version(self, sector):
+        """Versión en disco del modelo del sector (sin cargarlo); None si usa el global"""
+        if not sector or self.sectors is None:
+            return None
+        return artifact_version(sector_model_path(sector))
+
+    def predict(self, X, sector=None):
+        """Realiza predicciones (con el modelo del sector si se indica y existe)"""
+        if sector:
+            target = self.for_sector(sector)
+            if target is not self:
+                return target.predict(X)
+
+        if self.backend == 'tflite' and self.interpreter is not None:
+            return self._predict_tflite(X)
+
         if self.model is None:
             self.load_model()
+
+        if self.compiled and len(X) <= COMPILED_MAX_BATCH:
+            return self._predict_compiled(X)
         
         prediction = self.model.predict(X, verbose=0)
         return prediction
+
+    def _build_inference_fn(self):
+        """Envuelve la red en un tf.function con firma fija (None, 14) float32"""
+        network = self.model
+
+        @tf.function(
+            input_signature=[tf.TensorSpec(shape=(None, 14), dtype=tf.float32)],
+            jit_compile=self.use_xla
+        )
+        def infer(x):
+            return network(x, training=False)
+
+        self._infer_fn = infer
+        return infer
+
+    def _predict_compiled(self, X):
+        """Predicción directa por la función trazada (sin el bucle de batches de Keras)"""
+        infer = self._infer_fn or self._build_inference_fn()
+        X = tf.convert_to_tensor(np.asarray(X, dtype=np.float32).reshape(-1, 14))
+        return infer(X).numpy()
+
+    def warmup_compiled(self):
+        """Traza y calienta la función compilada. Retorna la duración en segundos."""
+        if not self.compiled or self.model is None or tf is None:
+            return 0.0
+        start = time.perf_counter()
+        infer = self._build_inference_fn()
+        infer(tf.zeros((1, 14), dtype=tf.float32))
+        elapsed = time.perf_counter() - start
+        print(f"🔥 Predicción compilada lista{' (XLA)' if self.use_xla else ''} en {elapsed*1000:.0f} ms")
+        return elapsed
+
+    def _predict_tflite(self, X):
+        """Predicción con el intérprete TFLite (no es thread-safe, se serializa con un lock)"""
+        X = np.asarray(X, dtype=np.float32).reshape(-1, 14)
+        input_index = self.interpreter.get_input_details()[0]['index']
+        output_index = self.interpreter.get_output_details()[0]['index']
+
+        with self._interpreter_lock:
+            if tuple(self.interpreter.get_input_details()[0]['shape']) != X.shape:
+                self.interpreter.resize_tensor_input(input_index, X.shape)
+                self.interpreter.allocate_tensors()
+            self.interpreter.set_tensor(input_index, X)
+            self.interpreter.invoke()
+            return self.interpreter.get_tensor(output_index).copy()
+
+    def export_tflite(self, quantization=None, path=None):
+        """
+        Exporta el modelo a un flatbuffer TFLite.
+        quantization: 'none', 'float16' o 'int8' (cuantización de pesos, rango dinámico)
+        Retorna la ruta escrita o None si falla.
+        """
+        quantization = (quantization or TFLITE_QUANTIZATION).lower()
+        if quantization not in TFLITE_QUANTIZATIONS:
+            raise ValueError(f"Cuantización no soportada: {quantization}. Usa una de {TFLITE_QUANTIZATIONS}")
+
+        if tf is None or self.model is None:
+            print("⚠️ No hay modelo/TensorFlow para exportar a TFLite")
+            return None
+
+        export_path = path if path is not None else self.tflite_path
+        try:
+            converter = tf.lite.TFLiteConverter.from_keras_model(self.model)
+            if quantization == 'float16':
+                converter.optimizations = [tf.lite.Optimize.DEFAULT]
+                converter.target_spec.supported_types = [tf.float16]
+            elif quantization == 'int8':
+                converter.optimizations = [tf.lite.Optimize.DEFAULT]
+            flatbuffer = converter.convert()
+
+            def write(tmp_path):
+                with open(tmp_path, 'wb') as f:
+                    f.write(flatbuffer)
+
+            self._atomic_write(export_path, write)
+            print(f"✅ Modelo TFLite ({quantization}) exportado en {export_path} ({len(flatbuffer) / 1024:.1f} KB)")
+            return export_path
+        except Exception as e:
+            print(f"❌ Error exportando a TFLite: {e}")
+            return None
+
+    def load_tflite(self, path=None):
+        """Carga el intérprete TFLite. Retorna True si se cargó correctamente."""
+        load_path = path if path is not None else self.tflite_path
+        if tf is None or not os.path.exists(load_path):
+            print(f"⚠️ No se encontró modelo TFLite en {load_path}")
+            return False
+
+        try:
+            interpreter = tf.lite.Interpreter(model_path=load_path)
+            interpreter.allocate_tensors()
+            with self._interpreter_lock:
+                self.interpreter = interpreter
+            print(f"✅ Intérprete TFLite cargado desde {load_path}")
+            return True
+        except Exception as e:
+            print(f"❌ Error cargando TFLite desde {load_path}: {e}")
+            return False
     
+    def _atomic_write(self, path, write):
+        """
+        write(tmp_path) en un temporal del mismo directorio y rename sobre path: quien lea path
+        ve el archivo anterior o el nuevo completo. Suma la escritura a io_stats.
+        """
+        start = time.perf_counter()
+        # Nombre temporal sin crear el archivo (mkstemp lo crearía con permisos 0600)
+        tmp_path = os.path.join(os.path.dirname(path), f".tmp_{os.urandom(6).hex()}{os.path.splitext(path)[1]}")
+        try:
+            write(tmp_path)
+            size = os.path.getsize(tmp_path)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        self.io_stats['artifact_writes'] += 1
+        self.io_stats['artifact_ms'] += (time.perf_counter() - start) * 1000
+        self.io_stats['bytes_written'] += size
+
     def save_model(self):
-        """Guarda el modelo en la ruta configurada"""
+        """Guarda el modelo en la ruta configurada (escritura atómica: temporal + rename)"""
         if self.model is not None:
-            self.model.save(self.model_path)
+            self._atomic_write(self.model_path, self.model.save)
+            self.version = artifact_version(self.model_path)
             print(f"✅ Modelo guardado en {self.model_path}")
         else:
             print("⚠️ No hay modelo para guardar")
+
+    def io_report(self):
+        """Resumen de las escrituras del último entrenamiento (con tiempos redondeados)"""
+        report = dict(self.io_stats)
+        report['checkpoint_ms'] = round(report['checkpoint_ms'], 2)
+        report['artifact_ms'] = round(report['artifact_ms'], 2)
+        report['io_ms'] = round(report['checkpoint_ms'] + report['artifact_ms'], 2)
+        return report
     
     def load_model(self, path=None):
         """
@@ -140,7 +556,14 @@ class NeuroUXModel:
         if os.path.exists(load_path):
             try:
                 self.model = load_model(load_path)
+                self._weighted_metrics = False
+                # Versión del modelo: cambia cada vez que se reescribe el archivo (ETags, caches)
+                stat = os.stat(load_path)
+                self.version = f"{stat.st_mtime_ns:x}-{stat.st_size:x}"
                 print(f"✅ Modelo cargado desde {load_path}")
+                self.warmup_compiled()
+                if self.backend == 'tflite':
+                    self._sync_tflite(load_path)
                 return True
             except Exception as e:
                 print(f"❌ Error cargando modelo desde {load_path}: {e}")
@@ -153,15 +576,54 @@ class NeuroUXModel:
             self.build_model()
             return False
     
-    def evaluate(self, X_test, y_test):
-        """Evalúa el modelo"""
+    def install_artifact(self, keras_path, tflite_path=None):
+        """
+        Instala un modelo entrenado fuera de proceso: reemplazo atómico de los archivos
+        en las rutas del modelo y recarga. El .tflite se mueve después del .h5 para que no quede
+        más antiguo (y _sync_tflite no lo re-exporte).
+        """
+        os.replace(keras_path, self.model_path)
+        if tflite_path and os.path.exists(tflite_path):
+            os.replace(tflite_path, self.tflite_path)
+        return self.load_model()
+
+    def adopt(self, other):
+        """
+        Toma la red entrenada de otra instancia (promoción sin recargar desde disco).
+        Si el candidato se guardó en otra ruta, se instala como en install_artifact.
+        """
+        if os.path.abspath(other.model_path) != os.path.abspath(self.model_path):
+            return self.install_artifact(other.model_path, other.tflite_path)
+        self.model = other.model
+        self._weighted_metrics = other._weighted_metrics
+        self.history = other.history
+        self.version = other.version
+        self.warmup_compiled()
+        if self.backend == 'tflite':
+            self._sync_tflite(self.model_path)
+        return True
+
+    def _sync_tflite(self, keras_path):
+        """Re-exporta el TFLite si falta o es más antiguo que el .h5, y carga el intérprete"""
+        stale = (
+            not os.path.exists(self.tflite_path) or
+            os.path.getmtime(self.tflite_path) < os.path.getmtime(keras_path)
+        )
+        if stale:
+            self.export_tflite()
+        if not self.load_tflite():
+            print("⚠️ Usando backend Keras como fallback")
+
+    def evaluate(self, X_test, y_test, sample_weight=None):
+        """Evalúa el modelo (sample_weight: pesos por fila, como en train)"""
         if self.model is None:
             print("⚠️ No hay modelo cargado, intentando cargar...")
             if not self.load_model():
                 print("❌ No se pudo cargar ni construir el modelo para evaluar.")
                 return {'loss': -1, 'accuracy': 0, 'auc': 0}
         
-        results = self.model.evaluate(X_test, y_test, verbose=0)
+        self._compile_metrics(sample_weight is not None)
+        results = self.model.evaluate(X_test, y_test, sample_weight=sample_weight, verbose=0)
         metrics = {
             'loss': results[0],
             'accuracy': results[1],
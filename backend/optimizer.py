@@ -0,0 +1,157 @@
+import os
+import time
+import itertools
+
+import numpy as np
+
+DEFAULT_BUDGET_MS = float(os.environ.get('NEURO_UX_OPTIMIZE_BUDGET_MS', '500'))
+DEFAULT_MAX_CANDIDATES = int(os.environ.get('NEURO_UX_OPTIMIZE_MAX_CANDIDATES', '4096'))
+# Bloques por debajo del umbral de la ruta compilada de NeuroUXModel.predict
+CHUNK_SIZE = 1000
+
+UX_FIELDS = ('palette', 'fonts', 'layout', 'spacing', 'contrast')
+
+
+class DesignOptimizer:
+    """
+    Busca las variantes de diseño con mayor score.
+    Enumera (o muestrea) candidatos sobre paletas, pares de fuentes, layouts, spacing y contraste,
+    los codifica con DataProcessor.encode_batch y los puntúa por bloques en batch,
+    respetando un presupuesto de latencia. Los candidatos que codifican a las mismas 14 features
+    (mismo score) se descartan antes de puntuar: el top-k son diseños distintos para el modelo.
+    """
+
+    def __init__(self, processor, model):
+        self.processor = processor
+        self.model = model
+
+    def search_space(self):
+        """Valores candidatos por atributo, a partir de las listas curadas del procesador"""
+        p = self.processor
+        palettes = [list(pal) for pal in p.good_palettes]
+        palettes += [pal[:3] for pal in p.color_palettes.values()]
+
+        font_pairs = [[f['primary'], f['secondary']] for f in p.fonts_catalog.values()]
+        font_pairs += [list(pair) for pair in itertools.permutations(p.good_fonts, 2)]
+
+        return {
+            'palette': self._unique(palettes),
+            'fonts': self._unique(font_pairs),
+            'layout': p.good_layouts + p.bad_layouts,
+            'spacing': p.good_spacing + p.neutral_spacing + p.bad_spacing,
+            'contrast': p.good_contrast + p.bad_contrast,
+        }
+
+    @staticmethod
+    def _unique(values):
+        seen, result = set(), []
+        for value in values:
+            key = tuple(value) if isinstance(value, list) else value
+            if key not in seen:
+                seen.add(key)
+                result.append(value)
+        return result
+
+    def _prepare(self, data):
+        """
+        Separa el input en atributos fijos y libres.
+        - Brief de branding: se convierte a UX; todo es libre y el diseño convertido es el punto de partida.
+        - Diseño UX parcial: los atributos presentes quedan fijos.
+        """
+        input_type = self.processor._detect_input_type(data)
+        if input_type == 'branding':
+            base, keywords = self.processor._convert_branding_to_ux(data)
+            fixed = {}
+        else:
+            keywords = {}
+            fixed = {k: data[k] for k in UX_FIELDS if data.get(k)}
+            base = None
+
+        space = self.search_space()
+        axes = [(field, [fixed[field]] if field in fixed else space[field]) for field in UX_FIELDS]
+        return axes, base, keywords
+
+    @staticmethod
+    def _decode(axes, index):
+        """Índice mixed-radix -> diseño candidato"""
+        design = {}
+        for field, values in reversed(axes):
+            index, pos = divmod(index, len(values))
+            design[field] = values[pos]
+        return design
+
+    def optimize(self, data, top_k=5, budget_ms=None, max_candidates=None, seed=42):
+        budget_ms = DEFAULT_BUDGET_MS if budget_ms is None else float(budget_ms)
+        max_candidates = DEFAULT_MAX_CANDIDATES if max_candidates is None else int(max_candidates)
+        start = time.perf_counter()
+
+        axes, base, keywords = self._prepare(data)
+        total = int(np.prod([len(values) for _, values in axes], dtype=np.int64))
+
+        if total <= max_candidates:
+            order = np.arange(total)
+        else:
+            rng = np.random.default_rng(seed)
+            order = rng.choice(total, size=max_candidates, replace=False)
+
+        designs, scores = [], []
+        seen_rows, duplicates = set(), 0
+        # El diseño de partida (brief convertido) siempre se evalúa en el primer bloque
+        extra = [base] if base is not None else []
+        budget_exhausted = False
+        chunk_time = 0.0
+
+        for offset in range(0, len(order), CHUNK_SIZE):
+            elapsed = (time.perf_counter() - start) * 1000
+            # Parar si el siguiente bloque no cabe en el presupuesto (estimado con el último bloque)
+            if offset > 0 and elapsed + chunk_time > budget_ms:
+                budget_exhausted = True
+                break
+
+            chunk_start = time.perf_counter()
+            chunk = extra + [self._decode(axes, int(i)) for i in order[offset:offset + CHUNK_SIZE]]
+            extra = []
+            X = self.processor.encode_batch(chunk).astype(np.float32)
+
+            # Solo la primera variante de cada fila de features (el diseño de partida va primero)
+            keep = []
+            for i, row in enumerate(X):
+                key = row.tobytes()
+                if key not in seen_rows:
+                    seen_rows.add(key)
+                    keep.append(i)
+            duplicates += len(chunk) - len(keep)
+            if keep:
+                scores.append(self.model.predict(X[keep]).reshape(-1))
+                designs.extend(chunk[i] for i in keep)
+            chunk_time = (time.perf_counter() - chunk_start) * 1000
+
+        all_scores = np.concatenate(scores) if scores else np.array([])
+
+        results = []
+        for idx in np.argsort(-all_scores, kind='stable')[:top_k]:
+            design = designs[idx]
+            score = float(all_scores[idx])
+            ui_kit = self.processor.generate_ui_kit(
+                np.array([[score]]),
+                {'keywords': keywords, 'converted_ux_data': design},
+                None
+            )
+            fonts = design.get('fonts') or []
+            if fonts:
+                ui_kit['typography'] = {
+                    'primary': fonts[0],
+                    'secondary': fonts[1] if len(fonts) > 1 else fonts[0],
+                }
+            results.append({'rank': len(results) + 1, 'score': score, 'design': design, 'ui_kit': ui_kit})
+
+        return {
+            'results': results,
+            'evaluated': int(len(all_scores)),
+            'duplicates': duplicates,
+            'search_space': total,
+            'sampled': total > max_candidates,
+            'budget_ms': budget_ms,
+            'budget_exhausted': budget_exhausted,
+            'elapsed_ms': round((time.perf_counter() - start) * 1000, 2),
+        }
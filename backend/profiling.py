@@ -0,0 +1,129 @@
+import os
+import io
+import glob
+import hmac
+import json
+import time
+import uuid
+import pstats
+import cProfile
+import threading
+
+
+class RequestProfiler:
+    """
+    Perfilado determinista (cProfile) de requests individuales.
+    - Explícito: header 'X-Profile: 1' o query '?profile=1' + header 'X-Admin-Token'
+    - Muestreo: perfila automáticamente 1 de cada N requests (sample_rate=N)
+    Los reportes se guardan en un directorio rotativo (máximo max_files).
+    """
+
+    def __init__(self, output_dir=None, sample_rate=0, top_n=25, max_files=50, admin_token=None):
+        if output_dir is None:
+            output_dir = os.path.join(os.path.dirname(__file__), 'data', 'profiles')
+        self.output_dir = output_dir
+        self.sample_rate = max(0, int(sample_rate))
+        self.top_n = max(1, int(top_n))
+        self.max_files = max(1, int(max_files))
+        self.admin_token = admin_token or None
+        self._counter = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls):
+        """Construye el profiler a partir de variables de entorno"""
+        return cls(
+            output_dir=os.environ.get('NEURO_UX_PROFILE_DIR') or None,
+            sample_rate=int(os.environ.get('NEURO_UX_PROFILE_SAMPLE_RATE', '0')),
+            top_n=int(os.environ.get('NEURO_UX_PROFILE_TOP_N', '25')),
+            max_files=int(os.environ.get('NEURO_UX_PROFILE_MAX_FILES', '50')),
+            admin_token=os.environ.get('NEURO_UX_ADMIN_TOKEN'),
+        )
+
+    def is_requested(self, headers, args):
+        """Indica si el cliente pidió perfilar explícitamente (requiere token de admin)"""
+        flag = headers.get('X-Profile') or args.get('profile')
+        if str(flag).lower() not in ('1', 'true', 'yes'):
+            return False
+
+        if not self.admin_token:
+            print("⚠️ Perfilado solicitado pero NEURO_UX_ADMIN_TOKEN no está configurado")
+            return False
+
+        token = headers.get('X-Admin-Token', '')
+        return hmac.compare_digest(str(token), self.admin_token)
+
+    def should_sample(self):
+        """Muestreo 1 de cada N requests (0 = desactivado)"""
+        if self.sample_rate <= 0:
+            return False
+        with self._lock:
+            self._counter += 1
+            return self._counter % self.sample_rate == 0
+
+    def run(self, func, *args, **kwargs):
+        """
+        Ejecuta func bajo cProfile.
+        Retorna: (resultado, profile) donde profile es el objeto cProfile.Profile
+        """
+        profile = cProfile.Profile()
+        start = time.perf_counter()
+        profile.enable()
+        try:
+            result = func(*args, **kwargs)
+        finally:
+            profile.disable()
+        profile.wall_time = time.perf_counter() - start
+        return result, profile
+
+    def summarize(self, profile, endpoint):
+        """Genera el top-N de funciones ordenado por tiempo acumulado"""
+        stats = pstats.Stats(profile, stream=io.StringIO())
+
+        rows = []
+        for (filename, line, name), (cc, nc, tt, ct, _callers) in stats.stats.items():
+            rows.append({
+                'function': name,
+                'file': os.path.basename(filename) if filename != '~' else 'built-in',
+                'line': line,
+                'calls': nc,
+                'primitive_calls': cc,
+                'tottime': round(tt, 6),
+                'cumtime': round(ct, 6),
+            })
+        rows.sort(key=lambda r: r['cumtime'], reverse=True)
+
+        return {
+            'id': uuid.uuid4().hex[:12],
+            'endpoint': endpoint,
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'wall_time': round(getattr(profile, 'wall_time', 0.0), 6),
+            'total_calls': stats.total_calls,
+            'top': rows[:self.top_n],
+        }
+
+    def save(self, profile, report):
+        """Guarda el reporte (.json) y el volcado crudo (.prof) y rota el directorio"""
+        os.makedirs(self.output_dir, exist_ok=True)
+        endpoint = report['endpoint'].strip('/').replace('/', '_') or 'root'
+        base = os.path.join(
+            self.output_dir,
+            f"{time.strftime('%Y%m%d-%H%M%S')}_{endpoint}_{report['id']}"
+        )
+
+        with open(base + '.json', 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        profile.dump_stats(base + '.prof')
+
+        self._rotate()
+        return base + '.json'
+
+    def _rotate(self):
+        """Elimina los reportes más antiguos si se supera max_files"""
+        reports = sorted(glob.glob(os.path.join(self.output_dir, '*.json')), key=os.path.getmtime)
+        for old in reports[:-self.max_files]:
+            for path in (old, old[:-len('.json')] + '.prof'):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
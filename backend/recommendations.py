@@ -0,0 +1,154 @@
+import os
+import time
+import itertools
+
+import numpy as np
+
+from branding_table import KEYWORD_ORDER
+from optimizer import CHUNK_SIZE
+
+MAX_RECOMMENDATIONS = int(os.environ.get('NEURO_UX_RECOMMENDATIONS_MAX_K', '10'))
+
+# Spacing UX equivalente a cada preset de componentes
+COMPONENT_SPACING = {
+    'modern': 'wide',
+    'minimal': 'compact',
+    'soft': 'comfortable',
+}
+
+
+class RecommendationIndex:
+    """
+    Índice offline de UI Kits alternativos por (perfil de keywords, estilo de sector).
+    Cada perfil guarda los candidatos (paleta x fuentes x componentes) ordenados por score; el sector
+    decide las paletas candidatas (la suya y las genéricas, nunca las de otros sectores).
+    Se reconstruye tras cada reentrenamiento; en request solo se lee de memoria.
+    """
+
+    def __init__(self, processor, model, max_k=MAX_RECOMMENDATIONS):
+        self.processor = processor
+        self.model = model
+        self.max_k = max_k
+        self.index = {}
+        self.ready = False
+        self.build_time = 0.0
+        self.built_at = None
+
+    def _sector_styles(self):
+        return sorted(set(self.processor.sector_styles.values()) | {'tech_modern'})
+
+    def _palette_styles(self, sector_style):
+        """
+        Paletas candidatas de un estilo de sector: la del propio sector más las genéricas
+        (las que no son de ningún sector). Las paletas de otros sectores no se proponen.
+        """
+        sector_palettes = set(self._sector_styles())
+        return [sector_style] + [s for s in self.processor.color_palettes if s not in sector_palettes]
+
+    def _candidates(self, keywords, sector_style):
+        """Combinaciones paleta x fuentes x componentes para un perfil y un estilo de sector"""
+        p = self.processor
+        sector = next((s for s, style in p.sector_styles.items() if style == sector_style), 'general')
+        base = p._ux_from_keywords(keywords, sector)
+
+        for palette_style, font_style, component_style in itertools.product(
+                self._palette_styles(sector_style), p.fonts_catalog, p.components):
+            fonts = p.fonts_catalog[font_style]
+            design = {
+                'palette': p.color_palettes[palette_style][:3],
+                'fonts': [fonts['primary'], fonts['secondary']],
+                'layout': base['layout'],
+                'spacing': COMPONENT_SPACING.get(component_style, base['spacing']),
+                'contrast': base['contrast'],
+            }
+            yield (palette_style, font_style, component_style), design
+
+    def build(self):
+        """
+        Codifica los candidatos de todos los perfiles en una pasada y los puntúa en batch.
+        Las paletas genéricas se repiten entre estilos de sector: cada diseño distinto se puntúa una vez.
+        """
+        start = time.perf_counter()
+        keys, choices, design_index = [], [], []
+        designs, design_rows = [], {}
+
+        for profile in itertools.product((False, True), repeat=len(KEYWORD_ORDER)):
+            keywords = dict(zip(KEYWORD_ORDER, profile))
+            for style in self._sector_styles():
+                for choice, design in self._candidates(keywords, style):
+                    design_key = (profile, choice)
+                    if design_key not in design_rows:
+                        design_rows[design_key] = len(designs)
+                        designs.append(design)
+                    keys.append((profile, style))
+                    choices.append(choice)
+                    design_index.append(design_rows[design_key])
+
+        X = self.processor.encode_batch(designs).astype(np.float32)
+        # Por bloques para aprovechar la ruta compilada del modelo
+        scores = np.concatenate([
+            self.model.predict(X[i:i + CHUNK_SIZE]).reshape(-1)
+            for i in range(0, len(X), CHUNK_SIZE)
+        ])
+
+        grouped = {}
+        for i, key in enumerate(keys):
+            grouped.setdefault(key, []).append(i)
+        scores = scores[design_index]
+        designs = [designs[row] for row in design_index]
+
+        index = {}
+        for (profile, style), rows in grouped.items():
+            keywords = dict(zip(KEYWORD_ORDER, profile))
+            ranked = sorted(rows, key=lambda i: -scores[i])[:self.max_k]
+            entries = []
+            for rank, i in enumerate(ranked, 1):
+                palette_style, font_style, component_style = choices[i]
+                score = float(scores[i])
+                entries.append({
+                    'rank': rank,
+                    'score': score,
+                    'palette_style': palette_style,
+                    'font_style': font_style,
+                    'component_style': component_style,
+                    'ui_kit': self.processor._assemble_ui_kit(
+                        designs[i]['palette'],
+                        self.processor.fonts_catalog[font_style],
+                        self.processor.components[component_style],
+                        score,
+                        keywords
+                    ),
+                })
+            index[(profile, style)] = entries
+
+        self.index = index
+        self.build_time = time.perf_counter() - start
+        self.built_at = time.strftime('%Y-%m-%dT%H:%M:%S')
+        self.ready = True
+        print(f"🗂️ Índice de recomendaciones: {len(index)} perfiles x top-{self.max_k} "
+              f"({len(design_index)} candidatos, {len(design_rows)} puntuados) en {self.build_time*1000:.0f} ms")
+        return len(index)
+
+    def key_for(self, sector=None, keywords=None, mission='', values=''):
+        """
+        Clave del índice. Las keywords pueden venir explícitas (lista de nombres)
+        o extraerse de la misión/valores del brief.
+        """
+        if keywords is None:
+            detected = self.processor._analyze_keywords(f"{mission} {values}".lower())
+            active = {k for k, v in detected.items() if v}
+        else:
+            active = {str(k) for k in keywords}
+        profile = tuple(k in active for k in KEYWORD_ORDER)
+        sector = sector if isinstance(sector, str) else 'general'
+        style = self.processor.sector_styles.get(sector, 'tech_modern')
+        return profile, style
+
+    def get(self, key, k=5):
+        """Top-k alternativas desde memoria (sin llamar al modelo)"""
+        if not self.ready:
+            return None
+        entries = self.index.get(key)
+        if entries is None:
+            return None
+        return entries[:max(1, min(k, self.max_k))]
@@ -0,0 +1,90 @@
+import os
+import threading
+
+from model import NeuroUXModel
+from data_processor import DataProcessor
+
+
+def resident_memory_mb():
+    """Memoria residente (RSS) del proceso en MB; None si no se puede leer"""
+    try:
+        with open('/proc/self/statm') as f:
+            pages = int(f.read().split()[1])
+        return round(pages * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024), 1)
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        import resource
+        # ru_maxrss es el pico (KB en Linux), a falta de /proc
+        return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+    except Exception:
+        return None
+
+
+class ModelRegistry:
+    """
+    Dueño de los modelos y del procesador del proceso.
+    - serving_model(): instancia única que sirve predicciones (la comparten app, tablas e índices)
+    - processor(): DataProcessor único (sin estado mutable tras __init__)
+    - training_model(): candidato nuevo para entrenar, sin tocar el de serving
+    - promote(candidate): instala la red entrenada en el modelo de serving sin recargarla de disco
+    Todo se crea al primer uso; ningún modelo construye un grafo que luego se descarta.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._serving = None
+        self._processor = None
+        self.models_created = 0
+        self.promotions = 0
+
+    def serving_model(self):
+        with self._lock:
+            if self._serving is None:
+                self._serving = NeuroUXModel(build=False)
+                self.models_created += 1
+            return self._serving
+
+    def processor(self):
+        with self._lock:
+            if self._processor is None:
+                self._processor = DataProcessor()
+            return self._processor
+
+    def training_model(self, **kwargs):
+        """Modelo candidato (se carga o construye al entrenar); no queda registrado"""
+        with self._lock:
+            self.models_created += 1
+        return NeuroUXModel(build=False, **kwargs)
+
+    def promote(self, candidate):
+        """Instala el candidato entrenado como modelo de serving. Retorna True si había red."""
+        if candidate is None or candidate.model is None:
+            return False
+        self.serving_model().adopt(candidate)
+        with self._lock:
+            self.promotions += 1
+        return True
+
+    def stats(self):
+        serving = self._serving
+        return {
+            'serving_version': serving.version if serving is not None else None,
+            'serving_loaded': serving is not None and serving.model is not None,
+            'models_created': self.models_created,
+            'promotions': self.promotions,
+            'rss_mb': resident_memory_mb(),
+        }
+
+
+_default_registry = None
+_default_lock = threading.Lock()
+
+
+def default_registry():
+    """Registry compartido del proceso (lo usan app y Trainer si no reciben uno)"""
+    global _default_registry
+    with _default_lock:
+        if _default_registry is None:
+            _default_registry = ModelRegistry()
+        return _default_registry
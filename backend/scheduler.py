@@ -0,0 +1,200 @@
+import os
+import json
+import time
+import threading
+from collections import deque
+
+AUTO_RETRAIN = os.environ.get('NEURO_UX_AUTO_RETRAIN', '0') == '1'
+# Disparadores: cantidad de feedback pendiente o antigüedad del primer pendiente
+RETRAIN_THRESHOLD = int(os.environ.get('NEURO_UX_AUTO_RETRAIN_THRESHOLD', '20'))
+RETRAIN_MAX_AGE_S = float(os.environ.get('NEURO_UX_AUTO_RETRAIN_MAX_AGE_S', '3600'))
+# Espera sin feedback nuevo antes de arrancar (agrupa ráfagas)
+RETRAIN_DEBOUNCE_S = float(os.environ.get('NEURO_UX_AUTO_RETRAIN_DEBOUNCE_S', '30'))
+RETRAIN_POLL_S = float(os.environ.get('NEURO_UX_AUTO_RETRAIN_POLL_S', '15'))
+# Prioridad reducida del hilo del scheduler (nice de Linux, 0 = sin cambio). Solo con el worker:
+# en proceso, los pools de TF no heredan el nice del hilo
+RETRAIN_NICE = int(os.environ.get('NEURO_UX_AUTO_RETRAIN_NICE', '10'))
+MIN_PENDING = 5
+LOG_SIZE = 50
+
+
+class RetrainScheduler:
+    """
+    Reentrenamiento automático en segundo plano.
+    Arranca cuando el feedback pendiente supera el umbral o cuando el pendiente más antiguo
+    supera la antigüedad máxima, después de 'debounce_s' sin feedback nuevo (la antigüedad
+    máxima se impone al debounce). Registra cada decisión y duración en memoria y en un JSONL.
+    Con in_process=True (sin worker) el entrenamiento corre en los pools de TF del proceso que sirve:
+    no se limita su prioridad, porque el nice del hilo no alcanza a esos pools.
+    """
+
+    def __init__(self, pending_count, run_retrain, threshold=RETRAIN_THRESHOLD,
+                 max_age_s=RETRAIN_MAX_AGE_S, debounce_s=RETRAIN_DEBOUNCE_S,
+                 poll_s=RETRAIN_POLL_S, nice=RETRAIN_NICE, in_process=False, log_path=None):
+        self.pending_count = pending_count
+        self.run_retrain = run_retrain
+        self.threshold = max(threshold, MIN_PENDING)
+        self.max_age_s = max_age_s
+        self.debounce_s = debounce_s
+        self.poll_s = poll_s
+        self.nice = nice
+        self.in_process = in_process
+        self.log_path = log_path
+
+        self.log = deque(maxlen=LOG_SIZE)
+        self.running = False
+        self.runs = 0
+        self.last_run = None
+        self._pending = 0
+        self._first_pending_at = None
+        self._last_change_at = None
+        self._deferred = False
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    @property
+    def started(self):
+        """True si el hilo del scheduler ya arrancó"""
+        return self._thread is not None
+
+    def start(self):
+        """Arranca el hilo del scheduler (idempotente)"""
+        with self._lock:
+            if self._thread is not None:
+                return False
+            self._thread = threading.Thread(target=self._loop, name='retrain-scheduler', daemon=True)
+        self._observe(self._safe_pending_count(), time.time())
+        self._thread.start()
+        self._record('start', f"umbral {self.threshold}, antigüedad {self.max_age_s:.0f}s, "
+                              f"debounce {self.debounce_s:.0f}s"
+                              f"{', en proceso (prioridad sin limitar)' if self.in_process else ''}")
+        return True
+
+    def stop(self, timeout=None):
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def notify(self, pending):
+        """Llamado tras cada /feedback: reinicia el debounce y despierta al scheduler"""
+        self._observe(pending, time.time())
+        self._wake.set()
+
+    def _observe(self, pending, now):
+        with self._lock:
+            if pending <= 0:
+                self._first_pending_at = None
+            elif self._first_pending_at is None:
+                self._first_pending_at = now
+            if pending != self._pending:
+                self._last_change_at = now
+            self._pending = pending
+
+    def _safe_pending_count(self):
+        try:
+            return self.pending_count()
+        except Exception as e:
+            print(f"⚠️ Scheduler: no se pudo leer el feedback pendiente: {e}")
+            return 0
+
+    def _should_run(self, now):
+        """Retorna (arrancar, motivo)"""
+        with self._lock:
+            pending = self._pending
+            age = now - self._first_pending_at if self._first_pending_at else 0.0
+            quiet = now - self._last_change_at if self._last_change_at else float('inf')
+
+        if pending < MIN_PENDING:
+            return False, None
+        if age >= self.max_age_s:
+            return True, f"antigüedad {age:.0f}s >= {self.max_age_s:.0f}s ({pending} pendientes)"
+        if pending < self.threshold:
+            return False, None
+        if quiet < self.debounce_s:
+            return False, f"debounce: {pending} pendientes, último feedback hace {quiet:.0f}s"
+        return True, f"{pending} pendientes >= umbral {self.threshold}"
+
+    def _loop(self):
+        self._lower_priority()
+        while not self._stop.is_set():
+            self._wake.wait(self.poll_s)
+            self._wake.clear()
+            if self._stop.is_set():
+                break
+
+            now = time.time()
+            self._observe(self._safe_pending_count(), now)
+            run, reason = self._should_run(now)
+            if not run:
+                # Solo se registra el primer aplazamiento de cada ráfaga
+                if reason and not self._deferred:
+                    self._record('defer', reason)
+                    self._deferred = True
+                continue
+
+            self._deferred = False
+            self._run(reason)
+
+    def _run(self, reason):
+        self.running = True
+        self._record('trigger', reason)
+        start = time.perf_counter()
+        try:
+            payload, status = self.run_retrain()
+            duration = time.perf_counter() - start
+            if status == 200:
+                action = 'retrained' if payload.get('retrained') else 'skipped'
+                detail = payload.get('decision', '')
+            else:
+                action, detail = 'not_run', payload.get('message') or payload.get('error', '')
+            self._record(action, detail, duration_s=round(duration, 2), status=status,
+                         metrics=payload.get('metrics'))
+        except Exception as e:
+            self._record('error', str(e), duration_s=round(time.perf_counter() - start, 2))
+        finally:
+            self.running = False
+            self.runs += 1
+            self.last_run = time.strftime('%Y-%m-%dT%H:%M:%S')
+            self._observe(self._safe_pending_count(), time.time())
+
+    def _lower_priority(self):
+        """Baja la prioridad del hilo (en Linux nice es por hilo; en proceso no se aplica)"""
+        if not self.nice or self.in_process or not hasattr(os, 'setpriority'):
+            return
+        try:
+            tid = threading.get_native_id()
+            os.setpriority(os.PRIO_PROCESS, tid, os.getpriority(os.PRIO_PROCESS, tid) + self.nice)
+        except OSError as e:
+            print(f"⚠️ Scheduler: no se pudo bajar la prioridad: {e}")
+
+    def _record(self, action, detail, **extra):
+        entry = {'time': time.strftime('%Y-%m-%dT%H:%M:%S'), 'action': action, 'detail': detail, **extra}
+        self.log.append(entry)
+        print(f"⏰ Auto-retrain [{action}] {detail}")
+        if self.log_path:
+            try:
+                with open(self.log_path, 'a', encoding='utf-8') as f:
+                    f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+            except OSError as e:
+                print(f"⚠️ Scheduler: no se pudo escribir el log: {e}")
+
+    def stats(self):
+        with self._lock:
+            pending = self._pending
+            first = self._first_pending_at
+        return {
+            'enabled': self.started,
+            'in_process': self.in_process,
+            'running': self.running,
+            'runs': self.runs,
+            'last_run': self.last_run,
+            'pending': pending,
+            'oldest_pending_age_s': round(time.time() - first, 1) if first else 0.0,
+            'threshold': self.threshold,
+            'max_age_s': self.max_age_s,
+            'debounce_s': self.debounce_s,
+            'recent': list(self.log)[-10:],
+        }
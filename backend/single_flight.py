@@ -0,0 +1,113 @@
+import json
+import asyncio
+import hashlib
+import threading
+
+
+def fingerprint(data):
+    """Huella canónica de un input (claves ordenadas, independiente del orden del JSON recibido)"""
+    canonical = json.dumps(data, sort_keys=True, separators=(',', ':'), ensure_ascii=False, default=str)
+    return hashlib.sha1(canonical.encode('utf-8')).hexdigest()
+
+
+class _Call:
+    __slots__ = ('done', 'result', 'error', 'waiters')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Deduplica llamadas concurrentes con la misma clave: la primera ejecuta la función y las
+    demás esperan y comparten su resultado (o su excepción).
+    No es un caché: al terminar la llamada la clave se libera.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self.requests = 0
+        self.executions = 0
+        self.coalesced = 0
+        self.max_waiters = 0
+
+    def do(self, key, fn, *args, **kwargs):
+        """Retorna (resultado, compartido)"""
+        with self._lock:
+            self.requests += 1
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.executions += 1
+            else:
+                call.waiters += 1
+                self.coalesced += 1
+                self.max_waiters = max(self.max_waiters, call.waiters)
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = fn(*args, **kwargs)
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result, False
+
+    def stats(self):
+        with self._lock:
+            return {
+                'requests': self.requests,
+                'executions': self.executions,
+                'coalesced': self.coalesced,
+                'coalescing_rate': round(self.coalesced / self.requests, 4) if self.requests else 0.0,
+                'in_flight': len(self._calls),
+                'max_waiters': self.max_waiters,
+            }
+
+
+class AsyncSingleFlight(SingleFlight):
+    """
+    Variante para el event loop (modo ASGI): los seguidores esperan la tarea del líder en vez
+    de bloquear un hilo. 'fn' es una corrutina (p. ej. la inferencia enviada al executor).
+    La ejecución corre como tarea propia: si el cliente líder se desconecta, los demás no la pierden.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._waiters = {}
+
+    async def do(self, key, fn, *args, **kwargs):
+        """Retorna (resultado, compartido)"""
+        self.requests += 1
+        task = self._calls.get(key)
+        shared = task is not None
+        if shared:
+            self.coalesced += 1
+            self._waiters[key] += 1
+            self.max_waiters = max(self.max_waiters, self._waiters[key])
+        else:
+            task = asyncio.ensure_future(fn(*args, **kwargs))
+            self._calls[key] = task
+            self._waiters[key] = 0
+            self.executions += 1
+
+            def release(_):
+                if self._calls.get(key) is task:
+                    del self._calls[key]
+                    del self._waiters[key]
+
+            task.add_done_callback(release)
+        return await asyncio.shield(task), shared
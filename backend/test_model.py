@@ -7,6 +7,8 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from model import NeuroUXModel
 from data_processor import DataProcessor
+from warmup import WARMUP_CASES
+from registry import ModelRegistry, resident_memory_mb
 
 def test_predictions():
     """Prueba el modelo con diferentes inputs"""
@@ -28,49 +30,8 @@ def test_predictions():
     
     model.load_model()
     
-    # Casos de prueba
-    test_cases = [
-        {
-            "name": "Diseño Moderno Minimalista",
-            "input": {
-                "palette": ["#000000", "#FFFFFF", "#FF6B6B"],
-                "fonts": ["Inter", "Helvetica"],
-                "layout": "grid",
-                "spacing": "medium",
-                "contrast": "high"
-            }
-        },
-        {
-            "name": "Diseño Corporativo Tradicional",
-            "input": {
-                "palette": ["#003366", "#336699", "#FFFFFF"],
-                "fonts": ["Georgia", "Times New Roman"],
-                "layout": "sidebar",
-                "spacing": "compact",
-                "contrast": "medium"
-            }
-        },
-        {
-            "name": "Diseño Creativo Vibrante",
-            "input": {
-                "palette": ["#FF1744", "#00E676", "#2979FF"],
-                "fonts": ["Montserrat", "Poppins"],
-                "layout": "masonry",
-                "spacing": "wide",
-                "contrast": "high"
-            }
-        },
-        {
-            "name": "Diseño E-commerce Limpio",
-            "input": {
-                "palette": ["#FFFFFF", "#F5F5F5", "#4CAF50"],
-                "fonts": ["Roboto", "Open Sans"],
-                "layout": "grid",
-                "spacing": "medium",
-                "contrast": "medium"
-            }
-        }
-    ]
+    # Casos de prueba (compartidos con el warm-up de la API)
+    test_cases = WARMUP_CASES
     
     print("\n🔍 Evaluando diferentes diseños...\n")
     
@@ -167,9 +128,49 @@ def test_custom_input():
     else:
         print("   ❌ Diseño mejorable, revisa los principios de UX")
 
+def test_memory():
+    """Memoria residente: instancias independientes (esquema anterior) vs registry compartido"""
+    print("\n" + "=" * 60)
+    print("🧠 MEMORIA: MODELO COMPARTIDO")
+    print("=" * 60)
+    
+    from training import Trainer
+    
+    def measure(label, setup):
+        before = resident_memory_mb()
+        objects = setup()
+        after = resident_memory_mb()
+        print(f"   {label}: {before} MB -> {after} MB (+{after - before:.1f} MB)")
+        return objects
+    
+    def shared():
+        registry = ModelRegistry()
+        model = registry.serving_model()
+        model.load_model()
+        trainer = Trainer(registry)
+        return registry, model, trainer
+    
+    def independent():
+        # Lo que hacía app.py: modelo + procesador propios, y el Trainer con otro modelo construido
+        model = NeuroUXModel()
+        model.load_model()
+        processor = DataProcessor()
+        trainer_model, trainer_processor = NeuroUXModel(), DataProcessor()
+        return model, processor, trainer_model, trainer_processor
+    
+    # El primer modelo paga la inicialización de TF: se descuenta antes de medir
+    NeuroUXModel().load_model()
+    
+    registry, model, trainer = measure("Registry compartido   ", shared)
+    assert trainer.processor is registry.processor(), "El Trainer debe compartir el procesador"
+    assert trainer._model is None, "El Trainer no debe crear modelo hasta entrenar"
+    measure("Instancias separadas  ", independent)
+
 if __name__ == "__main__":
     # Ejecutar pruebas predefinidas
     test_predictions()
     
+    test_memory()
+    
     # Opcional: descomentar para probar input personalizado
     # test_custom_input()
\ No newline at end of file
@@ -1,37 +1,149 @@
 import os
 import json
+import time
+import shutil
+import tempfile
+import threading
 import numpy as np
-from sklearn.model_selection import train_test_split
-from model import NeuroUXModel
-from data_processor import DataProcessor
+from joblib import Parallel, delayed, parallel_backend
+from sklearn.model_selection import train_test_split, StratifiedKFold
+from model import NeuroUXModel, limit_tf_threads, sector_slug, SECTOR_MODEL_DIR
+from registry import default_registry
+from compaction import compact_rows, COMPACT_DATASET
+from columnar_dataset import ColumnarDataset, json_to_columnar, default_path as columnar_default_path
+
+# Usar el dataset columnar (memory-map) si está al día con el JSON
+USE_COLUMNAR = os.environ.get('NEURO_UX_COLUMNAR_DATASET', '1') == '1'
+# Hilos de TensorFlow por proceso en la validación cruzada
+CV_TF_THREADS = int(os.environ.get('NEURO_UX_CV_TF_THREADS', '1'))
+CV_METRICS = ('loss', 'accuracy', 'auc')
+# Muestras mínimas de un sector para entrenar su modelo propio (con menos usa el global)
+SECTOR_MIN_SAMPLES = int(os.environ.get('NEURO_UX_SECTOR_MIN_SAMPLES', '10'))
+
+
+def fit_and_evaluate(model, X_train, y_train, X_val, y_val, compact=COMPACT_DATASET, **train_kwargs):
+    """
+    Entrena y evalúa sobre un split ya hecho. Con compact, los inputs repetidos se colapsan antes de
+    entrenar: el entrenamiento con etiquetas suaves (un input por fila) y la validación por input y
+    etiqueta, así val_loss, accuracy y AUC ponderadas son las mismas que sin compactar. El batch se
+    reduce en la misma proporción que las filas de entrenamiento.
+    Retorna (history, metrics).
+    """
+    w_train = w_val = None
+    if compact and len(X_train):
+        rows = (len(X_train), len(X_val))
+        X_train, y_train, w_train = compact_rows(X_train, y_train)
+        X_val, y_val, w_val = compact_rows(X_val, y_val, soft_labels=False)
+        # Keras promedia la loss ponderada sobre filas, no sobre pesos: con media 1 son lo mismo
+        w_train, w_val = w_train / w_train.mean(), w_val / w_val.mean()
+        # Batch escalado a las filas compactadas: la misma fracción del dataset por paso
+        batch_size = train_kwargs.get('batch_size', 32)
+        train_kwargs['batch_size'] = max(1, round(batch_size * len(X_train) / rows[0]))
+        print(f"🗜️ Dataset compactado: entrenamiento {rows[0]} -> {len(X_train)} filas | "
+              f"validación {rows[1]} -> {len(X_val)} filas | batch {batch_size} -> {train_kwargs['batch_size']}")
+
+    history = model.train(X_train, y_train, X_val, y_val, sample_weight=w_train,
+                          val_sample_weight=w_val, **train_kwargs)
+    return history, model.evaluate(X_val, y_val, sample_weight=w_val)
+
+
+def report_io(model):
+    """Imprime y retorna las escrituras a disco del último entrenamiento del modelo"""
+    io = model.io_report()
+    print(f"💾 I/O ({io['checkpoint_mode']}): {io['checkpoint_writes']} checkpoints ({io['checkpoint_ms']:.0f} ms) | "
+          f"{io['artifact_writes']} escrituras finales ({io['artifact_ms']:.0f} ms) | "
+          f"{io['bytes_written'] / 1024:.0f} KB")
+    return io
+
+
+def _train_fold(fold, X, y, train_idx, val_idx, epochs, tf_threads, output_dir, seed):
+    """
+    Entrena y evalúa un fold en un proceso del pool.
+    El checkpoint y el modelo se escriben en output_dir, nunca en la ruta compartida del modelo.
+    """
+    # En un worker reutilizado el runtime ya está inicializado y conserva el límite previo
+    limit_tf_threads(tf_threads, tf_threads)
+    from model import tf
+
+    start = time.perf_counter()
+    tf.keras.utils.set_random_seed(seed + fold)
+    model = NeuroUXModel(compiled=False)
+    model.model_path = os.path.join(output_dir, f'fold_{fold}.h5')
+
+    _, metrics = fit_and_evaluate(model, X[train_idx], y[train_idx], X[val_idx], y[val_idx],
+                                  epochs=epochs, verbose=0)
+    metrics = {name: float(value) for name, value in metrics.items()}
+    model.save_model()
+
+    return {
+        'fold': fold,
+        'io': model.io_report(),
+        'train_samples': int(len(train_idx)),
+        'val_samples': int(len(val_idx)),
+        'metrics': metrics,
+        'epochs_run': len(model.history.history.get('loss', [])),
+        'time_s': round(time.perf_counter() - start, 2),
+        'model_path': model.model_path,
+    }
+
 
 class Trainer:
-    def __init__(self):
+    def __init__(self, registry=None):
         self.data_path = os.path.join(os.path.dirname(__file__), 'data', 'combined_training_data.json')
         self.dataset_path = self.data_path
-        self.model = NeuroUXModel()
-        self.processor = DataProcessor()
+        self.columnar_path = columnar_default_path(self.data_path)
+        self.registry = registry or default_registry()
+        self.processor = self.registry.processor()
+        self._model = None
+        # Lecturas y escrituras del JSON: /feedback, /retrain y el scheduler corren en hilos distintos
+        self.dataset_lock = threading.RLock()
+    
+    @property
+    def model(self):
+        """Modelo candidato de entrenamiento: se crea al primer uso, separado del de serving"""
+        if self._model is None:
+            # Sin tf.function de inferencia: el candidato solo entrena y evalúa
+            self._model = self.registry.training_model(compiled=False)
+        return self._model
+    
+    def release_model(self):
+        """Entrega el candidato entrenado (p. ej. para registry.promote) y lo suelta"""
+        model, self._model = self._model, None
+        return model
         
+    def _write_json(self, path, data):
+        """
+        Escribe el JSON en un temporal del mismo directorio y lo renombra sobre path: quien lea el
+        archivo ve la versión anterior o la nueva completa, nunca una a medio escribir.
+        """
+        tmp_path = os.path.join(os.path.dirname(path), f".tmp_{os.urandom(6).hex()}.json")
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=2, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
     def load_training_data(self):
         """
         Carga el dataset combinado y maneja ambos formatos (lista o objeto).
         """
-        if not os.path.exists(self.dataset_path):
-            print(f"⚠️ Dataset no encontrado, creando archivo vacío: {self.dataset_path}")
-            # Si no existe, creamos la estructura base
-            os.makedirs(os.path.dirname(self.dataset_path), exist_ok=True)
-            data = {'training_data': [], 'feedback_data': [], 'pending_feedback': []}
-            with open(self.dataset_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2)
-            return [], [], []
-
-        
-        with open(self.dataset_path, 'r', encoding='utf-8') as f:
-            try:
-                data = json.load(f)
-            except json.JSONDecodeError:
-                print(f"❌ Error al decodificar JSON en {self.dataset_path}. Archivo corrupto.")
+        with self.dataset_lock:
+            if not os.path.exists(self.dataset_path):
+                print(f"⚠️ Dataset no encontrado, creando archivo vacío: {self.dataset_path}")
+                # Si no existe, creamos la estructura base
+                os.makedirs(os.path.dirname(self.dataset_path), exist_ok=True)
+                self._write_json(self.dataset_path, {'training_data': [], 'feedback_data': [], 'pending_feedback': []})
                 return [], [], []
+
+            with open(self.dataset_path, 'r', encoding='utf-8') as f:
+                try:
+                    data = json.load(f)
+                except json.JSONDecodeError:
+                    print(f"❌ Error al decodificar JSON en {self.dataset_path}. Archivo corrupto.")
+                    return [], [], []
         
         # ✅ CORREGIDO: Detectar y manejar ambos formatos
         if isinstance(data, list):
@@ -57,9 +169,25 @@ class Trainer:
     
     def prepare_dataset(self):
         """Prepara el dataset combinando todos los datos disponibles"""
+        if USE_COLUMNAR and ColumnarDataset.is_fresh(self.columnar_path, self.dataset_path):
+            try:
+                dataset = ColumnarDataset(self.columnar_path, mmap=True)
+                print(f"ℹ️ Formato detectado: Columnar ({len(dataset)} filas, memory-map)")
+                return dataset.prepare(self.processor)
+            except Exception as e:
+                print(f"⚠️ Error leyendo dataset columnar, usando JSON: {e}")
+        elif USE_COLUMNAR and os.path.exists(self.columnar_path):
+            print("ℹ️ Dataset columnar desactualizado, usando JSON (python columnar_dataset.py convert)")
+        
         training_data, feedback_data, pending_feedback = self.load_training_data()
-        all_data = training_data + feedback_data + pending_feedback
+        X, y = self._encode_items(training_data + feedback_data + pending_feedback)
         
+        if len(X) == 0:
+            print("⚠️ No se pudieron procesar datos válidos del dataset. Se retorna vacío.")
+        return X, y
+    
+    def _encode_items(self, all_data):
+        """Codifica items {'input', 'rating'} a (X, y); descarta los inválidos"""
         X = []
         y = []
         
@@ -72,16 +200,17 @@ class Trainer:
             try:
                 # ✅ CORREGIDO: Aceptar 3 valores, descartar los dos últimos
                 features, _, _ = self.processor.encode_input(item['input'])
-                X.append(features[0])
-                
                 rating = item.get('rating', 0.5)
-                y.append(1 if rating >= 0.7 else 0)
+                label = 1 if rating >= 0.7 else 0
+                
+                # X e y se agregan juntos para que un rating inválido no los desalinee
+                X.append(features[0])
+                y.append(label)
             except Exception as e:
                 print(f"⚠️ Error procesando item: {e}")
                 continue
         
         if len(X) == 0:
-            print("⚠️ No se pudieron procesar datos válidos del dataset. Se retorna vacío.")
             return np.array([]), np.array([])
         
         return np.array(X), np.array(y)
@@ -120,8 +249,7 @@ class Trainer:
         print(f"🔄 Entrenamiento: {len(X_train)} | Validación: {len(X_val)}")
         
         print("\n🚀 Iniciando entrenamiento...")
-        history = self.model.train(X_train, y_train, X_val, y_val, epochs=epochs)
-        metrics = self.model.evaluate(X_val, y_val)
+        history, metrics = fit_and_evaluate(self.model, X_train, y_train, X_val, y_val, epochs=epochs)
         
         print(f"\n✨ Resultados finales:")
         print(f"   - Loss: {metrics['loss']:.4f}")
@@ -130,149 +258,321 @@ class Trainer:
         
         # ✅ GUARDAR EL MODELO ACTUALIZADO
         self.model.save_model()
+        self.model.export_tflite()
+        report_io(self.model)
         return history, metrics
     
+    def cross_validate(self, k=5, epochs=100, n_jobs=None, tf_threads=CV_TF_THREADS,
+                       select_best=None, seed=42):
+        """
+        Validación cruzada estratificada de k folds en un pool de procesos (joblib).
+        Reporta media y varianza de loss/accuracy/auc y el tiempo total.
+        select_best: 'auc', 'accuracy' o 'loss' para guardar como modelo final el mejor fold
+        (None = solo evaluar, el modelo guardado no cambia).
+        """
+        if select_best is not None and select_best not in CV_METRICS:
+            raise ValueError(f"select_best debe ser uno de {CV_METRICS}")
+
+        print("📊 Cargando y preparando datos...")
+        X, y = self.prepare_dataset()
+        if len(X) == 0:
+            raise ValueError("No hay datos para la validación cruzada")
+
+        # Cada fold necesita al menos un ejemplo de cada clase
+        min_class = int(min(np.sum(y), len(y) - np.sum(y)))
+        if min_class < 2:
+            raise ValueError("Se necesitan al menos 2 ejemplos de cada clase para estratificar")
+        if k > min_class:
+            print(f"⚠️ k={k} mayor que la clase minoritaria ({min_class}); se usa k={min_class}")
+            k = min_class
+
+        n_jobs = n_jobs or min(k, os.cpu_count() or 1)
+        splits = list(StratifiedKFold(n_splits=k, shuffle=True, random_state=seed).split(X, y))
+        print(f"🔁 Validación cruzada: {k} folds | {len(X)} muestras | {n_jobs} procesos x {tf_threads} hilos TF")
+
+        output_dir = tempfile.mkdtemp(prefix='neuro_ux_cv_')
+        start = time.perf_counter()
+        try:
+            # inner_max_num_threads limita también BLAS/OpenMP dentro de cada worker
+            with parallel_backend('loky', inner_max_num_threads=tf_threads):
+                folds = Parallel(n_jobs=n_jobs)(
+                    delayed(_train_fold)(fold, X, y, train_idx, val_idx, epochs, tf_threads, output_dir, seed)
+                    for fold, (train_idx, val_idx) in enumerate(splits)
+                )
+            wall_time = time.perf_counter() - start
+
+            summary = {}
+            for name in CV_METRICS:
+                values = np.array([f['metrics'][name] for f in folds])
+                summary[name] = {
+                    'mean': float(values.mean()),
+                    'var': float(values.var()),
+                    'std': float(values.std()),
+                    'min': float(values.min()),
+                    'max': float(values.max()),
+                }
+
+            result = {
+                'k': k,
+                'samples': int(len(X)),
+                'n_jobs': n_jobs,
+                'tf_threads': tf_threads,
+                'wall_time_s': round(wall_time, 2),
+                'fold_time_s': round(sum(f['time_s'] for f in folds), 2),
+                'metrics': summary,
+                'folds': [{key: v for key, v in f.items() if key != 'model_path'} for f in folds],
+                'checkpoint_writes': sum(f['io']['checkpoint_writes'] for f in folds),
+                'io_ms': round(sum(f['io']['io_ms'] for f in folds), 2),
+                'selected_fold': None,
+            }
+
+            print("\n✨ Resultados de la validación cruzada:")
+            for name, stats in summary.items():
+                print(f"   - {name}: {stats['mean']:.4f} ± {stats['std']:.4f} (var {stats['var']:.5f})")
+            print(f"⏱️  Tiempo total: {wall_time:.1f}s (suma de folds: {result['fold_time_s']:.1f}s)")
+
+            if select_best is not None:
+                pick = min if select_best == 'loss' else max
+                best = pick(folds, key=lambda f: f['metrics'][select_best])
+                print(f"🏆 Mejor fold por {select_best}: {best['fold']} ({best['metrics'][select_best]:.4f})")
+                if self.model.load_model(best['model_path']):
+                    self.model.save_model()
+                    self.model.export_tflite()
+                    result['selected_fold'] = best['fold']
+            return result
+        finally:
+            shutil.rmtree(output_dir, ignore_errors=True)
+
+    def sector_groups(self):
+        """Items del dataset agrupados por el tag 'sector' del input: {slug: (nombre, items)}"""
+        training_data, feedback_data, pending_feedback = self.load_training_data()
+        groups = {}
+        for item in training_data + feedback_data + pending_feedback:
+            sector = item.get('input', {}).get('sector') if isinstance(item, dict) else None
+            if not isinstance(sector, str) or not sector_slug(sector):
+                continue
+            _, items = groups.setdefault(sector_slug(sector), (sector, []))
+            items.append(item)
+        return groups
+
+    def train_sector_models(self, sectors=None, epochs=50, min_samples=SECTOR_MIN_SAMPLES):
+        """
+        Entrena un modelo por sector a partir del modelo global (fine-tuning con los items de ese sector).
+        sectors: nombres a entrenar (None = todos los del dataset con al menos min_samples).
+        Cada modelo se escribe en un directorio temporal y se instala con un reemplazo atómico,
+        así el servidor nunca carga un .h5 a medio escribir.
+        Retorna {slug: reporte}.
+        """
+        groups = self.sector_groups()
+        wanted = None if sectors is None else {sector_slug(s) for s in sectors}
+        global_path = NeuroUXModel(build=False).model_path
+        report = {}
+
+        for slug, (name, items) in sorted(groups.items()):
+            if wanted is not None and slug not in wanted:
+                continue
+            X, y = self._encode_items(items)
+            positives = int(np.sum(y)) if len(y) else 0
+            if len(X) < min_samples or min(positives, len(y) - positives) < 2:
+                print(f"⏭️ Sector '{name}': {len(X)} muestras ({positives} positivas), usa el modelo global")
+                report[slug] = {'sector': name, 'samples': int(len(X)), 'trained': False,
+                                'reason': f'se necesitan {min_samples} muestras y 2 de cada clase'}
+                continue
+
+            print(f"🚀 Sector '{name}': entrenando con {len(X)} muestras...")
+            candidate = self.registry.training_model(backend='keras', compiled=False, sector=name)
+            final_path = candidate.model_path
+            candidate.load_model(global_path)
+
+            tmp_dir = tempfile.mkdtemp(prefix='.training_', dir=SECTOR_MODEL_DIR)
+            try:
+                candidate.model_path = os.path.join(tmp_dir, os.path.basename(final_path))
+                X_train, X_val, y_train, y_val = train_test_split(
+                    X, y, test_size=0.2, random_state=42, stratify=y
+                )
+                _, metrics = fit_and_evaluate(candidate, X_train, y_train, X_val, y_val, epochs=epochs, verbose=0)
+                candidate.save_model()
+                os.replace(candidate.model_path, final_path)
+                io = report_io(candidate)
+            finally:
+                shutil.rmtree(tmp_dir, ignore_errors=True)
+
+            print(f"✅ Sector '{name}': accuracy {metrics['accuracy']:.4f} | loss {metrics['loss']:.4f}")
+            report[slug] = {
+                'sector': name,
+                'samples': int(len(X)),
+                'trained': True,
+                'metrics': {k: float(v) for k, v in metrics.items()},
+                'io': io,
+                'model_path': final_path,
+            }
+
+        for sector in sorted((wanted or set()) - set(groups)):
+            report[sector] = {'sector': sector, 'samples': 0, 'trained': False, 'reason': 'sin datos en el dataset'}
+        return report
+
     def add_feedback(self, input_data, rating, feedback_text):
         """Agrega un nuevo feedback a la cola de pendientes"""
-        data = {}
-        # ✅ Cargar o crear estructura de datos
-        if not os.path.exists(self.data_path):
-            data = {
-                'training_data': [],
-                'feedback_data': [],
-                'pending_feedback': []
-            }
-        else:
-            with open(self.data_path, 'r', encoding='utf-8') as f:
-                try:
-                    loaded_data = json.load(f)
-                except json.JSONDecodeError:
-                    loaded_data = {} # Si está corrupto, empezamos de nuevo
-            
-            # ✅ Convertir lista a objeto si es necesario
-            if isinstance(loaded_data, list):
+        with self.dataset_lock:
+            # ✅ Cargar o crear estructura de datos
+            if not os.path.exists(self.data_path):
                 data = {
-                    'training_data': loaded_data,
+                    'training_data': [],
                     'feedback_data': [],
                     'pending_feedback': []
                 }
             else:
-                data = loaded_data
-        
-        if 'pending_feedback' not in data:
-            data['pending_feedback'] = []
-        if 'training_data' not in data:
-            data['training_data'] = []
-        if 'feedback_data' not in data:
-            data['feedback_data'] = []
-        
-        data['pending_feedback'].append({
-            'input': input_data,
-            'rating': rating,
-            'feedback': feedback_text
-        })
-        
-        with open(self.data_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+                try:
+                    data = self._load_sections()
+                except json.JSONDecodeError as e:
+                    # Nunca sobrescribir un dataset ilegible: se perderían todos sus registros
+                    raise ValueError(f"Dataset corrupto en {self.data_path}, feedback no guardado: {e}")
+            
+            if 'pending_feedback' not in data:
+                data['pending_feedback'] = []
+            if 'training_data' not in data:
+                data['training_data'] = []
+            if 'feedback_data' not in data:
+                data['feedback_data'] = []
+            
+            data['pending_feedback'].append({
+                'input': input_data,
+                'rating': rating,
+                'feedback': feedback_text
+            })
+            
+            self._write_json(self.data_path, data)
         
         pending_count = len(data['pending_feedback'])
         print(f"✅ Feedback agregado. Pendientes: {pending_count} registros")
         return pending_count
     
-    def retrain_with_feedback(self):
-        """Reentrena usando todos los datos incluyendo feedbacks pendientes"""
-        try:
-            print("🔄 Iniciando reentrenamiento...")
-            
-            # Cargar datos
+    def _load_sections(self):
+        """Lee el JSON como objeto con secciones (convierte el formato lista)"""
+        with self.dataset_lock:
             if not os.path.exists(self.data_path):
                 raise FileNotFoundError(f"No existe el archivo de datos: {self.data_path}")
             
             with open(self.data_path, 'r', encoding='utf-8') as f:
                 loaded_data = json.load(f)
-            
-            # ✅ Manejar ambos formatos
-            if isinstance(loaded_data, list):
-                data = {
-                    'training_data': loaded_data,
-                    'feedback_data': [],
-                    'pending_feedback': []
-                }
-            else:
-                data = loaded_data
-            
+        
+        # ✅ Manejar ambos formatos
+        if isinstance(loaded_data, list):
+            return {
+                'training_data': loaded_data,
+                'feedback_data': [],
+                'pending_feedback': []
+            }
+        return loaded_data
+    
+    def snapshot(self):
+        """Copia del dataset actual para reentrenar sin tocar el archivo (p. ej. en otro proceso)"""
+        data = self._load_sections()
+        return {
+            'training_data': data.get('training_data', []),
+            'feedback_data': data.get('feedback_data', []),
+            'pending_feedback': data.get('pending_feedback', []),
+        }
+    
+    def retrain_from_snapshot(self, snapshot, epochs=50, model_path=None, extra_callbacks=None):
+        """
+        Reentrena a partir de un snapshot del dataset, sin modificar el archivo de datos.
+        El checkpoint, el .h5 y el .tflite se escriben en model_path (por defecto la ruta del modelo).
+        Retorna: (history, metrics)
+        """
+        pending = snapshot.get('pending_feedback', [])
+        if len(pending) < 5:
+            raise ValueError(f"No hay suficientes feedbacks pendientes. Tienes: {len(pending)}, se necesitan al menos 5")
+        
+        print(f"📊 Reentrenando con {len(pending)} feedbacks nuevos")
+        
+        # ✅ Cargar modelo existente antes de reentrenar
+        print("🔄 Cargando modelo existente...")
+        self.model.load_model()
+        if model_path is not None:
+            self.model.model_path = model_path
+            self.model.tflite_path = os.path.splitext(model_path)[0] + '.tflite'
+        
+        # Combinar todos los datos
+        all_data = snapshot.get('training_data', []) + snapshot.get('feedback_data', []) + pending
+        X, y = self._encode_items(all_data)
+        
+        if len(X) == 0:
+            raise ValueError("No se pudieron procesar datos válidos")
+        
+        print(f"✅ Total de datos para reentrenamiento: {len(X)} muestras")
+        
+        # Dividir
+        # Añadir 'stratify=y' si hay suficientes muestras de ambas clases
+        stratify_data = None
+        if np.sum(y) > 1 and len(y) - np.sum(y) > 1:
+            stratify_data = y
+
+        X_train, X_val, y_train, y_val = train_test_split(
+            X, y, test_size=0.2, random_state=42, stratify=stratify_data
+        )
+        
+        # Entrenar
+        print("\n🚀 Reentrenando modelo...")
+        history, metrics = fit_and_evaluate(self.model, X_train, y_train, X_val, y_val, epochs=epochs,
+                                            extra_callbacks=extra_callbacks)
+        
+        print(f"\n✨ Resultados del reentrenamiento:")
+        print(f"   - Loss: {metrics['loss']:.4f}")
+        print(f"   - Accuracy: {metrics['accuracy']:.4f}")
+        print(f"   - AUC: {metrics.get('auc', 0.0):.4f}")
+        
+        # Guardar modelo
+        self.model.save_model()
+        self.model.export_tflite()
+        report_io(self.model)
+        return history, metrics
+    
+    def commit_pending(self, count=None):
+        """
+        Mueve a 'feedback_data' los primeros 'count' feedbacks pendientes (todos si es None).
+        Los pendientes llegados después del snapshot se quedan en la cola.
+        """
+        # Leer, mover y escribir bajo el lock: un /feedback intermedio no se pierde
+        with self.dataset_lock:
+            data = self._load_sections()
             pending = data.get('pending_feedback', [])
-            if len(pending) < 5:
-                raise ValueError(f"No hay suficientes feedbacks pendientes. Tienes: {len(pending)}, se necesitan al menos 5")
-            
-            print(f"📊 Reentrenando con {len(pending)} feedbacks nuevos")
-            
-            # ✅ Cargar modelo existente antes de reentrenar
-            print("🔄 Cargando modelo existente...")
-            self.model.load_model()
+            count = len(pending) if count is None else min(count, len(pending))
             
-            # Combinar todos los datos
-            all_data = data.get('training_data', []) + data.get('feedback_data', []) + pending
+            data.setdefault('feedback_data', []).extend(pending[:count])
+            data['pending_feedback'] = pending[count:]
             
-            X = []
-            y = []
-            for item in all_data: 
-                if not isinstance(item, dict) or 'input' not in item: 
-                    print(f"⚠️ Saltando item inválido: {item}")
-                    continue
-                
-                try:
-                    # ✅ CORREGIDO: Aceptar 3 valores, descartar los dos últimos
-                    features, _, _ = self.processor.encode_input(item['input'])
-                    X.append(features[0])
-                    rating = item.get('rating', 0.5)
-                    y.append(1 if rating >= 0.7 else 0)
-                except Exception as e:
-                    print(f"⚠️ Error procesando item: {e}")
-                    continue
-            
-            if len(X) == 0:
-                raise ValueError("No se pudieron procesar datos válidos")
-            
-            X = np.array(X)
-            y = np.array(y)
-            
-            print(f"✅ Total de datos para reentrenamiento: {len(X)} muestras")
-            
-            # Dividir
-            # Añadir 'stratify=y' si hay suficientes muestras de ambas clases
-            stratify_data = None
-            if np.sum(y) > 1 and len(y) - np.sum(y) > 1:
-                stratify_data = y
-
-            X_train, X_val, y_train, y_val = train_test_split(
-                X, y, test_size=0.2, random_state=42, stratify=stratify_data
-            )
-            
-            # Entrenar
-            print("\n🚀 Reentrenando modelo...")
-            history = self.model.train(X_train, y_train, X_val, y_val, epochs=50)
-            metrics = self.model.evaluate(X_val, y_val)
-            
-            print(f"\n✨ Resultados del reentrenamiento:")
-            print(f"   - Loss: {metrics['loss']:.4f}")
-            print(f"   - Accuracy: {metrics['accuracy']:.4f}")
-            print(f"   - AUC: {metrics.get('auc', 0.0):.4f}")
-            
-            # Guardar modelo
-            self.model.save_model()
+            self._write_json(self.data_path, data)
+            self.refresh_columnar()
+        
+        return count
+    
+    def refresh_columnar(self):
+        """
+        Regenera la copia columnar tras escribir el JSON (si existe: la conversión es opt-in).
+        Los feedbacks que llegan después la dejan desactualizada hasta el próximo commit o convert;
+        mientras tanto prepare_dataset usa el JSON.
+        """
+        if not USE_COLUMNAR or not os.path.exists(self.columnar_path):
+            return False
+        try:
+            json_to_columnar(self.data_path, self.columnar_path)
+            return True
+        except Exception as e:
+            print(f"⚠️ No se pudo regenerar el dataset columnar: {e}")
+            return False
+    
+    def retrain_with_feedback(self, epochs=50, extra_callbacks=None):
+        """Reentrena usando todos los datos incluyendo feedbacks pendientes"""
+        try:
+            print("🔄 Iniciando reentrenamiento...")
+            snapshot = self.snapshot()
+            history, metrics = self.retrain_from_snapshot(snapshot, epochs=epochs,
+                                                          extra_callbacks=extra_callbacks)
             
             # Mover feedbacks usados de 'pending' a 'feedback_data'
-            if 'feedback_data' not in data:
-                data['feedback_data'] = []
-            
-            data['feedback_data'].extend(pending)
-            data['pending_feedback'] = []  # Vaciar la cola de pendientes
-            
-            with open(self.data_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
-            
-            print(f"✅ Reentrenamiento completado. {len(pending)} feedbacks procesados.")
+            consumed = self.commit_pending(len(snapshot['pending_feedback']))
+            print(f"✅ Reentrenamiento completado. {consumed} feedbacks procesados.")
             return history, metrics
             
         except Exception as e:
@@ -280,12 +580,49 @@ class Trainer:
             raise
 
 if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Entrenamiento del modelo Neuro UX")
+    parser.add_argument('--epochs', type=int, default=100)
+    parser.add_argument('--cv', type=int, default=0, metavar='K',
+                        help="Validación cruzada estratificada de K folds en lugar de un split único")
+    parser.add_argument('--jobs', type=int, default=None, help="Procesos para la validación cruzada")
+    parser.add_argument('--tf-threads', type=int, default=CV_TF_THREADS, help="Hilos de TF por proceso")
+    parser.add_argument('--select-best', choices=CV_METRICS, default=None,
+                        help="Guardar el mejor fold como modelo final")
+    parser.add_argument('--sectors', action='store_true',
+                        help="Entrenar los modelos por sector (a partir del modelo global)")
+    parser.add_argument('--sector', action='append', default=None, metavar='NOMBRE',
+                        help="Entrenar solo este sector (se puede repetir)")
+    parser.add_argument('--min-samples', type=int, default=SECTOR_MIN_SAMPLES,
+                        help="Muestras mínimas para entrenar el modelo de un sector")
+    args = parser.parse_args()
+
     trainer = Trainer()
+
+    if args.sectors or args.sector:
+        print("=" * 60)
+        print("🧠 NEURO UX STYLER - MODELOS POR SECTOR")
+        print("=" * 60)
+        report = trainer.train_sector_models(sectors=args.sector, epochs=args.epochs,
+                                             min_samples=args.min_samples)
+        trained = [r['sector'] for r in report.values() if r['trained']]
+        print(f"\n✅ {len(trained)} modelos de sector entrenados: {', '.join(trained) or 'ninguno'}")
+        raise SystemExit(0)
+
+    if args.cv:
+        print("=" * 60)
+        print("🧠 NEURO UX STYLER - VALIDACIÓN CRUZADA")
+        print("=" * 60)
+        trainer.cross_validate(k=args.cv, epochs=args.epochs, n_jobs=args.jobs,
+                               tf_threads=args.tf_threads, select_best=args.select_best)
+        raise SystemExit(0)
+
     print("=" * 60)
     print("🧠 NEURO UX STYLER - ENTRENAMIENTO INICIAL")
     print("=" * 60)
     
-    history, metrics = trainer.train_model(epochs=100)
+    history, metrics = trainer.train_model(epochs=args.epochs)
     
     print("\n✅ Entrenamiento inicial completado!")
     if metrics:
@@ -0,0 +1,220 @@
+"""
+Worker de entrenamiento fuera de proceso.
+
+El proceso de la API solo hace inferencia: cada reentrenamiento corre en un subproceso
+con su propia afinidad de CPU, prioridad e hilos de TF. El subproceso recibe un snapshot
+del dataset y devuelve por un canal local (JSON por línea en su stdout original) el progreso
+por época y, al final, las rutas del nuevo modelo y sus métricas. Los logs del subproceso
+van a stderr. Si el subproceso muere, la API sigue en pie y el reentrenamiento falla con error.
+
+Uso directo (lo lanza TrainingWorker, no se invoca a mano):
+    python training_worker.py < job.json
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import tempfile
+import threading
+import traceback
+import subprocess
+
+USE_TRAINING_WORKER = os.environ.get('NEURO_UX_TRAINING_WORKER', '1') == '1'
+# CPUs del worker, p. ej. "2,3" o "2-3" (vacío = las mismas que la API)
+TRAINING_CPUS = os.environ.get('NEURO_UX_TRAINING_CPUS', '')
+TRAINING_TF_THREADS = int(os.environ.get('NEURO_UX_TRAINING_TF_THREADS', '0'))
+TRAINING_NICE = int(os.environ.get('NEURO_UX_TRAINING_NICE', '10'))
+TRAINING_TIMEOUT_S = float(os.environ.get('NEURO_UX_TRAINING_TIMEOUT_S', '1800'))
+
+
+class TrainingWorkerError(RuntimeError):
+    """El subproceso de entrenamiento falló o murió"""
+
+
+def parse_cpus(spec):
+    """'0,2-3' -> [0, 2, 3]"""
+    cpus = set()
+    for part in (spec or '').split(','):
+        part = part.strip()
+        if not part:
+            continue
+        if '-' in part:
+            low, high = part.split('-', 1)
+            cpus.update(range(int(low), int(high) + 1))
+        else:
+            cpus.add(int(part))
+    return sorted(cpus)
+
+
+class TrainingWorker:
+    """Lanza y supervisa el subproceso de entrenamiento (uno a la vez)"""
+
+    def __init__(self, cpus=None, tf_threads=TRAINING_TF_THREADS, nice=TRAINING_NICE,
+                 timeout_s=TRAINING_TIMEOUT_S, models_dir=None):
+        self.cpus = parse_cpus(TRAINING_CPUS) if cpus is None else list(cpus)
+        self.tf_threads = tf_threads or len(self.cpus)
+        self.nice = nice
+        self.timeout_s = timeout_s
+        self.models_dir = models_dir or os.path.join(os.path.dirname(__file__), 'data', 'models')
+        self.process = None
+        self.progress = None
+        self.last_result = None
+
+    def run(self, snapshot, epochs=50, on_message=None):
+        """
+        Entrena en un subproceso a partir del snapshot.
+        Retorna dict con model_path, tflite_path (en un directorio de staging), metrics,
+        epochs_run, duration_s y pid. Lanza TrainingWorkerError si el subproceso falla.
+        """
+        os.makedirs(self.models_dir, exist_ok=True)
+        # Staging en el mismo filesystem que el modelo para que la instalación sea un rename atómico
+        staging = tempfile.mkdtemp(prefix='staging_', dir=self.models_dir)
+        snapshot_path = os.path.join(staging, 'snapshot.json')
+        with open(snapshot_path, 'w', encoding='utf-8') as f:
+            json.dump(snapshot, f, ensure_ascii=False)
+
+        job = {
+            'snapshot_path': snapshot_path,
+            'model_path': os.path.join(staging, 'neuro_ux_model.h5'),
+            'epochs': epochs,
+            'cpus': self.cpus,
+            'nice': self.nice,
+        }
+        env = dict(os.environ)
+        if self.tf_threads:
+            env['NEURO_UX_TF_INTRA_THREADS'] = str(self.tf_threads)
+            env['NEURO_UX_TF_INTER_THREADS'] = str(self.tf_threads)
+
+        start = time.perf_counter()
+        self.progress = {'epoch': 0, 'epochs': epochs}
+        process = subprocess.Popen(
+            [sys.executable, os.path.abspath(__file__)],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, env=env,
+            cwd=os.path.dirname(os.path.abspath(__file__)), text=True, encoding='utf-8'
+        )
+        self.process = process
+        print(f"🛠️ Worker de entrenamiento iniciado (pid {process.pid}, cpus {self.cpus or 'todas'})")
+
+        timed_out = threading.Event()
+
+        def kill_on_timeout():
+            timed_out.set()
+            process.kill()
+
+        watchdog = threading.Timer(self.timeout_s, kill_on_timeout)
+        watchdog.daemon = True
+        watchdog.start()
+
+        result, error = None, None
+        try:
+            process.stdin.write(json.dumps(job))
+            process.stdin.close()
+
+            for line in process.stdout:
+                try:
+                    message = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if message.get('type') == 'epoch':
+                    self.progress = {'epoch': message['epoch'], 'epochs': epochs, 'logs': message['logs']}
+                elif message.get('type') == 'result':
+                    result = message
+                elif message.get('type') == 'error':
+                    error = message
+                if on_message is not None:
+                    on_message(message)
+            returncode = process.wait()
+        finally:
+            watchdog.cancel()
+            self.process = None
+
+        if result is None:
+            shutil.rmtree(staging, ignore_errors=True)
+            if timed_out.is_set():
+                raise TrainingWorkerError(f"El worker superó el timeout de {self.timeout_s:.0f}s")
+            if error is not None:
+                print(error.get('traceback', ''), file=sys.stderr)
+                raise TrainingWorkerError(f"Error en el worker: {error['error']}")
+            raise TrainingWorkerError(f"El worker terminó sin resultado (código {returncode})")
+
+        os.remove(snapshot_path)
+        result.update({
+            'staging_dir': staging,
+            'duration_s': round(time.perf_counter() - start, 2),
+            'pid': process.pid,
+        })
+        self.last_result = {k: result.get(k) for k in ('metrics', 'epochs_run', 'duration_s', 'pid', 'io')}
+        return result
+
+    @staticmethod
+    def cleanup(result):
+        """Elimina el directorio de staging tras instalar (o descartar) el modelo"""
+        shutil.rmtree(result['staging_dir'], ignore_errors=True)
+
+    def stats(self):
+        return {
+            'enabled': USE_TRAINING_WORKER,
+            'running': self.process is not None,
+            'pid': self.process.pid if self.process is not None else None,
+            'cpus': self.cpus,
+            'tf_threads': self.tf_threads,
+            'progress': self.progress,
+            'last_result': self.last_result,
+        }
+
+
+def _worker_main():
+    """Punto de entrada del subproceso"""
+    # El stdout original queda como canal de mensajes; todo lo demás (prints, logs de TF) va a stderr
+    channel = os.fdopen(os.dup(sys.stdout.fileno()), 'w', encoding='utf-8', buffering=1)
+    os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+    sys.stdout = sys.stderr
+
+    def send(message):
+        channel.write(json.dumps(message) + '\n')
+
+    try:
+        job = json.loads(sys.stdin.read())
+
+        # Afinidad y prioridad antes de importar TF, para que sus pools se dimensionen a las CPUs asignadas
+        if job.get('cpus') and hasattr(os, 'sched_setaffinity'):
+            os.sched_setaffinity(0, job['cpus'])
+        if job.get('nice') and hasattr(os, 'nice'):
+            os.nice(job['nice'])
+
+        from model import keras
+        from training import Trainer
+
+        progress = keras.callbacks.LambdaCallback(on_epoch_end=lambda epoch, logs: send({
+            'type': 'epoch',
+            'epoch': epoch + 1,
+            'logs': {k: float(v) for k, v in (logs or {}).items()},
+        }))
+
+        with open(job['snapshot_path'], 'r', encoding='utf-8') as f:
+            snapshot = json.load(f)
+
+        trainer = Trainer()
+        history, metrics = trainer.retrain_from_snapshot(
+            snapshot, epochs=job['epochs'], model_path=job['model_path'], extra_callbacks=[progress]
+        )
+        send({
+            'type': 'result',
+            'model_path': trainer.model.model_path,
+            'tflite_path': trainer.model.tflite_path if os.path.exists(trainer.model.tflite_path) else None,
+            'metrics': {k: float(v) for k, v in metrics.items()},
+            'epochs_run': len(history.history.get('loss', [])),
+            'io': trainer.model.io_report(),
+            'consumed_pending': len(snapshot.get('pending_feedback', [])),
+        })
+        return 0
+    except Exception as e:
+        send({'type': 'error', 'error': str(e), 'traceback': traceback.format_exc()})
+        return 1
+    finally:
+        channel.close()
+
+
+if __name__ == '__main__':
+    sys.exit(_worker_main())
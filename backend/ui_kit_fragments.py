@@ -0,0 +1,47 @@
+import json
+
+
+def dumps(value):
+    """Serializa igual que jsonify (claves ordenadas, compacto, ASCII) y retorna bytes"""
+    return json.dumps(value, sort_keys=True, separators=(',', ':'), ensure_ascii=True).encode('utf-8')
+
+
+class UIKitFragments:
+    """
+    JSON pre-serializado de las partes estáticas del UI Kit
+    (presets de componentes, pares de fuentes y escalas de tokens).
+    Las respuestas de /generate se arman empalmando esos bytes con los campos dinámicos:
+    colores (paleta), confianza y keywords.
+    Los dicts del procesador siguen siendo dicts normales; solo se internan sus bytes, indexados
+    por identidad (el procesador comparte esas instancias y no las modifica).
+    """
+
+    def __init__(self, processor):
+        self._cache = {}
+        static_parts = [
+            *processor.components.values(),
+            *processor.fonts_catalog.values(),
+            processor.design_tokens,
+        ]
+        for part in static_parts:
+            # Se guarda la referencia junto a los bytes para que el id() no se reutilice
+            self._cache[id(part)] = (part, dumps(part))
+
+    def encode(self, value):
+        """Bytes JSON del valor; los fragmentos estáticos salen del caché"""
+        cached = self._cache.get(id(value))
+        if cached is not None and cached[0] is value:
+            return cached[1]
+        return dumps(value)
+
+    def render_generate(self, ui_kit, confidence):
+        """Cuerpo de la respuesta de /generate (mismo JSON que jsonify, claves ordenadas)"""
+        return b''.join((
+            b'{"success":true,"ui_kit":{"colors":', dumps(ui_kit.get('colors', {})),
+            b',"components":', self.encode(ui_kit.get('components', {})),
+            b',"confidence":', dumps(confidence),
+            b',"style":', dumps(ui_kit.get('style', {})),
+            b',"tokens":', self.encode(ui_kit.get('tokens', {})),
+            b',"typography":', self.encode(ui_kit.get('typography', {})),
+            b'}}\n',
+        ))
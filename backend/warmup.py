@@ -0,0 +1,150 @@
+import os
+import time
+import threading
+
+import numpy as np
+
+# Rondas por tamaño de batch; la primera paga el trazado y las reservas de memoria
+WARMUP_ROUNDS = int(os.environ.get('NEURO_UX_WARMUP_ROUNDS', '3'))
+# Tamaños representativos: 1 (/generate), los casos juntos, bloques de drift/índices
+WARMUP_BATCH_SIZES = [
+    int(size) for size in os.environ.get('NEURO_UX_WARMUP_BATCHES', '1,4,256').split(',') if size.strip()
+]
+
+# Casos de prueba de test_model.py (también sirven de batch representativo para el warm-up)
+WARMUP_CASES = [
+    {
+        "name": "Diseño Moderno Minimalista",
+        "input": {
+            "palette": ["#000000", "#FFFFFF", "#FF6B6B"],
+            "fonts": ["Inter", "Helvetica"],
+            "layout": "grid",
+            "spacing": "medium",
+            "contrast": "high"
+        }
+    },
+    {
+        "name": "Diseño Corporativo Tradicional",
+        "input": {
+            "palette": ["#003366", "#336699", "#FFFFFF"],
+            "fonts": ["Georgia", "Times New Roman"],
+            "layout": "sidebar",
+            "spacing": "compact",
+            "contrast": "medium"
+        }
+    },
+    {
+        "name": "Diseño Creativo Vibrante",
+        "input": {
+            "palette": ["#FF1744", "#00E676", "#2979FF"],
+            "fonts": ["Montserrat", "Poppins"],
+            "layout": "masonry",
+            "spacing": "wide",
+            "contrast": "high"
+        }
+    },
+    {
+        "name": "Diseño E-commerce Limpio",
+        "input": {
+            "palette": ["#FFFFFF", "#F5F5F5", "#4CAF50"],
+            "fonts": ["Roboto", "Open Sans"],
+            "layout": "grid",
+            "spacing": "medium",
+            "contrast": "medium"
+        }
+    }
+]
+
+
+def run_warmup(model, processor, cases=WARMUP_CASES, batch_sizes=WARMUP_BATCH_SIZES, rounds=WARMUP_ROUNDS):
+    """
+    Ejecuta la ruta de inferencia completa sobre los casos (encode_input -> predict -> generate_ui_kit)
+    y predicciones por batch de cada tamaño. Retorna un reporte con la latencia de la primera
+    y la última ronda por tamaño.
+    """
+    start = time.perf_counter()
+
+    # Ruta de /generate sin tabla precalculada, caso por caso
+    encoded = []
+    for case in cases:
+        features, metadata, _ = processor.encode_input(case['input'])
+        prediction = model.predict(features)
+        processor.generate_ui_kit(prediction, metadata, None)
+        encoded.append(np.asarray(features, dtype=np.float32).reshape(-1))
+    base = np.stack(encoded)
+
+    batches = {}
+    for size in batch_sizes:
+        X = np.resize(base, (size, base.shape[1]))
+        timings = []
+        for _ in range(max(rounds, 1)):
+            t0 = time.perf_counter()
+            model.predict(X)
+            timings.append((time.perf_counter() - t0) * 1000)
+        batches[str(size)] = {'first_ms': round(timings[0], 3), 'last_ms': round(timings[-1], 3)}
+
+    return {
+        'duration_ms': round((time.perf_counter() - start) * 1000, 2),
+        'cases': len(cases),
+        'rounds': rounds,
+        'batches': batches,
+    }
+
+
+class Readiness:
+    """
+    Estado de readiness del proceso: 'starting' -> 'warming' -> 'ready' (o 'failed').
+    Solo pasa a 'ready' después del warm-up del modelo cargado; cada recarga vuelve a 'warming'.
+    """
+
+    def __init__(self):
+        self.state = 'starting'
+        self.reason = None
+        self.last_warmup = None
+        self.warmups = 0
+        self._lock = threading.Lock()
+
+    @property
+    def ready(self):
+        return self.state == 'ready'
+
+    def begin(self, reason):
+        """Marca el proceso como no listo (antes de cargar o recargar el modelo)"""
+        with self._lock:
+            self.state = 'warming'
+            self.reason = reason
+
+    def warm(self, model, processor, reason):
+        """Warm-up del modelo actual; pasa a 'ready' si termina sin errores"""
+        self.begin(reason)
+        try:
+            report = run_warmup(model, processor)
+        except Exception as e:
+            print(f"❌ Warm-up fallido ({reason}): {e}")
+            with self._lock:
+                self.state = 'failed'
+                self.last_warmup = {'reason': reason, 'error': str(e),
+                                    'time': time.strftime('%Y-%m-%dT%H:%M:%S')}
+            return None
+
+        report.update({
+            'reason': reason,
+            'model_version': model.version,
+            'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        })
+        with self._lock:
+            self.state = 'ready'
+            self.last_warmup = report
+            self.warmups += 1
+        print(f"🔥 Warm-up ({reason}) completado en {report['duration_ms']:.0f} ms")
+        return report
+
+    def stats(self):
+        with self._lock:
+            return {
+                'state': self.state,
+                'ready': self.state == 'ready',
+                'reason': self.reason,
+                'warmups': self.warmups,
+                'last_warmup': self.last_warmup,
+            }